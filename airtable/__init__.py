@@ -1,14 +1,39 @@
+import codecs
+import collections
+import collections.abc
+import datetime
+import importlib
+import itertools
 import json
 import posixpath
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.parse
 import warnings
 from collections import OrderedDict
 from typing import Any, Generic, Mapping, TypeVar
 
-import requests
-import six
+from . import export as _export
+from . import serializer as _serializer
+from . import sync as _sync
+from . import transport as _transport
 
 API_URL = 'https://api.airtable.com/v%s/'
 API_VERSION = '0'
+# Number of connections kept alive in the pool of each client.
+DEFAULT_POOL_SIZE = 10
+# Maximum number of records the API accepts in a single write request.
+MAX_RECORDS_PER_REQUEST = 10
+# Maximum number of requests per second allowed by the API for each base.
+DEFAULT_RATE_LIMIT = 5
+# Number of seconds the API refuses requests after its rate limit was exceeded.
+RATE_LIMIT_PENALTY = 30
+# Maximum length of the formulas used to fetch records by ID, once URL-encoded,
+# so that the URL stays well under the 16k characters accepted by the API.
+MAX_FORMULA_LENGTH = 8000
 
 
 class IsNotInteger(Exception):
@@ -22,7 +47,7 @@ class IsNotString(Exception):
 def check_integer(integer):
     if not integer:
         return False
-    if not isinstance(integer, six.integer_types):
+    if not isinstance(integer, int):
         raise IsNotInteger('Expected an integer', integer)
     return True
 
@@ -30,7 +55,7 @@ def check_integer(integer):
 def check_string(string):
     if not string:
         return False
-    if not isinstance(string, six.string_types):
+    if not isinstance(string, str):
         raise IsNotString('Expected a string', string)
     return True
 
@@ -39,22 +64,409 @@ def create_payload(data):
     return {'fields': data}
 
 
+def _upsert_key(fields, key_fields):
+    # Field values can be lists or dicts, which are not hashable.
+    return json.dumps([fields.get(field) for field in key_fields], sort_keys=True)
+
+
+def _is_empty(value):
+    if value is None or isinstance(value, bool):
+        return not value
+    return isinstance(value, (str, list)) and not value
+
+
+def _has_changes(record, fields):
+    existing = record.get('fields', {})
+    for field, value in fields.items():
+        if field in existing:
+            if existing[field] != value:
+                return True
+        # The API does not return empty fields, but 0 is not empty.
+        elif not _is_empty(value):
+            return True
+    return False
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _record_id_formulas(record_ids, max_ids):
+    """Formulas selecting records by ID, short enough to be sent in a URL."""
+    terms = []
+    length = 0
+    for record_id in record_ids:
+        term = "RECORD_ID()='%s'" % record_id.replace("'", "\\'")
+        term_length = len(urllib.parse.quote(term)) + 3
+        if terms and (len(terms) == max_ids or length + term_length > MAX_FORMULA_LENGTH):
+            yield 'OR(%s)' % ','.join(terms)
+            terms = []
+            length = 0
+        terms.append(term)
+        length += term_length
+    if terms:
+        yield 'OR(%s)' % ','.join(terms)
+
+
+def _formula_value(value):
+    """A value as written in a formula, e.g. "O'Neil" or 42."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _follow_links(records, fields):
+    """The records reached by following expanded link fields."""
+    for field in fields:
+        linked = OrderedDict()
+        for record in records:
+            for value in record.get('fields', {}).get(field) or ():
+                if not isinstance(value, str):
+                    linked[id(value)] = value
+        records = list(linked.values())
+    return records
+
+
+class RateLimiter(object):
+    """A token bucket pacing requests, that can be shared between threads.
+
+    The counters requests and wait_time tell how many requests went through
+    the limiter and how many seconds they spent waiting in total.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, burst=1, clock=time.monotonic, sleep=time.sleep):
+        """Create a rate limiter.
+
+        Args:
+            - rate: the number of requests allowed per second.
+            - burst: the number of requests that can be sent at once after a
+                  quiet period. The default is to space all requests evenly,
+                  so that the rate is never exceeded on any 1 second window.
+            - clock: the function returning the current time in seconds.
+            - sleep: the function to wait for a given number of seconds.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.requests = 0
+        self.wait_time = 0.
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated_at = None
+        self._started_at = None
+
+    def _refill(self):
+        now = self._clock()
+        if self._updated_at is None:
+            self._started_at = now
+        else:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self):
+        """Book a slot for a request without waiting for it.
+
+        Returns:
+            the number of seconds to wait before sending the request.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            wait = max(0, -self._tokens / self.rate)
+            self.requests += 1
+            self.wait_time += wait
+        return wait
+
+    def acquire(self):
+        """Wait until a request can be sent.
+
+        Returns:
+            the number of seconds waited.
+        """
+        wait = self.reserve()
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """Hold all requests for the given number of seconds."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    def throughput(self):
+        """The average number of requests per second since the first one."""
+        with self._lock:
+            if self._started_at is None:
+                return 0.
+            elapsed = self._clock() - self._started_at
+        return self.requests / elapsed if elapsed > 0 else float(self.requests)
+
+
+# HTTP methods that can be sent again without changing their effect.
+IDEMPOTENT_METHODS = frozenset(('GET', 'PUT', 'DELETE'))
+# HTTP statuses of errors that might go away when trying again later.
+TRANSIENT_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class RetryPolicy(object):
+    """When and how long to wait before sending a request again.
+
+    The delay before each retry grows exponentially, unless the API tells how
+    long to wait with a Retry-After header. The counters retries and
+    backoff_time tell how many requests were retried and how many seconds
+    were spent waiting in total.
+    """
+
+    def __init__(
+            self, max_attempts=5, backoff_base=.5, backoff_cap=30., jitter=True,
+            methods=IDEMPOTENT_METHODS, statuses=TRANSIENT_STATUSES, on_retry=None,
+            sleep=time.sleep, random_func=random.random):
+        """Create a retry policy.
+
+        Args:
+            - max_attempts: the maximum number of times a request is sent.
+            - backoff_base: the delay in seconds before the first retry, it
+                  is then doubled for each new attempt.
+            - backoff_cap: the maximum delay in seconds between two attempts.
+            - jitter: whether to pick a random delay between 0 and the
+                  exponential one, so that concurrent clients do not retry
+                  all at the same time.
+            - methods: the HTTP methods that can be retried. By default only
+                  idempotent ones, add "POST" and "PATCH" to retry writes too.
+            - statuses: the HTTP statuses of the responses to retry. Failures
+                  to connect to the API are always retried.
+            - on_retry: a function called before each retry with the method,
+                  the URL, the number of the failed attempt and the delay in
+                  seconds before the next one.
+            - sleep: the function to wait for a given number of seconds.
+            - random_func: the function returning a random float in [0, 1).
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+        self.methods = frozenset(methods)
+        self.statuses = frozenset(statuses)
+        self.retries = 0
+        self.backoff_time = 0.
+        self._on_retry = on_retry
+        self._sleep = sleep
+        self._random = random_func
+
+    def should_retry(self, method, attempt, status_code=None):
+        """Whether to retry a failed request.
+
+        Args:
+            method: the HTTP method of the request.
+            attempt: the number of times the request was sent already.
+            status_code: the HTTP status of the response, or None if the
+                request did not get any.
+        """
+        if method not in self.methods or attempt >= self.max_attempts:
+            return False
+        return status_code is None or status_code in self.statuses
+
+    def get_delay(self, attempt, retry_after=None):
+        """The number of seconds to wait after the given failed attempt."""
+        if retry_after:
+            try:
+                return max(0., float(retry_after))
+            except ValueError:
+                pass
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay *= self._random()
+        return delay
+
+    def record_retry(self, method, url, attempt, retry_after=None):
+        """Count a retry without waiting for it.
+
+        Returns:
+            the number of seconds to wait before sending the request again.
+        """
+        delay = self.get_delay(attempt, retry_after)
+        self.retries += 1
+        self.backoff_time += delay
+        if self._on_retry:
+            self._on_retry(method, url, attempt, delay)
+        return delay
+
+    def backoff(self, method, url, attempt, retry_after=None):
+        """Wait before sending a request again."""
+        self._sleep(self.record_retry(method, url, attempt, retry_after))
+
+
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(base_id):
+    """Get the rate limiter shared by all clients of a base in this process."""
+    with _RATE_LIMITERS_LOCK:
+        if base_id not in _RATE_LIMITERS:
+            _RATE_LIMITERS[base_id] = RateLimiter()
+        return _RATE_LIMITERS[base_id]
+
+
 _T = TypeVar('_T', bound=Mapping[str, Any])
 
+# Arguments of iterate that can be given for the segments of parallel_iterate.
+_SEGMENT_ARGS = (
+    'batch_size', 'filter_by_formula', 'view', 'max_records', 'fields', 'sort', 'offset')
+
+
+def _segment_kwargs(segment, kwargs):
+    """The arguments of iterate for a segment of parallel_iterate."""
+    if isinstance(segment, str):
+        segment = {'filter_by_formula': segment}
+    segment_kwargs = dict(kwargs, **segment)
+    for name in segment_kwargs:
+        if name not in _SEGMENT_ARGS:
+            raise TypeError('Unexpected argument "%s" for a segment, use one of: %s' % (
+                name, ', '.join(_SEGMENT_ARGS)))
+    return segment_kwargs
+
+
+# Value of the fields missing from a compact record.
+_MISSING = object()
+# Maximum number of field names kept for a table, and of tables kept by a
+# record factory: fields may be renamed or tables recreated over the life of
+# a client.
+_MAX_FIELD_NAMES = 1000
+_MAX_TABLES = 128
+
+
+class _FieldNames(object):
+    """The names of the fields of a table, shared by all its records.
 
-class Record(Generic[_T]):
+    Names are added as they show up, and their positions never change.
+    """
+
+    __slots__ = ('names', 'indices', '_lock')
 
     def __init__(self):
-        raise NotImplementedError(
-            'This class is only used as a type of records returned by this module, however '
-            'it should only be used as a type (see typing stubs) and not as an actual class.'
-        )
+        self.names = []
+        self.indices = {}
+        self._lock = threading.Lock()
+
+    def index(self, name):
+        """The position of a field name, added if it is new."""
+        index = self.indices.get(name)
+        if index is not None:
+            return index
+        with self._lock:
+            index = self.indices.get(name)
+            if index is None:
+                index = len(self.names)
+                self.names.append(sys.intern(name))
+                self.indices[self.names[index]] = index
+            return index
+
+
+class _Fields(Mapping[str, Any]):
+    """The fields of a compact record: a tuple of values and the names of the table.
+
+    The values are stored at the positions of their names, fields that the
+    record does not have are _MISSING or beyond the end of the tuple.
+    """
+
+    __slots__ = ('_names', '_values')
+
+    def __init__(self, names, values):
+        self._names = names
+        self._values = values
 
     def __getitem__(self, key):
-        pass
+        index = self._names.indices[key]
+        if index >= len(self._values) or self._values[index] is _MISSING:
+            raise KeyError(key)
+        return self._values[index]
 
-    def get(self, key, default=None):  # pylint-disable=invalid-name
-        pass
+    def __iter__(self):
+        for name, value in zip(self._names.names, self._values):
+            if value is not _MISSING:
+                yield name
+
+    def __len__(self):
+        return sum(1 for value in self._values if value is not _MISSING)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class Record(Mapping[str, Any], Generic[_T]):
+    """A record returned by the API, with a compact memory footprint.
+
+    By default, the clients return records as dicts, but they return records
+    of this class when created with compact_records=True. They can be read
+    the same way: record['id'], record['createdTime'], record['fields'].
+    """
+
+    __slots__ = ('_id', '_created_time', '_fields')
+
+    def __init__(self, record_id, created_time, fields):
+        self._id = record_id
+        self._created_time = created_time
+        self._fields = fields
+
+    def __getitem__(self, key):
+        if key == 'id':
+            return self._id
+        if key == 'createdTime' and self._created_time is not None:
+            return self._created_time
+        if key == 'fields':
+            return self._fields
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield 'id'
+        if self._created_time is not None:
+            yield 'createdTime'
+        yield 'fields'
+
+    def __len__(self):
+        return 2 if self._created_time is None else 3
+
+    def __repr__(self):
+        return '%s(%r, %r, %r)' % (
+            self.__class__.__name__, self._id, self._created_time, self._fields)
+
+
+class _RecordFactory(object):
+    """Build compact records, sharing the field names of each table between them."""
+
+    def __init__(self):
+        # The names of the fields by table, the oldest table first.
+        self._field_names = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _names(self, table_name):
+        names = self._field_names.get(table_name)
+        if names is not None and len(names.names) < _MAX_FIELD_NAMES:
+            return names
+        with self._lock:
+            names = self._field_names.get(table_name)
+            if names is None or len(names.names) >= _MAX_FIELD_NAMES:
+                # Records built before keep the names they were built with.
+                names = self._field_names[table_name] = _FieldNames()
+                while len(self._field_names) > _MAX_TABLES:
+                    self._field_names.popitem(last=False)
+            return names
+
+    def __call__(self, record, table_name=None):
+        fields = record.get('fields', {})
+        names = self._names(table_name)
+        indices = [names.index(name) for name in fields]
+        values = [_MISSING] * (max(indices) + 1 if indices else 0)
+        for index, value in zip(indices, fields.values()):
+            values[index] = value
+        return Record(
+            sys.intern(record['id']), record.get('createdTime'), _Fields(names, tuple(values)))
 
 
 class AirtableError(Exception):
@@ -66,6 +478,8 @@ class AirtableError(Exception):
         #  VIEW_NAME_NOT_FOUND
         self.type = error_type
         self.message = message
+        # When raised while iterating, the offset from which to resume.
+        self.offset = None
 
     def __repr__(self):
         return '%s(%r, %r)' % (self.__class__.__name__, self.type, self.message)
@@ -74,10 +488,281 @@ class AirtableError(Exception):
         return self.message or self.__class__.__name__
 
 
+# Names of the operations made by each HTTP method, except GET.
+_OPERATIONS = {'POST': 'create', 'PATCH': 'update', 'PUT': 'replace', 'DELETE': 'delete'}
+
+
+class RequestEvent(object):
+    """A request to the API, as seen by the observers of a client.
+
+    Before the request, only method, table_name, operation, url and
+    bytes_sent are set. After it, latency is the number of seconds spent
+    including retries, status_code the status of the last response (None if
+    there was none) and error the exception raised to the caller, if any.
+    bytes_sent and bytes_received are the sizes of the bodies sent over the
+    network, so compressed if they were, and bytes_received is 0 when it is
+    not known, e.g. for a compressed response without Content-Length.
+    Requests to the metadata API have no table_name and the "schema"
+    operation.
+    """
+
+    def __init__(self, method, url, payload):
+        self.method = method
+        self.url = url
+        self.table_name = url.split('/', 1)[0]
+        if '://' in url:
+            # Only the requests to the metadata API have an absolute URL.
+            self.table_name = None
+            self.operation = 'schema'
+        elif method == 'GET':
+            self.operation = 'get' if '/' in url else 'list'
+        else:
+            self.operation = _OPERATIONS.get(method, method.lower())
+        self.bytes_sent = len(payload) if payload else 0
+        self.bytes_received = 0
+        self.status_code = None
+        self.retries = 0
+        self.latency = None
+        self.error = None
+
+    def __repr__(self):
+        return '<RequestEvent %s %s %s>' % (self.method, self.url, self.status_code)
+
+
+def _bytes_received(response, stream):
+    """The size of the body of a response as it was received, 0 if unknown."""
+    length = response.headers.get('Content-Length')
+    if length is not None:
+        return int(length)
+    if stream or response.headers.get('Content-Encoding', 'identity') != 'identity':
+        # The body is not read yet, or only known once decompressed.
+        return 0
+    return len(response.content)
+
+
+def _build_get_request(
+        table_name, record_id=None, limit=0, offset=None, filter_by_formula=None, view=None,
+        max_records=0, fields=None, sort=None):
+    """Build the relative URL and the query params of a get request."""
+    params = {}
+    if check_string(record_id):
+        url = posixpath.join(table_name, record_id)
+    else:
+        url = table_name
+        if limit and check_integer(limit):
+            params.update({'pageSize': limit})
+        if offset and check_string(offset):
+            params.update({'offset': offset})
+        if filter_by_formula is not None:
+            params.update({'filterByFormula': filter_by_formula})
+        if view is not None:
+            params.update({'view': view})
+        if max_records and check_integer(max_records):
+            params.update({'maxRecords': max_records})
+        if fields and isinstance(fields, (list, tuple)):
+            for field in fields:
+                check_string(field)
+            # Duplicate a single field, https://github.com/josephbestjames/airtable.py/issues/47
+            if len(fields) == 1:
+                fields = fields + fields
+            params.update({'fields': fields})
+        if sort and isinstance(sort, dict):
+            for idx, (field, direction) in enumerate(sort.items()):
+                params.update({f'sort[{idx}][field]': field})
+                params.update({f'sort[{idx}][direction]': direction})
+    return url, params
+
+
+class _Flight(object):
+    """A request in flight, that other callers can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class _ThreadError(object):
+
+    def __init__(self, error):
+        self.error = error
+
+
+_THREAD_DONE = object()
+
+
+def _consume_in_threads(iterators, max_workers, queue_size, thread_name):
+    """Consume iterators on a pool of threads, yielding their items as they come.
+
+    At most queue_size items are consumed ahead of the caller. Errors raised
+    by the iterators are raised to the caller, and the threads stop when the
+    caller stops early.
+    """
+    items = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+
+    def _put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(iterator):
+        try:
+            for item in iterator:
+                if not _put(item):
+                    return
+        except Exception as error:  # pylint: disable=broad-except
+            _put(_ThreadError(error))
+            return
+        finally:
+            if stopped.is_set() and hasattr(iterator, 'close'):
+                iterator.close()
+        _put(_THREAD_DONE)
+
+    # Imported when needed, as it is slow to import.
+    import concurrent.futures  # pylint: disable=import-outside-toplevel
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers, thread_name_prefix=thread_name)
+    remaining = 0
+    for iterator in iterators:
+        executor.submit(_produce, iterator)
+        remaining += 1
+    try:
+        while remaining:
+            item = items.get()
+            if item is _THREAD_DONE:
+                remaining -= 1
+            elif isinstance(item, _ThreadError):
+                raise item.error
+            else:
+                yield item
+    finally:
+        # Unblock the producers if the consumer stopped early.
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _prefetch(iterator, size):
+    """Consume an iterator on a background thread, up to size items ahead."""
+    return _consume_in_threads([iterator], 1, size, 'airtable-prefetch')
+
+
+# Size of the chunks read from the network when streaming a response.
+_STREAM_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = ' \t\n\r'
+
+
+def _stream_records(response, decoder, other_keys):
+    """Decode the records of a page one at a time while downloading it.
+
+    Args:
+        response: the streamed HTTP response of the page.
+        decoder: the JSONDecoder to use for each record.
+        other_keys: a dict updated with the other keys of the page, e.g.
+            "offset", once all the records were read.
+    Yields:
+        The records of the page.
+    """
+    text_decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+    chunks = response.iter_content(_STREAM_CHUNK_SIZE)
+    state = {'buffer': '', 'pos': 0, 'done': False}
+
+    def _read_more():
+        # Read until the part left to parse doubled, to keep parsing linear.
+        buffer = state['buffer'][state['pos']:]
+        target = max(len(buffer) * 2, 1)
+        while len(buffer) < target and not state['done']:
+            chunk = next(chunks, None)
+            if chunk is None:
+                state['done'] = True
+                buffer += text_decoder.decode(b'', final=True)
+            else:
+                buffer += text_decoder.decode(chunk)
+        state['buffer'], state['pos'] = buffer, 0
+
+    def _skip_whitespace():
+        while True:
+            buffer, pos = state['buffer'], state['pos']
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            state['pos'] = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if state['done']:
+                raise ValueError('Unexpected end of the response')
+            _read_more()
+
+    def _expect(characters):
+        char = _skip_whitespace()
+        if char not in characters:
+            raise ValueError('Expected one of %r in the response, got %r' % (characters, char))
+        state['pos'] += 1
+        return char
+
+    def _decode_value():
+        _skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(state['buffer'], state['pos'])
+                # A number could go on in the next chunk.
+                if end < len(state['buffer']) or state['done']:
+                    state['pos'] = end
+                    return value
+            except ValueError:
+                if state['done']:
+                    raise
+            _read_more()
+
+    try:
+        _expect('{')
+        if _skip_whitespace() == '}':
+            return
+        while True:
+            key = _decode_value()
+            _expect(':')
+            if key == 'records':
+                _expect('[')
+                if _skip_whitespace() == ']':
+                    state['pos'] += 1
+                else:
+                    while True:
+                        yield _decode_value()
+                        if _expect(',]') == ']':
+                            break
+            else:
+                other_keys[key] = _decode_value()
+            if _expect(',}') == '}':
+                return
+    finally:
+        response.close()
+
+
+def _make_error(status_code, error_json):
+    """Build the error to raise for a response of the API that is not OK."""
+    error = error_json.get('error', {})
+    if not isinstance(error, dict):
+        error = {'type': error}
+    return AirtableError(
+        error_type=error.get('type', str(status_code)),
+        message=error.get('message', json.dumps(error_json)))
+
+
 class Airtable(object):
-    def __init__(self, base_id, api_key, dict_class=OrderedDict):
+    def __init__(
+            self, base_id, api_key, dict_class=OrderedDict, pool_size=DEFAULT_POOL_SIZE,
+            max_retries=0, timeout=None, rate_limiter=None, retry_policy=None, cache=None,
+            compact_records=False, observers=(), coalesce_reads=False, transport=None,
+            serializer=None):
         """Create a client to connect to an Airtable Base.
 
+        The client keeps a pool of keep-alive connections to the API that is
+        shared by all the tables created with the table method. Call close (or
+        use the client as a context manager) to release them.
+
         Args:
             - base_id: The ID of the base, e.g. "appA0CDAE34F"
             - api_key: The API secret key, e.g. "keyBAAE123C"
@@ -85,64 +770,215 @@ class Airtable(object):
                   fields. By default the fields are kept in the order they were
                   returned by the API using an OrderedDict, but you can switch
                   to a simple dict if you prefer.
+            - pool_size: the maximum number of connections kept alive to the
+                  API, relevant when the client is shared between threads.
+            - max_retries: the number of times a request is retried when the
+                  connection to the API fails.
+            - timeout: how many seconds to wait for the API before giving up,
+                  either a float or a (connect, read) tuple. By default, wait
+                  forever.
+            - rate_limiter: a RateLimiter to pace the requests, or True to
+                  use the one shared by all the clients of the same base in
+                  this process. By default, requests are not paced.
+            - retry_policy: a RetryPolicy to retry requests that failed with
+                  a transient error. By default, errors are raised at once.
+            - cache: a cache from the airtable.cache module, to serve the get
+                  and iterate calls that were already made. Its entries for a
+                  table are dropped whenever a record of the table is written
+                  through this client.
+            - compact_records: whether get and iterate return records as
+                  Record objects, that take much less memory than dicts when
+                  holding many records. Nested values (e.g. attachments) are
+                  still built with dict_class.
+            - observers: objects with before_request and after_request
+                  methods, called with a RequestEvent around each request
+                  sent to the API, e.g. a metrics.MetricsCollector.
+            - coalesce_reads: whether a read sent while the same one is
+                  already in flight (e.g. from another thread) waits for the
+                  response of the first one instead of sending a request.
+                  Each caller still gets its own copy of the response. The
+                  coalesced_reads attribute counts the requests saved.
+            - transport: the name of the HTTP library sending the requests:
+                  "requests" (the default), "urllib3" or "http.client", see
+                  the airtable.transport module. It is only imported when the
+                  client is created.
+            - serializer: the name of the JSON library encoding the payloads
+                  and decoding the responses: "orjson", "ujson" or "json",
+                  see the airtable.serializer module. By default, the fastest
+                  one installed.
         """
         self.airtable_url = API_URL % API_VERSION
+        self.base_id = base_id
         self.base_url = posixpath.join(self.airtable_url, base_id)
         self.headers = {'Authorization': 'Bearer %s' % api_key}
         self._dict_class = dict_class
+        self._timeout = timeout
+        if rate_limiter is True:
+            rate_limiter = get_rate_limiter(base_id)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        # Bumped each time the cached entries of a table are invalidated, so
+        # that reads in flight at that time are not cached.
+        self._cache_generations = collections.Counter()
+        self._cache_lock = threading.Lock()
+        self.observers = list(observers)
+        self.coalesced_reads = 0
+        self._flights = {} if coalesce_reads else None
+        self._flights_lock = threading.Lock()
+        self._make_record = _RecordFactory() if compact_records else None
+        self._json_decoder = json.JSONDecoder(
+            object_pairs_hook=None if dict_class is dict else dict_class)
+        self.transport = _transport.get_transport(transport, pool_size, max_retries)
+        self.serializer = _serializer.get_serializer(serializer)
+
+    def close(self):
+        """Close all the connections kept alive by this client."""
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *unused_exc_info):
+        self.close()
 
-    def __request(self, method, url, params=None, payload=None):
+    def __request(self, method, url, params=None, payload=None, rate_limiter=None):
+        if method == 'GET' and self._flights is not None:
+            return self._decode(self.__send_coalesced(url, params, rate_limiter))
+        if method != 'GET' and self.cache is not None:
+            try:
+                return self._decode(self.__send(method, url, params, payload))
+            finally:
+                table_name = url.split('/', 1)[0]
+                with self._cache_lock:
+                    self._cache_generations[table_name] += 1
+                    self.cache.invalidate(table_name)
+        return self._decode(self.__send(method, url, params, payload, rate_limiter=rate_limiter))
+
+    def __send_coalesced(self, url, params, rate_limiter=None):
+        key = json.dumps([url, params], sort_keys=True)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            is_first = flight is None
+            if is_first:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced_reads += 1
+        if not is_first:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            # Each caller decodes the response, so they get their own copy.
+            return flight.response
+        try:
+            flight.response = self.__send('GET', url, params, rate_limiter=rate_limiter)
+        except Exception as error:
+            flight.error = error
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.response
+
+    def _decode(self, response):
+        return self.serializer.loads(response.content, self._dict_class)
+
+    def __send(self, method, url, params=None, payload=None, stream=False, rate_limiter=None):
+        if not self.observers:
+            return self.__send_with_retries(method, url, params, payload, stream, rate_limiter)
+        event = RequestEvent(method, url, payload)
+        for observer in self.observers:
+            observer.before_request(event)
+        start = time.perf_counter()
+        try:
+            return self.__send_with_retries(
+                method, url, params, payload, stream, rate_limiter, event)
+        except Exception as error:
+            event.error = error
+            raise
+        finally:
+            event.latency = time.perf_counter() - start
+            for observer in self.observers:
+                observer.after_request(event)
+
+    def __send_with_retries(
+            self, method, url, params, payload, stream, rate_limiter=None, event=None):
+        rate_limiter = rate_limiter or self.rate_limiter
         if method in ['POST', 'PUT', 'PATCH']:
             self.headers.update({'Content-type': 'application/json'})
-        response = requests.request(
-            method,
-            posixpath.join(self.base_url, url),
-            params=params,
-            data=payload,
-            headers=self.headers)
-        if response.status_code == requests.codes.ok:
-            return response.json(object_pairs_hook=self._dict_class)
-        error_json = response.json().get('error', {})
-        raise AirtableError(
-            error_type=error_json.get('type', str(response.status_code)),
-            message=error_json.get('message', json.dumps(response.json())))
+        if '://' not in url:
+            url = posixpath.join(self.base_url, url)
+        attempt = 0
+        while True:
+            attempt += 1
+            if rate_limiter:
+                rate_limiter.acquire()
+            try:
+                response = self.transport.request(
+                    method, url, params=params, data=payload, headers=self.headers,
+                    timeout=self._timeout, stream=stream)
+            except self.transport.connection_errors:
+                if not self.retry_policy or not self.retry_policy.should_retry(method, attempt):
+                    raise
+                self.retry_policy.backoff(method, url, attempt)
+                if event:
+                    event.retries = attempt
+                continue
+            if event:
+                event.status_code = response.status_code
+                event.bytes_received = _bytes_received(response, stream)
+            if response.status_code == 200:
+                return response
+            if response.status_code == 429 and rate_limiter:
+                rate_limiter.pause(RATE_LIMIT_PENALTY)
+            if not self.retry_policy or not self.retry_policy.should_retry(
+                    method, attempt, response.status_code):
+                break
+            self.retry_policy.backoff(
+                method, url, attempt, response.headers.get('Retry-After'))
+            if event:
+                event.retries = attempt
+        raise _make_error(response.status_code, response.json())
 
     def get(  # pylint: disable=invalid-name
             self, table_name, record_id=None, limit=0, offset=None,
             filter_by_formula=None, view=None, max_records=0, fields=None,
             sort=None):
-        params = {}
-        if check_string(record_id):
-            url = posixpath.join(table_name, record_id)
-        else:
-            url = table_name
-            if limit and check_integer(limit):
-                params.update({'pageSize': limit})
-            if offset and check_string(offset):
-                params.update({'offset': offset})
-            if filter_by_formula is not None:
-                params.update({'filterByFormula': filter_by_formula})
-            if view is not None:
-                params.update({'view': view})
-            if max_records and check_integer(max_records):
-                params.update({'maxRecords': max_records})
-            if fields and isinstance(fields, (list, tuple)):
-                for field in fields:
-                    check_string(field)
-                # Duplicate a single field, https://github.com/josephbestjames/airtable.py/issues/47
-                if len(fields) == 1:
-                    fields = fields + fields
-                params.update({'fields': fields})
-            if sort and isinstance(sort, dict):
-                for idx, (field, direction) in enumerate(sort.items()):
-                    params.update({f'sort[{idx}][field]': field})
-                    params.update({f'sort[{idx}][direction]': direction})
-        return self.__request('GET', url, params)
+        url, params = _build_get_request(
+            table_name, record_id, limit, offset, filter_by_formula, view, max_records, fields,
+            sort)
+        if self.cache is None:
+            return self._compact(self.__request('GET', url, params), table_name)
+        key = json.dumps(['get', url, params], sort_keys=True)
+        cached = self.cache.get(table_name, key)
+        if cached is not None:
+            return self._compact(self.serializer.loads(cached, self._dict_class), table_name)
+        generation = self._cache_generations[table_name]
+        response = self.__request('GET', url, params)
+        self._cache_set(
+            table_name, key, self.serializer.dumps(response).decode('utf-8'), generation)
+        return self._compact(response, table_name)
+
+    def _cache_set(self, table_name, key, value, generation):
+        """Cache a read, unless the table was written since it started."""
+        with self._cache_lock:
+            if self._cache_generations[table_name] == generation:
+                self.cache.set(table_name, key, value)
+
+    def _compact(self, response, table_name):
+        if not self._make_record:
+            return response
+        if 'records' in response:
+            response['records'] = [
+                self._make_record(record, table_name) for record in response['records']]
+            return response
+        return self._make_record(response, table_name)
 
     def iterate(
             self, table_name, batch_size=0, filter_by_formula=None,
             view=None, max_records=0, fields=None,
-            sort=None):
+            sort=None, offset=None, prefetch=0, stream=False):
         """Iterate over all records of a table.
 
         Args:
@@ -159,50 +995,650 @@ class Airtable(object):
             view: the name or ID of a view in the table. If set, only the
                 records in that view will be returned. The records will be
                 sorted according to the order of the view.
+            offset: the offset from which to resume a previous iteration,
+                see the offset attribute of the AirtableError raised when an
+                iteration fails.
+            prefetch: the number of pages to fetch ahead on a background
+                thread while the records of the current page are processed.
+                By default (0), a page is only fetched once all the records
+                of the previous one were consumed.
+            stream: whether to decode the records one at a time while they
+                are downloaded, instead of a page at a time. This caps the
+                memory used for tables with large fields. It cannot be used
+                with prefetch.
         Yields:
             A dict for each record containing at least three fields: "id",
             "createdTime" and "fields".
         """
-        offset = None
+        if stream and prefetch:
+            raise ValueError('Records cannot be both streamed and prefetched.')
+        cache_key = None
+        generation = None
+        if self.cache is not None:
+            cache_key = json.dumps(['iterate'] + list(_build_get_request(
+                table_name, None, batch_size, offset, filter_by_formula, view, max_records,
+                fields, sort)), sort_keys=True)
+            cached = self.cache.get(table_name, cache_key)
+            if cached is not None:
+                for record in self.serializer.loads(cached, self._dict_class):
+                    yield self._make_record(record, table_name) if self._make_record else record
+                return
+            generation = self._cache_generations[table_name]
+        cached_records = []
+        pages = self._iterate_pages(
+            table_name, batch_size, filter_by_formula, view, max_records, fields, sort, offset,
+            stream)
+        if prefetch:
+            pages = _prefetch(pages, prefetch)
+        for records in pages:
+            for record in records:
+                if cache_key:
+                    cached_records.append(self.serializer.dumps(record).decode('utf-8'))
+                yield self._make_record(record, table_name) if self._make_record else record
+        if cache_key:
+            self._cache_set(
+                table_name, cache_key, '[%s]' % ','.join(cached_records), generation)
+
+    def _iterate_pages(
+            self, table_name, batch_size, filter_by_formula, view, max_records, fields, sort,
+            offset, stream=False, rate_limiter=None):
         while True:
-            response = self.get(
-                table_name, limit=batch_size, offset=offset, max_records=max_records,
-                fields=fields, filter_by_formula=filter_by_formula, view=view, sort=sort)
-            for record in response.pop('records'):
-                yield record
+            url, params = _build_get_request(
+                table_name, None, batch_size, offset, filter_by_formula, view, max_records,
+                fields, sort)
+            try:
+                if stream:
+                    http_response = self.__send(
+                        'GET', url, params, stream=True, rate_limiter=rate_limiter)
+                else:
+                    response = self.__request('GET', url, params, rate_limiter=rate_limiter)
+            except AirtableError as error:
+                error.offset = offset
+                raise
+            if stream:
+                # The other keys of the page, known once all records are read.
+                response = {}
+                yield _stream_records(http_response, self._json_decoder, response)
+            else:
+                yield response.pop('records')
             if 'offset' in response:
                 offset = response['offset']
             else:
                 break
 
+    def _iterate_segment_pages(self, table_name, segment, kwargs, rate_limiter):
+        segment_kwargs = _segment_kwargs(segment, kwargs)
+        return self._iterate_pages(
+            table_name, segment_kwargs.get('batch_size', 0),
+            segment_kwargs.get('filter_by_formula'), segment_kwargs.get('view'),
+            segment_kwargs.get('max_records', 0), segment_kwargs.get('fields'),
+            segment_kwargs.get('sort'), segment_kwargs.get('offset'), rate_limiter=rate_limiter)
+
+    def get_many(self, table_name, record_ids, fields=None, max_workers=4):
+        """Get many records by their IDs, with a few requests.
+
+        The IDs are sent by groups of up to 100 in formulas, and the groups
+        are fetched at the same time. Requests are paced as in
+        parallel_iterate.
+
+        Args:
+            table_name: the name of the table of the records.
+            record_ids: an iterable of record IDs, that can have duplicates.
+            fields: the fields to return, by default all of them.
+            max_workers: the number of groups fetched at the same time.
+        Returns:
+            A dict keyed by each of the record IDs, in the same order, with
+            the record or None if it was not found.
+        """
+        records = self._get_many(table_name, record_ids, fields, max_workers)
+        if self._make_record:
+            for record_id, record in records.items():
+                if record is not None:
+                    records[record_id] = self._make_record(record, table_name)
+        return records
+
+    def _get_many(self, table_name, record_ids, fields, max_workers):
+        """Get many records by their IDs, as dicts even for a compact client."""
+        assert check_string(table_name)
+        records = OrderedDict.fromkeys(record_ids)
+        for record_id in records:
+            assert check_string(record_id)
+        formulas = list(_record_id_formulas(records, 100))
+        kwargs = {'fields': fields}
+        rate_limiter = self.rate_limiter or get_rate_limiter(self.base_id)
+        pages_by_formula = [
+            self._iterate_segment_pages(table_name, formula, kwargs, rate_limiter)
+            for formula in formulas]
+        if len(formulas) > 1 and max_workers > 1:
+            pages = _consume_in_threads(
+                pages_by_formula, max_workers, 2 * max_workers, 'airtable-get-many')
+        else:
+            pages = itertools.chain.from_iterable(pages_by_formula)
+        for page in pages:
+            for record in page:
+                if record['id'] in records:
+                    records[record['id']] = record
+        return dict(records)
+
+    def expand(self, records, paths, max_workers=4):
+        """Replace the IDs in linked record fields by the linked records, in place.
+
+        The linked records are fetched with get_many, once per table and
+        depth, and each record is only fetched once during the expansion, so
+        the number of requests does not depend on the number of links.
+
+        Args:
+            records: a list of records, as dicts (not compact Records). Their
+                fields are replaced by dicts if they cannot be modified, e.g.
+                records of a table with a schema.
+            paths: the link fields to expand, with dots to follow links of
+                linked records, e.g. ['Customer', 'Customer.Account']. The
+                parent of a path must be expanded as well. Either a dict
+                giving the name of the linked table for each path, or a list
+                if the link fields are named after their tables.
+            max_workers: the number of requests sent at the same time for a
+                table, see get_many.
+        Returns:
+            The records. IDs of linked records that were not found are left
+            as they are.
+        """
+        if not isinstance(paths, Mapping):
+            paths = OrderedDict((path, path.rsplit('.', 1)[-1]) for path in paths)
+        for path in paths:
+            parent = path.rpartition('.')[0]
+            if parent and parent not in paths:
+                raise ValueError('Path "%s" cannot be expanded without "%s".' % (path, parent))
+        # The records fetched so far, keyed by table name and ID.
+        fetched = {}
+        for depth in sorted({path.count('.') for path in paths}):
+            links = []
+            for path, table_name in paths.items():
+                if path.count('.') != depth:
+                    continue
+                *parent_fields, field = path.split('.')
+                for parent in _follow_links(records, parent_fields):
+                    values = parent.get('fields', {}).get(field)
+                    if values:
+                        links.append((parent, field, table_name, values))
+            missing_ids = {}
+            for unused_parent, unused_field, table_name, values in links:
+                table_fetched = fetched.setdefault(table_name, {})
+                missing_ids.setdefault(table_name, OrderedDict()).update(
+                    (value, None) for value in values
+                    if isinstance(value, str) and value not in table_fetched)
+            for table_name, record_ids in missing_ids.items():
+                if record_ids:
+                    # Dicts, as their fields may be expanded at the next depth.
+                    fetched[table_name].update(
+                        self._get_many(table_name, record_ids, None, max_workers))
+            for parent, field, table_name, values in links:
+                if not isinstance(parent['fields'], collections.abc.MutableMapping):
+                    # E.g. the typed fields of a table with a schema.
+                    parent['fields'] = self._dict_class(parent['fields'])
+                parent['fields'][field] = [
+                    fetched[table_name].get(value) or value if isinstance(value, str) else value
+                    for value in values]
+        return records
+
+    def parallel_iterate(self, table_name, segments, max_workers=4, **kwargs):
+        """Iterate over segments of a table, fetching them at the same time.
+
+        Requests go through the rate limiter of the client or, if it has
+        none, through the one shared by the clients of the base in this
+        process, see get_rate_limiter.
+
+        Args:
+            table_name: the name of the table to list.
+            segments: the parts of the table to fetch, that should not
+                overlap. Each one is either a formula selecting its records,
+                or a dict of arguments of iterate, e.g. {'view': 'Archived'}.
+            max_workers: the number of segments fetched at the same time.
+            Other keyword arguments are passed to iterate for all segments,
+                except prefetch and stream: a TypeError is raised for them
+                and for unknown arguments.
+        Yields:
+            The records of all segments, in the order they are fetched.
+        """
+        rate_limiter = self.rate_limiter or get_rate_limiter(self.base_id)
+        pages = _consume_in_threads(
+            [
+                self._iterate_segment_pages(table_name, segment, kwargs, rate_limiter)
+                for segment in segments],
+            max_workers, 2 * max_workers, 'airtable-parallel')
+        for records in pages:
+            for record in records:
+                yield self._make_record(record, table_name) if self._make_record else record
+
+    def parallel_export(
+            self, table_name, segments, path_pattern, max_workers=4, **kwargs):
+        """Write segments of a table to JSON Lines files, fetching them at the same time.
+
+        Args:
+            table_name: the name of the table to export.
+            segments: the parts of the table to fetch, see parallel_iterate.
+            path_pattern: the path of the file of each segment, formatted
+                with its index, e.g. "backup/people-{index}.jsonl".
+            max_workers: the number of segments fetched at the same time.
+            Other keyword arguments are passed to iterate for all segments,
+                see parallel_iterate.
+        Returns:
+            A dict with the number of records written to each file, keyed
+            by path.
+        """
+        rate_limiter = self.rate_limiter or get_rate_limiter(self.base_id)
+        segments = list(segments)
+        for segment in segments:
+            # Check the arguments before any file is written.
+            _segment_kwargs(segment, kwargs)
+
+        def _export(index, segment):
+            path = path_pattern.format(index=index)
+            count = 0
+            with open(path, 'w') as shard_file:
+                for records in self._iterate_segment_pages(
+                        table_name, segment, kwargs, rate_limiter):
+                    for record in records:
+                        shard_file.write(json.dumps(record) + '\n')
+                        count += 1
+            return path, count
+
+        import concurrent.futures  # pylint: disable=import-outside-toplevel
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers, thread_name_prefix='airtable-parallel') as executor:
+            futures = [
+                executor.submit(_export, index, segment)
+                for index, segment in enumerate(segments)]
+            return dict(future.result() for future in futures)
+
+    def export(
+            self, table_name, path, file_format=None, fields=None,
+            flush_every=_export.DEFAULT_FLUSH_EVERY, **kwargs):
+        """Write the records of a table to a file while iterating over them.
+
+        Only a batch of records is kept in memory at a time, whatever the
+        size of the table.
+
+        Args:
+            table_name: the name of the table to export.
+            path: the path of the file to write.
+            file_format: "jsonl", "csv", "parquet" or "arrow", by default
+                guessed from the extension of the path. Parquet and Arrow
+                files require pyarrow.
+            fields: the fields to fetch and to write as columns. By default,
+                all fields are fetched and, except for JSON Lines, the columns
+                are the fields of the table in the metadata API. If it cannot
+                be read, e.g. without the schema.bases:read scope, the columns
+                are the fields of the first batch of records, see
+                export.export_records.
+            flush_every: the number of records buffered before writing them.
+            Other keyword arguments are passed to iterate.
+        Returns:
+            The number of records written.
+        """
+        file_format = file_format or _export._guess_format(path)  # pylint: disable=protected-access
+        columns = fields
+        if columns is None and file_format != 'jsonl':
+            try:
+                columns = list(self.get_schema(table_name))
+            except (AirtableError, KeyError):
+                pass
+        return _export.export_records(
+            self.iterate(table_name, fields=fields, **kwargs), path, file_format, columns,
+            flush_every)
+
+    def iterate_changes(
+            self, table_name, since, modified_field, overlap=_sync.DEFAULT_OVERLAP, seen=None,
+            filter_by_formula=None, fields=None, **kwargs):
+        """Iterate over the records of a table modified after a given time.
+
+        Args:
+            table_name: the name of the table to list.
+            since: the time (a datetime or a string as returned by the API)
+                after which the records were modified, or None to get all
+                the records.
+            modified_field: the name of a "last modified time" field of the
+                table.
+            overlap: the number of seconds before since to look at as well,
+                to make up for clock skews and records saved during the
+                previous iteration.
+            seen: a dict of the last modified times of records already
+                returned, keyed by their IDs. Those records are skipped unless
+                they were modified again. The dict is updated with the
+                returned records.
+            filter_by_formula: a formula to filter the modified records.
+            fields: the fields to return, the modified field is added to them.
+            Other keyword arguments are passed to iterate.
+        Yields:
+            The modified records, each at most once.
+        """
+        formula = None if since is None else _sync.changes_formula(modified_field, since, overlap)
+        if filter_by_formula:
+            formula = 'AND(%s, %s)' % (filter_by_formula, formula) if formula \
+                else filter_by_formula
+        if fields and modified_field not in fields:
+            fields = list(fields) + [modified_field]
+        if seen is None:
+            seen = {}
+        for record in self.iterate(
+                table_name, filter_by_formula=formula, fields=fields, **kwargs):
+            modified = record.get('fields', {}).get(modified_field) or record.get('createdTime')
+            if seen.get(record['id']) == modified:
+                continue
+            seen[record['id']] = modified
+            yield record
+
+    def sync(
+            self, table_name, store, modified_field, key=None, overlap=_sync.DEFAULT_OVERLAP,
+            **kwargs):
+        """Iterate over the records of a table changed since the previous sync.
+
+        The first sync returns all the records. The watermark of the sync is
+        only saved once all the records were iterated over, so a sync that
+        was interrupted is started over the next time.
+
+        Args:
+            table_name: the name of the table to sync.
+            store: a watermark store, or the path of a JSON file to keep the
+                watermarks in.
+            modified_field: the name of a "last modified time" field of the
+                table.
+            key: the name of the watermark in the store, by default the name
+                of the table.
+            overlap: the number of seconds before the watermark to look at as
+                well, see iterate_changes.
+            Other keyword arguments are passed to iterate_changes.
+        Yields:
+            The records changed since the previous sync.
+        """
+        if isinstance(store, str):
+            store = _sync.FileWatermarkStore(store)
+        key = key or table_name
+        watermark = store.get(key) or {}
+        since = watermark.get('since')
+        seen = dict(watermark.get('seen', {}))
+        for record in self.iterate_changes(
+                table_name, since, modified_field, overlap=overlap, seen=seen, **kwargs):
+            yield record
+        if not seen:
+            return
+        latest = max(_sync.parse_time(modified) for modified in seen.values() if modified)
+        if since:
+            latest = max(latest, _sync.parse_time(since))
+        window_start = latest - datetime.timedelta(seconds=overlap)
+        store.set(key, {
+            'since': _sync.format_time(latest),
+            # Records that the next sync will get again if not modified.
+            'seen': {
+                record_id: modified for record_id, modified in seen.items()
+                if modified and _sync.parse_time(modified) > window_start},
+        })
+
     def create(self, table_name, data):
         assert check_string(table_name)
         payload = create_payload(data)
-        return self.__request('POST', table_name, payload=json.dumps(payload))
+        return self.__request('POST', table_name, payload=self.serializer.dumps(payload))
 
     def update(self, table_name, record_id, data):
         assert check_string(table_name) and check_string(record_id)
         url = posixpath.join(table_name, record_id)
         payload = create_payload(data)
-        return self.__request('PATCH', url, payload=json.dumps(payload))
+        return self.__request('PATCH', url, payload=self.serializer.dumps(payload))
 
     def update_all(self, table_name, record_id, data):
         assert check_string(table_name) and check_string(record_id)
         url = posixpath.join(table_name, record_id)
         payload = create_payload(data)
-        return self.__request('PUT', url, payload=json.dumps(payload))
+        return self.__request('PUT', url, payload=self.serializer.dumps(payload))
 
     def delete(self, table_name, record_id):
         assert check_string(table_name) and check_string(record_id)
         url = posixpath.join(table_name, record_id)
         return self.__request('DELETE', url)
 
-    def table(self, table_name):
-        return Table(self, table_name)
+    def create_many(self, table_name, data):
+        """Create many records, sending them by batches.
+
+        Args:
+            table_name: the name of the table in which to create the records.
+            data: an iterable (e.g. a generator) of the fields of each record
+                to create.
+        Yields:
+            The created records, in the same order as the input. Note that the
+            records are only sent while iterating over the result.
+        """
+        assert check_string(table_name)
+        for chunk in _chunks(data, MAX_RECORDS_PER_REQUEST):
+            payload = {'records': [create_payload(fields) for fields in chunk]}
+            response = self.__request('POST', table_name, payload=self.serializer.dumps(payload))
+            for record in response['records']:
+                yield record
+
+    def _update_many(self, method, table_name, records):
+        assert check_string(table_name)
+        for chunk in _chunks(records, MAX_RECORDS_PER_REQUEST):
+            payload = {'records': []}
+            for record_id, data in chunk:
+                assert check_string(record_id)
+                payload['records'].append(dict(create_payload(data), id=record_id))
+            response = self.__request(method, table_name, payload=self.serializer.dumps(payload))
+            for record in response['records']:
+                yield record
+
+    def update_many(self, table_name, records):
+        """Update some fields of many records, sending them by batches.
+
+        Args:
+            table_name: the name of the table of the records.
+            records: an iterable of (record_id, data) pairs, data being the
+                fields to update for the record.
+        Yields:
+            The updated records, in the same order as the input. Note that the
+            updates are only sent while iterating over the result.
+        """
+        return self._update_many('PATCH', table_name, records)
+
+    def update_all_many(self, table_name, records):
+        """Replace all fields of many records, sending them by batches.
+
+        Same as update_many, but fields that are not given are cleared.
+        """
+        return self._update_many('PUT', table_name, records)
+
+    def delete_many(self, table_name, record_ids):
+        """Delete many records, sending them by batches.
+
+        Args:
+            table_name: the name of the table of the records.
+            record_ids: an iterable of the IDs of the records to delete.
+        Yields:
+            A dict for each deleted record with its "id" and a "deleted" flag,
+            in the same order as the input. Note that the deletions are only
+            sent while iterating over the result.
+        """
+        assert check_string(table_name)
+        for chunk in _chunks(record_ids, MAX_RECORDS_PER_REQUEST):
+            for record_id in chunk:
+                assert check_string(record_id)
+            response = self.__request('DELETE', table_name, params={'records[]': chunk})
+            for record in response['records']:
+                yield record
+
+    def bulk_import(self, table_name, rows, journal, key_field=None):
+        """Create many records, keeping a journal to resume after a crash.
+
+        Each batch is recorded in the journal before it is sent, and the IDs
+        of the created records once it is confirmed. When the import is run
+        again with the same journal, the rows already created are skipped.
+        Batches that were sent but not confirmed are checked in the table
+        if there is a key field, or sent again otherwise (which may create
+        duplicates of the rows of the batch that was in flight).
+
+        Args:
+            table_name: the name of the table in which to create the records.
+            rows: an iterable of the fields of each record to create, in the
+                same order each time the import is run if there is no key
+                field.
+            journal: a journal.ImportJournal, or the path of its sqlite file.
+            key_field: the name of a field whose values identify the rows.
+                By default, rows are identified by their position.
+        Returns:
+            A dict with the number of rows "created", "skipped" as already
+            created, and "recovered" from batches not confirmed.
+        """
+        assert check_string(table_name)
+        if isinstance(journal, str):
+            from . import journal as _journal  # pylint: disable=import-outside-toplevel
+            journal = _journal.ImportJournal(journal)
+            try:
+                return self.bulk_import(table_name, rows, journal, key_field)
+            finally:
+                journal.close()
+        counts = {'created': 0, 'skipped': 0, 'recovered': 0}
+        for batch_id, keys in journal.pending_batches():
+            found = {}
+            if key_field:
+                found = self._find_by_keys(table_name, key_field, keys)
+                counts['recovered'] += len(found)
+            journal.confirm(batch_id, found)
+        confirmed = journal.confirmed_keys()
+
+        def _send(batch):
+            batch_id = journal.submit([key for key, unused_fields in batch])
+            payload = {'records': [create_payload(fields) for unused_key, fields in batch]}
+            response = self.__request('POST', table_name, payload=self.serializer.dumps(payload))
+            journal.confirm(batch_id, {
+                key: record['id']
+                for (key, unused_fields), record in zip(batch, response['records'])})
+            counts['created'] += len(batch)
+
+        batch = []
+        for index, fields in enumerate(rows):
+            key = _formula_value(fields[key_field]) if key_field else str(index)
+            if key in confirmed:
+                counts['skipped'] += 1
+                continue
+            batch.append((key, fields))
+            if len(batch) == MAX_RECORDS_PER_REQUEST:
+                _send(batch)
+                batch = []
+        if batch:
+            _send(batch)
+        return counts
+
+    def _find_by_keys(self, table_name, key_field, keys):
+        """The IDs of the records having the given key values, keyed by key."""
+        found = {}
+        for chunk in _chunks(keys, 100):
+            formula = 'OR(%s)' % ','.join('{%s}=%s' % (key_field, key) for key in chunk)
+            for record in self.iterate(table_name, filter_by_formula=formula, fields=[key_field]):
+                key = _formula_value(record['fields'].get(key_field))
+                if key in chunk:
+                    found[key] = record['id']
+        return found
+
+    def upsert_many(
+            self, table_name, records, key_fields, existing=None, skip_unchanged=True):
+        """Create or update many records matched on key fields, sending them by batches.
+
+        Records are matched by the API, which creates those that do not
+        exist yet. Records whose fields already have the given values in the
+        table are not sent at all, so that a feed that barely changes costs
+        only a few requests.
+
+        Args:
+            table_name: the name of the table of the records.
+            records: an iterable of the fields of each record.
+            key_fields: the names of the fields identifying a record, that
+                all records must have.
+            existing: the current records of the table, e.g. a TableMirror,
+                to find the unchanged records. By default, they are fetched
+                with iterate.
+            skip_unchanged: whether to skip the records that have not
+                changed. If not, all the records are sent and existing is
+                not used.
+        Yields:
+            The created, updated or unchanged records, in the same order as
+            the input. Note that the changes are only sent while iterating
+            over the result.
+        """
+        assert check_string(table_name)
+        key_fields = list(key_fields)
+        if not key_fields:
+            raise ValueError('At least one key field is needed to match records.')
+        snapshot = None
+        if skip_unchanged:
+            if existing is None:
+                existing = self.iterate(table_name)
+            snapshot = {
+                _upsert_key(record.get('fields', {}), key_fields): record
+                for record in existing}
+        # The records to yield, None for the ones not sent yet.
+        results = []
+        batch = {}
+
+        def _normalize(record):
+            # Records of the snapshot may come from elsewhere, e.g. a mirror.
+            if self._make_record and not isinstance(record, Record):
+                return self._make_record(record, table_name)
+            return record
+
+        def _send():
+            payload = {
+                'performUpsert': {'fieldsToMergeOn': key_fields},
+                'records': [create_payload(fields) for unused_index, fields in batch.values()],
+            }
+            response = self.__request('PATCH', table_name, payload=self.serializer.dumps(payload))
+            for (key, (index, unused_fields)), record in zip(batch.items(), response['records']):
+                record = _normalize(record)
+                results[index] = record
+                if snapshot is not None:
+                    snapshot[key] = record
+            batch.clear()
+
+        for fields in records:
+            missing = [field for field in key_fields if field not in fields]
+            if missing:
+                raise ValueError('Record %r is missing key fields %r.' % (fields, missing))
+            key = _upsert_key(fields, key_fields)
+            record = snapshot.get(key) if snapshot is not None else None
+            if record is None or _has_changes(record, fields):
+                if key in batch:
+                    # The API refuses to match two records of a request to the same one.
+                    _send()
+                batch[key] = (len(results), fields)
+                results.append(None)
+                if len(batch) == MAX_RECORDS_PER_REQUEST:
+                    _send()
+            else:
+                results.append(_normalize(record))
+            if not batch:
+                for record in results:
+                    yield record
+                results = []
+        if batch:
+            _send()
+        for record in results:
+            yield record
+
+    def get_schema(self, table_name):
+        """Get the schema of a table from the metadata API, see schema.from_metadata.
+
+        Args:
+            table_name: the name or ID of the table.
+        """
+        from . import schema as _schema  # pylint: disable=import-outside-toplevel
+        url = posixpath.join(self.airtable_url, 'meta/bases', self.base_id, 'tables')
+        for table in self.__request('GET', url)['tables']:
+            if table_name in (table['name'], table['id']):
+                return _schema.from_metadata(table['fields'])
+        raise KeyError('No table "%s" in base %s.' % (table_name, self.base_id))
+
+    def table(self, table_name, schema=None):
+        return Table(self, table_name, schema=schema)
 
 
 class Table(Generic[_T]):
-    def __init__(self, base_id, table_name, api_key=None, dict_class=OrderedDict):
+    def __init__(self, base_id, table_name, api_key=None, dict_class=OrderedDict, schema=None):
         """Create a client to connect to an Airtable Table.
 
         Args:
@@ -213,24 +1649,54 @@ class Table(Generic[_T]):
                   fields. By default the fields are kept in the order they were
                   returned by the API using an OrderedDict, but you can switch
                   to a simple dict if you prefer.
+            - schema: the types of the fields, to convert the values of the
+                  records read from the table (e.g. to datetime or Decimal),
+                  see the airtable.schema module. Either a dict of field types
+                  or True to read them from the metadata API on first use.
+                  By default, values are returned as decoded from JSON.
         """
         self.table_name = table_name
+        self._schema = schema
+        self._converter = None
         if isinstance(base_id, Airtable):
             self._client = base_id
             return
         self._client = Airtable(base_id, api_key, dict_class=dict_class)
 
+    def _typed(self, record):
+        if not self._schema:
+            return record
+        if self._converter is None:
+            schema = self._schema
+            if schema is True:
+                schema = self._client.get_schema(self.table_name)
+            from . import schema as _schema  # pylint: disable=import-outside-toplevel
+            self._converter = _schema.compile_schema(schema)
+        return self._converter(record)
+
+    def _typed_all(self, records):
+        if not self._schema:
+            return records
+        return (self._typed(record) for record in records)
+
     def get(  # pylint:disable=invalid-name
             self, record_id=None, limit=0, offset=None,
             filter_by_formula=None, view=None, max_records=0, fields=None):
-        return self._client.get(
+        response = self._client.get(
             self.table_name, record_id, limit, offset, filter_by_formula, view, max_records, fields)
+        if not self._schema:
+            return response
+        if record_id:
+            return self._typed(response)
+        response['records'] = [self._typed(record) for record in response['records']]
+        return response
 
     def iterate(
             self, batch_size=0, filter_by_formula=None,
-            view=None, max_records=0, fields=None):
-        return self._client.iterate(
-            self.table_name, batch_size, filter_by_formula, view, max_records, fields)
+            view=None, max_records=0, fields=None, offset=None, prefetch=0, stream=False):
+        return self._typed_all(self._client.iterate(
+            self.table_name, batch_size, filter_by_formula, view, max_records, fields,
+            offset=offset, prefetch=prefetch, stream=stream))
 
     def create(self, data):
         return self._client.create(self.table_name, data)
@@ -244,6 +1710,60 @@ class Table(Generic[_T]):
     def delete(self, record_id):
         return self._client.delete(self.table_name, record_id)
 
+    def get_many(self, record_ids, fields=None, max_workers=4):
+        records = self._client.get_many(self.table_name, record_ids, fields, max_workers)
+        if not self._schema:
+            return records
+        return {
+            record_id: record and self._typed(record) for record_id, record in records.items()}
+
+    def expand(self, records, paths, max_workers=4):
+        return self._client.expand(records, paths, max_workers)
+
+    def parallel_iterate(self, segments, max_workers=4, **kwargs):
+        return self._typed_all(self._client.parallel_iterate(
+            self.table_name, segments, max_workers, **kwargs))
+
+    def parallel_export(self, segments, path_pattern, max_workers=4, **kwargs):
+        return self._client.parallel_export(
+            self.table_name, segments, path_pattern, max_workers, **kwargs)
+
+    def export(self, path, file_format=None, fields=None, **kwargs):
+        return self._client.export(self.table_name, path, file_format, fields, **kwargs)
+
+    def iterate_changes(self, since, modified_field, **kwargs):
+        return self._typed_all(self._client.iterate_changes(
+            self.table_name, since, modified_field, **kwargs))
+
+    def sync(self, store, modified_field, **kwargs):
+        return self._typed_all(self._client.sync(
+            self.table_name, store, modified_field, **kwargs))
+
+    def create_many(self, data):
+        return self._client.create_many(self.table_name, data)
+
+    def update_many(self, records):
+        return self._client.update_many(self.table_name, records)
+
+    def update_all_many(self, records):
+        return self._client.update_all_many(self.table_name, records)
+
+    def delete_many(self, record_ids):
+        return self._client.delete_many(self.table_name, record_ids)
+
+    def bulk_import(self, rows, journal, key_field=None):
+        return self._client.bulk_import(self.table_name, rows, journal, key_field)
+
+    def upsert_many(self, records, key_fields, existing=None, skip_unchanged=True):
+        return self._client.upsert_many(
+            self.table_name, records, key_fields, existing, skip_unchanged)
+
+    def buffered_writer(self, **kwargs):
+        """A writer buffering changes to this table, see writer.BufferedWriter."""
+        # Imported here as the writer module depends on this one.
+        from . import writer  # pylint: disable=import-outside-toplevel
+        return writer.BufferedWriter(self, **kwargs)
+
 
 class _ProxyModule(object):
 
@@ -277,5 +1797,15 @@ class _ProxyModule(object):
         return delattr(self._this(), name)
 
 
-# Access to this module through deprecated "import airtable from airtable".
-airtable = _ProxyModule()
+# Modules of the package that are only imported when first used.
+_LAZY_MODULES = frozenset((
+    'aio', 'cache', 'journal', 'metrics', 'mirror', 'pool', 'schema', 'writer'))
+
+
+def __getattr__(name):
+    if name == 'airtable':
+        # Access to this module through deprecated "import airtable from airtable".
+        return _ProxyModule()
+    if name in _LAZY_MODULES:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
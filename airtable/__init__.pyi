@@ -1,8 +1,23 @@
+import abc
 import typing
-from typing import Any, Dict, Generic, Iterable, Iterator, List, Literal, Mapping, Optional, Tuple, TypedDict, Union, overload
+from typing import Callable, FrozenSet
+
+from .cache import _Cache
+from .journal import ImportJournal
+from .schema import Converter, ListOf, _Schema
+from .serializer import _Serializer
+from .sync import _Time, _WatermarkStore
+from .transport import _Transport
+from .writer import BufferedWriter
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Literal, Mapping, Optional, Protocol, Tuple, TypedDict, Union, overload
 
 API_URL: str
 API_VERSION: str
+DEFAULT_POOL_SIZE: int
+MAX_RECORDS_PER_REQUEST: int
+DEFAULT_RATE_LIMIT: int
+RATE_LIMIT_PENALTY: int
+MAX_FORMULA_LENGTH: int
 
 class IsNotInteger(Exception):
     ...
@@ -20,13 +35,89 @@ def create_payload(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     ...
 
 
+class RateLimiter(object):
+    rate: float
+    burst: float
+    requests: int
+    wait_time: float
+
+    def __init__(
+            self, rate: float = ..., burst: float = ...,
+            clock: Callable[[], float] = ..., sleep: Callable[[float], Any] = ...) -> None:
+        ...
+
+    def reserve(self) -> float:
+        ...
+
+    def acquire(self) -> float:
+        ...
+
+    def pause(self, seconds: float) -> None:
+        ...
+
+    def throughput(self) -> float:
+        ...
+
+
+IDEMPOTENT_METHODS: FrozenSet[str]
+TRANSIENT_STATUSES: FrozenSet[int]
+
+
+class RetryPolicy(object):
+    max_attempts: int
+    backoff_base: float
+    backoff_cap: float
+    jitter: bool
+    methods: FrozenSet[str]
+    statuses: FrozenSet[int]
+    retries: int
+    backoff_time: float
+
+    def __init__(
+            self, max_attempts: int = ..., backoff_base: float = ..., backoff_cap: float = ...,
+            jitter: bool = ..., methods: Iterable[str] = ..., statuses: Iterable[int] = ...,
+            on_retry: Optional[Callable[[str, str, int, float], Any]] = ...,
+            sleep: Callable[[float], Any] = ..., random_func: Callable[[], float] = ...) -> None:
+        ...
+
+    def should_retry(self, method: str, attempt: int, status_code: Optional[int] = ...) -> bool:
+        ...
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = ...) -> float:
+        ...
+
+    def record_retry(
+            self, method: str, url: str, attempt: int, retry_after: Optional[str] = ...) -> float:
+        ...
+
+    def backoff(
+            self, method: str, url: str, attempt: int, retry_after: Optional[str] = ...) -> None:
+        ...
+
+
+def get_rate_limiter(base_id: str) -> RateLimiter:
+    ...
+
+
 _RecordType = typing.TypeVar('_RecordType', bound=Mapping[str, Any], covariant=True)
 _InferRecordType = typing.TypeVar('_InferRecordType', bound=Mapping[str, Any])
+_Self = typing.TypeVar('_Self')
+_R = typing.TypeVar('_R', bound=Mapping[str, Any])
 
 
 # TODO(pcorpet): Switch to use TypedDict, when https://github.com/python/mypy/issues/3863 is
 # implemented.
-class Record(Generic[_RecordType]):
+class Record(Generic[_RecordType], metaclass=abc.ABCMeta):
+    def __init__(
+            self, record_id: str, created_time: Optional[str], fields: _RecordType) -> None:
+        ...
+
+    def __iter__(self) -> Iterator[str]:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
     @overload
     def __getitem__(self, key: Literal['id']) -> str:
         ...
@@ -64,21 +155,48 @@ class AirtableError(Exception):
 
     type: str
     message: str
+    offset: Optional[str]
 
     def __init__(self, error_type: str, message: str) -> None:
         ...
 
 
+class RequestEvent(object):
+    method: str
+    url: str
+    table_name: Optional[str]
+    operation: str
+    bytes_sent: int
+    bytes_received: int
+    status_code: Optional[int]
+    retries: int
+    latency: Optional[float]
+    error: Optional[BaseException]
+
+    def __init__(self, method: str, url: str, payload: Optional[bytes]) -> None:
+        ...
+
+
+class _Observer(Protocol):
+    def before_request(self, event: RequestEvent) -> None:
+        ...
+
+    def after_request(self, event: RequestEvent) -> None:
+        ...
+
+
 class Table(Generic[_RecordType]):
     @overload
     def __init__(
-            self, base_id: str, table_name: str, api_key: str,  dict_class: type = ...) -> None:
+            self, base_id: str, table_name: str, api_key: str,  dict_class: type = ...,
+            schema: Union[_Schema, Converter, Literal[True], None] = ...) -> None:
         ...
 
     @overload
     def __init__(
             self, base_id: Airtable, table_name: str, api_key: None = ...,
-            dict_class: type = ...) -> None:
+            dict_class: type = ...,
+            schema: Union[_Schema, Converter, Literal[True], None] = ...) -> None:
         ...
 
     def iterate(
@@ -87,7 +205,10 @@ class Table(Generic[_RecordType]):
             filter_by_formula: Optional[str] = None,
             view: Optional[str] = None,
             max_records: int = 0,
-            fields: Union[List[str], Tuple[str], None] = ...) -> Iterator[Record[_RecordType]]:
+            fields: Union[List[str], Tuple[str], None] = ...,
+            offset: Optional[str] = ...,
+            prefetch: int = ...,
+            stream: bool = ...) -> Iterator[Record[_RecordType]]:
         ...
 
     @overload
@@ -115,6 +236,44 @@ class Table(Generic[_RecordType]):
             -> Record[_RecordType]:
         ...
 
+    def get_many(
+            self, record_ids: Iterable[str], fields: Union[List[str], Tuple[str], None] = ...,
+            max_workers: int = ...) -> Dict[str, Optional[Record[_RecordType]]]:
+        ...
+
+    def expand(
+            self, records: List[_R], paths: Union[Mapping[str, str], Iterable[str]],
+            max_workers: int = ...) -> List[_R]:
+        ...
+
+    def parallel_iterate(
+            self, segments: Iterable[Union[str, Mapping[str, Any]]], max_workers: int = ...,
+            **kwargs: Any) -> Iterator[Record[_RecordType]]:
+        ...
+
+    def parallel_export(
+            self, segments: Iterable[Union[str, Mapping[str, Any]]], path_pattern: str,
+            max_workers: int = ..., **kwargs: Any) -> Dict[str, int]:
+        ...
+
+    def export(
+            self, path: str, file_format: Optional[str] = ...,
+            fields: Union[List[str], Tuple[str], None] = ..., **kwargs: Any) -> int:
+        ...
+
+    def iterate_changes(
+            self, since: Optional[_Time], modified_field: str, *, overlap: float = ...,
+            seen: Optional[Dict[str, str]] = ..., filter_by_formula: Optional[str] = ...,
+            fields: Union[List[str], Tuple[str], None] = ...,
+            **kwargs: Any) -> Iterator[Record[_RecordType]]:
+        ...
+
+    def sync(
+            self, store: Union[str, _WatermarkStore], modified_field: str, *,
+            key: Optional[str] = ..., overlap: float = ...,
+            **kwargs: Any) -> Iterator[Record[_RecordType]]:
+        ...
+
     def create(self, data: Mapping[str, Any]) -> Record[_RecordType]:
         ...
 
@@ -131,14 +290,73 @@ class Table(Generic[_RecordType]):
     def delete(self, record_id: str) -> _DeletedRecord:
         ...
 
+    def create_many(self, data: Iterable[Mapping[str, Any]]) -> Iterator[Record[_RecordType]]:
+        ...
+
+    def update_many(
+            self, records: Iterable[Tuple[str, Mapping[str, Any]]]) \
+            -> Iterator[Record[_RecordType]]:
+        ...
+
+    def update_all_many(
+            self, records: Iterable[Tuple[str, Mapping[str, Any]]]) \
+            -> Iterator[Record[_RecordType]]:
+        ...
+
+    def delete_many(self, record_ids: Iterable[str]) -> Iterator[_DeletedRecord]:
+        ...
+
+    def bulk_import(
+            self, rows: Iterable[Mapping[str, Any]], journal: Union[str, ImportJournal],
+            key_field: Optional[str] = ...) -> Dict[str, int]:
+        ...
+
+    def upsert_many(
+            self, records: Iterable[Mapping[str, Any]], key_fields: Iterable[str],
+            existing: Optional[Iterable[Mapping[str, Any]]] = ...,
+            skip_unchanged: bool = ...) -> Iterator[Record[_RecordType]]:
+        ...
+
+    def buffered_writer(
+            self, *, max_pending: int = ..., max_delay: Optional[float] = ...,
+            clock: Callable[[], float] = ...) -> BufferedWriter:
+        ...
+
 
 class Airtable(object):
     airtable_url: str = ...
+    base_id: str = ...
     base_url: str = ...
     headers: Mapping[str, str] = ...
+    rate_limiter: Optional[RateLimiter] = ...
+    retry_policy: Optional[RetryPolicy] = ...
+    cache: Optional[_Cache] = ...
+    observers: List[_Observer] = ...
+    coalesced_reads: int = ...
+    transport: _Transport = ...
+    serializer: _Serializer = ...
 
     def __init__(
-            self, base_id: str, api_key: str, dict_class: type = ...) -> None:
+            self, base_id: str, api_key: str, dict_class: type = ...,
+            pool_size: int = ..., max_retries: int = ...,
+            timeout: Union[float, Tuple[float, float], None] = ...,
+            rate_limiter: Union[RateLimiter, Literal[True], None] = ...,
+            retry_policy: Optional[RetryPolicy] = ...,
+            cache: Optional[_Cache] = ...,
+            compact_records: bool = ...,
+            observers: Iterable[_Observer] = ...,
+            coalesce_reads: bool = ...,
+            transport: Union[str, _Transport, None] = ...,
+            serializer: Union[str, _Serializer, None] = ...) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def __enter__(self: _Self) -> _Self:
+        ...
+
+    def __exit__(self, *unused_exc_info: Any) -> None:
         ...
 
     def iterate(
@@ -148,7 +366,11 @@ class Airtable(object):
             filter_by_formula: Optional[str] = None,
             view: Optional[str] = None,
             max_records: int = 0,
-            fields: Union[List[str], Tuple[str], None] = ...) -> Iterator[_DefaultRecordType]:
+            fields: Union[List[str], Tuple[str], None] = ...,
+            sort: Optional[Mapping[str, str]] = ...,
+            offset: Optional[str] = ...,
+            prefetch: int = ...,
+            stream: bool = ...) -> Iterator[_DefaultRecordType]:
         ...
 
     @overload
@@ -161,7 +383,8 @@ class Airtable(object):
             filter_by_formula: Optional[str] = None,
             view: Optional[str] = None,
             max_records: int = 0,
-            fields: Union[List[str], Tuple[str], None] = ...) -> Dict[str, List[_DefaultRecordType]]:
+            fields: Union[List[str], Tuple[str], None] = ...,
+            sort: Optional[Mapping[str, str]] = ...) -> Dict[str, List[_DefaultRecordType]]:
      ...
 
     @overload
@@ -174,8 +397,49 @@ class Airtable(object):
             filter_by_formula: None = None,
             view: None = None,
             max_records: Literal[0] = 0,
-            fields: Union[List[str], Tuple[str], None] = ...) \
-            -> _DefaultRecordType:
+            fields: Union[List[str], Tuple[str], None] = ...,
+            sort: None = ...) -> _DefaultRecordType:
+        ...
+
+    def get_many(
+            self, table_name: str, record_ids: Iterable[str],
+            fields: Union[List[str], Tuple[str], None] = ...,
+            max_workers: int = ...) -> Dict[str, Optional[_DefaultRecordType]]:
+        ...
+
+    def expand(
+            self, records: List[_R], paths: Union[Mapping[str, str], Iterable[str]],
+            max_workers: int = ...) -> List[_R]:
+        ...
+
+    def parallel_iterate(
+            self, table_name: str, segments: Iterable[Union[str, Mapping[str, Any]]],
+            max_workers: int = ..., **kwargs: Any) -> Iterator[_DefaultRecordType]:
+        ...
+
+    def parallel_export(
+            self, table_name: str, segments: Iterable[Union[str, Mapping[str, Any]]],
+            path_pattern: str, max_workers: int = ..., **kwargs: Any) -> Dict[str, int]:
+        ...
+
+    def export(
+            self, table_name: str, path: str, file_format: Optional[str] = ...,
+            fields: Union[List[str], Tuple[str], None] = ..., flush_every: int = ...,
+            **kwargs: Any) -> int:
+        ...
+
+    def iterate_changes(
+            self, table_name: str, since: Optional[_Time], modified_field: str,
+            overlap: float = ..., seen: Optional[Dict[str, str]] = ...,
+            filter_by_formula: Optional[str] = ...,
+            fields: Union[List[str], Tuple[str], None] = ...,
+            **kwargs: Any) -> Iterator[_DefaultRecordType]:
+        ...
+
+    def sync(
+            self, table_name: str, store: Union[str, _WatermarkStore], modified_field: str,
+            key: Optional[str] = ..., overlap: float = ...,
+            **kwargs: Any) -> Iterator[_DefaultRecordType]:
         ...
 
     def create(self, table_name: str, data: _InferRecordType) -> Record[_InferRecordType]:
@@ -192,7 +456,41 @@ class Airtable(object):
     def delete(self, table_name: str, record_id: str) -> _DefaultRecordType:
         ...
 
-    def table(self, table_name: str) -> Table[_RecordType]:
+    def create_many(
+            self, table_name: str,
+            data: Iterable[_InferRecordType]) -> Iterator[Record[_InferRecordType]]:
+        ...
+
+    def update_many(
+            self, table_name: str,
+            records: Iterable[Tuple[str, _InferRecordType]]) -> Iterator[Record[_InferRecordType]]:
+        ...
+
+    def update_all_many(
+            self, table_name: str,
+            records: Iterable[Tuple[str, _InferRecordType]]) -> Iterator[Record[_InferRecordType]]:
+        ...
+
+    def delete_many(self, table_name: str, record_ids: Iterable[str]) -> Iterator[_DeletedRecord]:
+        ...
+
+    def bulk_import(
+            self, table_name: str, rows: Iterable[Mapping[str, Any]],
+            journal: Union[str, ImportJournal], key_field: Optional[str] = ...) -> Dict[str, int]:
+        ...
+
+    def upsert_many(
+            self, table_name: str, records: Iterable[_InferRecordType],
+            key_fields: Iterable[str], existing: Optional[Iterable[Mapping[str, Any]]] = ...,
+            skip_unchanged: bool = ...) -> Iterator[Record[_InferRecordType]]:
+        ...
+
+    def get_schema(self, table_name: str) -> Dict[str, Union[str, ListOf]]:
+        ...
+
+    def table(
+            self, table_name: str,
+            schema: Union[_Schema, Converter, Literal[True], None] = ...) -> Table[_RecordType]:
         ...
 
 airtable: Any = ...
@@ -0,0 +1,225 @@
+"""Asynchronous client for the Airtable API, based on aiohttp.
+
+It mirrors the blocking client of the airtable module:
+
+    async with AsyncAirtable('BASE_ID', 'API_KEY') as at:
+        async for record in at.table('TABLE_NAME').iterate():
+            ...
+"""
+
+import asyncio
+import functools
+import json
+import posixpath
+from collections import OrderedDict
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from . import (
+    API_URL, API_VERSION, RATE_LIMIT_PENALTY, AirtableError, _build_get_request, _make_error,
+    check_string, create_payload, get_rate_limiter)
+
+# Default maximum number of requests sent at the same time by a client.
+DEFAULT_MAX_CONCURRENCY = 5
+
+
+def _encode_params(params):
+    # aiohttp does not expand lists into repeated params as requests does.
+    encoded = []
+    for key, value in params.items():
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            encoded.append((key, str(item)))
+    return encoded
+
+
+class AsyncAirtable(object):
+    def __init__(
+            self, base_id, api_key, dict_class=OrderedDict,
+            max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=None, rate_limiter=None,
+            retry_policy=None):
+        """Create an asynchronous client to connect to an Airtable Base.
+
+        Args:
+            - base_id: The ID of the base, e.g. "appA0CDAE34F"
+            - api_key: The API secret key, e.g. "keyBAAE123C"
+            - dict_class: the class to use to build dictionaries for returning
+                  fields, see airtable.Airtable.
+            - max_concurrency: the maximum number of requests sent at the same
+                  time, shared by all the tables created with the table method.
+            - timeout: how many seconds to wait for the API before giving up.
+                  By default, wait forever.
+            - rate_limiter: a RateLimiter to pace the requests, or True to
+                  use the one shared by all the clients of the same base in
+                  this process (including blocking ones).
+            - retry_policy: a RetryPolicy to retry requests that failed with
+                  a transient error. By default, errors are raised at once.
+        """
+        if aiohttp is None:
+            raise ImportError('The asynchronous client requires aiohttp: pip install aiohttp')
+        self.airtable_url = API_URL % API_VERSION
+        self.base_url = posixpath.join(self.airtable_url, base_id)
+        self.headers = {'Authorization': 'Bearer %s' % api_key}
+        self._loads = functools.partial(json.loads, object_pairs_hook=dict_class)
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+        if rate_limiter is True:
+            rate_limiter = get_rate_limiter(base_id)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+
+    async def close(self):
+        """Close all the connections kept alive by this client."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *unused_exc_info):
+        await self.close()
+
+    def _get_session(self):
+        # The session must be created from within the event loop.
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self._timeout))
+        return self._session
+
+    async def _request(self, method, url, params=None, payload=None):
+        headers = self.headers
+        if method in ['POST', 'PUT', 'PATCH']:
+            headers = dict(headers, **{'Content-type': 'application/json'})
+        url = posixpath.join(self.base_url, url)
+        params = _encode_params(params or {})
+        attempt = 0
+        async with self._semaphore:
+            while True:
+                attempt += 1
+                if self.rate_limiter:
+                    await asyncio.sleep(self.rate_limiter.reserve())
+                try:
+                    async with self._get_session().request(
+                            method, url, params=params, data=payload,
+                            headers=headers) as response:
+                        status = response.status
+                        retry_after = response.headers.get('Retry-After')
+                        body = await response.text()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if not self.retry_policy or not self.retry_policy.should_retry(
+                            method, attempt):
+                        raise
+                    await asyncio.sleep(self.retry_policy.record_retry(method, url, attempt))
+                    continue
+                if status == 200:
+                    return self._loads(body)
+                if status == 429 and self.rate_limiter:
+                    self.rate_limiter.pause(RATE_LIMIT_PENALTY)
+                if not self.retry_policy or not self.retry_policy.should_retry(
+                        method, attempt, status):
+                    break
+                await asyncio.sleep(
+                    self.retry_policy.record_retry(method, url, attempt, retry_after))
+        raise _make_error(status, json.loads(body))
+
+    async def get(  # pylint: disable=invalid-name
+            self, table_name, record_id=None, limit=0, offset=None,
+            filter_by_formula=None, view=None, max_records=0, fields=None,
+            sort=None):
+        url, params = _build_get_request(
+            table_name, record_id, limit, offset, filter_by_formula, view, max_records, fields,
+            sort)
+        return await self._request('GET', url, params)
+
+    async def iterate(
+            self, table_name, batch_size=0, filter_by_formula=None,
+            view=None, max_records=0, fields=None,
+            sort=None, offset=None):
+        """Iterate over all records of a table, see airtable.Airtable.iterate."""
+        while True:
+            try:
+                response = await self.get(
+                    table_name, limit=batch_size, offset=offset, max_records=max_records,
+                    fields=fields, filter_by_formula=filter_by_formula, view=view, sort=sort)
+            except AirtableError as error:
+                error.offset = offset
+                raise
+            for record in response.pop('records'):
+                yield record
+            if 'offset' in response:
+                offset = response['offset']
+            else:
+                break
+
+    async def create(self, table_name, data):
+        assert check_string(table_name)
+        payload = create_payload(data)
+        return await self._request('POST', table_name, payload=json.dumps(payload))
+
+    async def update(self, table_name, record_id, data):
+        assert check_string(table_name) and check_string(record_id)
+        url = posixpath.join(table_name, record_id)
+        payload = create_payload(data)
+        return await self._request('PATCH', url, payload=json.dumps(payload))
+
+    async def update_all(self, table_name, record_id, data):
+        assert check_string(table_name) and check_string(record_id)
+        url = posixpath.join(table_name, record_id)
+        payload = create_payload(data)
+        return await self._request('PUT', url, payload=json.dumps(payload))
+
+    async def delete(self, table_name, record_id):
+        assert check_string(table_name) and check_string(record_id)
+        url = posixpath.join(table_name, record_id)
+        return await self._request('DELETE', url)
+
+    def table(self, table_name):
+        return AsyncTable(self, table_name)
+
+
+class AsyncTable(object):
+    def __init__(self, base_id, table_name, api_key=None, dict_class=OrderedDict):
+        """Create an asynchronous client to connect to an Airtable Table.
+
+        Args:
+            - base_id: The ID of the base, e.g. "appA0CDAE34F", or an
+                  AsyncAirtable client to share.
+            - table_name: The name or ID of the table, e.g. "tbl123adfe4"
+            - api_key: The API secret key, e.g. "keyBAAE123C"
+            - dict_class: the class to use to build dictionaries for returning
+                  fields, see airtable.Airtable.
+        """
+        self.table_name = table_name
+        if isinstance(base_id, AsyncAirtable):
+            self._client = base_id
+            return
+        self._client = AsyncAirtable(base_id, api_key, dict_class=dict_class)
+
+    async def get(  # pylint:disable=invalid-name
+            self, record_id=None, limit=0, offset=None,
+            filter_by_formula=None, view=None, max_records=0, fields=None):
+        return await self._client.get(
+            self.table_name, record_id, limit, offset, filter_by_formula, view, max_records, fields)
+
+    def iterate(
+            self, batch_size=0, filter_by_formula=None,
+            view=None, max_records=0, fields=None, offset=None):
+        return self._client.iterate(
+            self.table_name, batch_size, filter_by_formula, view, max_records, fields,
+            offset=offset)
+
+    async def create(self, data):
+        return await self._client.create(self.table_name, data)
+
+    async def update(self, record_id, data):
+        return await self._client.update(self.table_name, record_id, data)
+
+    async def update_all(self, record_id, data):
+        return await self._client.update_all(self.table_name, record_id, data)
+
+    async def delete(self, record_id):
+        return await self._client.delete(self.table_name, record_id)
@@ -0,0 +1,150 @@
+import typing
+from typing import Any, AsyncIterator, Dict, List, Literal, Mapping, Optional, Tuple, Union, overload
+
+from . import Record, RateLimiter, RetryPolicy, _DefaultRecordType, _DeletedRecord
+
+DEFAULT_MAX_CONCURRENCY: int
+
+_RecordType = typing.TypeVar('_RecordType', bound=Mapping[str, Any], covariant=True)
+_InferRecordType = typing.TypeVar('_InferRecordType', bound=Mapping[str, Any])
+_Self = typing.TypeVar('_Self')
+
+
+class AsyncTable(typing.Generic[_RecordType]):
+    @overload
+    def __init__(
+            self, base_id: str, table_name: str, api_key: str,  dict_class: type = ...) -> None:
+        ...
+
+    @overload
+    def __init__(
+            self, base_id: AsyncAirtable, table_name: str, api_key: None = ...,
+            dict_class: type = ...) -> None:
+        ...
+
+    def iterate(
+            self,
+            batch_size: int = 0,
+            filter_by_formula: Optional[str] = None,
+            view: Optional[str] = None,
+            max_records: int = 0,
+            fields: Union[List[str], Tuple[str], None] = ...,
+            offset: Optional[str] = ...) -> AsyncIterator[Record[_RecordType]]:
+        ...
+
+    @overload
+    async def get(
+            self,
+            record_id: None = None,
+            limit: int = 0,
+            offset: Optional[str] = None,
+            filter_by_formula: Optional[str] = None,
+            view: Optional[str] = None,
+            max_records: int = 0,
+            fields: Union[List[str], Tuple[str], None] = ...) -> Dict[str, List[Record[_RecordType]]]:
+        ...
+
+    @overload
+    async def get(
+            self,
+            record_id: str,
+            limit: Literal[0] = ...,
+            offset: None = None,
+            filter_by_formula: None = None,
+            view: None = None,
+            max_records: Literal[0] = 0,
+            fields: Union[List[str], Tuple[str], None] = ...) -> Record[_RecordType]:
+        ...
+
+    async def create(self, data: Mapping[str, Any]) -> Record[_RecordType]:
+        ...
+
+    async def update(self, record_id: str, data: Mapping[str, Any]) -> Record[_RecordType]:
+        ...
+
+    async def update_all(self, record_id: str, data: Mapping[str, Any]) -> Record[_RecordType]:
+        ...
+
+    async def delete(self, record_id: str) -> _DeletedRecord:
+        ...
+
+
+class AsyncAirtable(object):
+    airtable_url: str = ...
+    base_url: str = ...
+    headers: Mapping[str, str] = ...
+    rate_limiter: Optional[RateLimiter] = ...
+    retry_policy: Optional[RetryPolicy] = ...
+
+    def __init__(
+            self, base_id: str, api_key: str, dict_class: type = ...,
+            max_concurrency: int = ..., timeout: Optional[float] = ...,
+            rate_limiter: Union[RateLimiter, Literal[True], None] = ...,
+            retry_policy: Optional[RetryPolicy] = ...) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+    async def __aenter__(self: _Self) -> _Self:
+        ...
+
+    async def __aexit__(self, *unused_exc_info: Any) -> None:
+        ...
+
+    def iterate(
+            self,
+            table_name: str,
+            batch_size: int = 0,
+            filter_by_formula: Optional[str] = None,
+            view: Optional[str] = None,
+            max_records: int = 0,
+            fields: Union[List[str], Tuple[str], None] = ...,
+            sort: Optional[Mapping[str, str]] = ...,
+            offset: Optional[str] = ...) -> AsyncIterator[_DefaultRecordType]:
+        ...
+
+    @overload
+    async def get(
+            self,
+            table_name: str,
+            record_id: None = None,
+            limit: int = 0,
+            offset: Optional[str] = None,
+            filter_by_formula: Optional[str] = None,
+            view: Optional[str] = None,
+            max_records: int = 0,
+            fields: Union[List[str], Tuple[str], None] = ...,
+            sort: Optional[Mapping[str, str]] = ...) -> Dict[str, List[_DefaultRecordType]]:
+        ...
+
+    @overload
+    async def get(
+            self,
+            table_name: str,
+            record_id: str,
+            limit: Literal[0] = 0,
+            offset: None = None,
+            filter_by_formula: None = None,
+            view: None = None,
+            max_records: Literal[0] = 0,
+            fields: Union[List[str], Tuple[str], None] = ...,
+            sort: None = ...) -> _DefaultRecordType:
+        ...
+
+    async def create(self, table_name: str, data: _InferRecordType) -> Record[_InferRecordType]:
+        ...
+
+    async def update(self, table_name: str, record_id: str, data: _InferRecordType) \
+            -> Record[_InferRecordType]:
+        ...
+
+    async def update_all(self, table_name: str, record_id: str, data: _InferRecordType) \
+            -> Record[_InferRecordType]:
+        ...
+
+    async def delete(self, table_name: str, record_id: str) -> _DeletedRecord:
+        ...
+
+    def table(self, table_name: str) -> AsyncTable[_RecordType]:
+        ...
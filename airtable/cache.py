@@ -0,0 +1,148 @@
+"""Caches of API responses, to attach to an airtable.Airtable client.
+
+A cache stores JSON texts under string keys, grouped by table so that all the
+entries of a table can be dropped when it is modified. Each cache counts its
+hits, misses and evictions.
+"""
+
+import collections
+import sqlite3
+import threading
+import time
+
+
+class MemoryCache(object):
+    """An in-memory cache, dropping the least recently used entries."""
+
+    def __init__(self, max_size=1000, ttl=60., clock=time.monotonic):
+        """Create an in-memory cache.
+
+        Args:
+            - max_size: the maximum number of entries to keep.
+            - ttl: the number of seconds an entry is kept.
+            - clock: the function returning the current time in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Keys are (table name, key) tuples, values (expiration time, JSON text) tuples.
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, table_name, key):
+        """Get the value stored for a key, or None."""
+        with self._lock:
+            entry = self._entries.get((table_name, key))
+            if entry and entry[0] <= self._clock():
+                del self._entries[(table_name, key)]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((table_name, key))
+            self.hits += 1
+            return entry[1]
+
+    def set(self, table_name, key, value):
+        """Store a value for a key."""
+        with self._lock:
+            self._entries[(table_name, key)] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end((table_name, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, table_name):
+        """Drop all the entries of a table."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == table_name]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop all the entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteCache(object):
+    """A cache in a sqlite file, that can be shared by several processes."""
+
+    def __init__(self, path, max_size=10000, ttl=60., clock=time.time):
+        """Create or open a sqlite cache.
+
+        Args:
+            - path: the path of the sqlite file.
+            - max_size: the maximum number of entries to keep.
+            - ttl: the number of seconds an entry is kept.
+            - clock: the function returning the current time in seconds. As
+                  the file can be shared, it should be the same across
+                  processes.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'table_name TEXT, key TEXT, value TEXT, expires_at REAL, used_at REAL, '
+            'PRIMARY KEY (table_name, key))')
+        self._db.execute('CREATE INDEX IF NOT EXISTS cache_used_at ON cache (used_at)')
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def close(self):
+        """Close the sqlite file."""
+        self._db.close()
+
+    def get(self, table_name, key):
+        """Get the value stored for a key, or None."""
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value FROM cache WHERE table_name = ? AND key = ? AND expires_at > ?',
+                (table_name, key, now)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                'UPDATE cache SET used_at = ? WHERE table_name = ? AND key = ?',
+                (now, table_name, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, table_name, key, value):
+        """Store a value for a key."""
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)',
+                (table_name, key, value, now + self.ttl, now))
+            self._db.execute('DELETE FROM cache WHERE expires_at <= ?', (now,))
+            excess = self._db.execute('SELECT COUNT(*) FROM cache').fetchone()[0] - self.max_size
+            if excess > 0:
+                self._db.execute(
+                    'DELETE FROM cache WHERE rowid IN '
+                    '(SELECT rowid FROM cache ORDER BY used_at LIMIT ?)', (excess,))
+                self.evictions += excess
+
+    def invalidate(self, table_name):
+        """Drop all the entries of a table."""
+        with self._lock:
+            self._db.execute('DELETE FROM cache WHERE table_name = ?', (table_name,))
+
+    def clear(self):
+        """Drop all the entries."""
+        with self._lock:
+            self._db.execute('DELETE FROM cache')
@@ -0,0 +1,71 @@
+from typing import Callable, Optional, Protocol
+
+
+class _Cache(Protocol):
+    def get(self, table_name: str, key: str) -> Optional[str]:
+        ...
+
+    def set(self, table_name: str, key: str, value: str) -> None:
+        ...
+
+    def invalidate(self, table_name: str) -> None:
+        ...
+
+
+class MemoryCache(object):
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(
+            self, max_size: int = ..., ttl: float = ...,
+            clock: Callable[[], float] = ...) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def get(self, table_name: str, key: str) -> Optional[str]:
+        ...
+
+    def set(self, table_name: str, key: str, value: str) -> None:
+        ...
+
+    def invalidate(self, table_name: str) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class SqliteCache(object):
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(
+            self, path: str, max_size: int = ..., ttl: float = ...,
+            clock: Callable[[], float] = ...) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def get(self, table_name: str, key: str) -> Optional[str]:
+        ...
+
+    def set(self, table_name: str, key: str, value: str) -> None:
+        ...
+
+    def invalidate(self, table_name: str) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
@@ -0,0 +1,214 @@
+"""Write records to files while iterating over them, with a bounded memory.
+
+Supported formats are JSON Lines, CSV and, when pyarrow is installed, Parquet
+and Arrow. The columns of CSV, Parquet and Arrow files are "id",
+"createdTime" and then the fields, either given or inferred from the first
+records: a field that only shows up later is an error, as it cannot be added
+to the columns already written.
+"""
+
+import csv
+import json
+import os
+import warnings
+
+# Default number of records buffered before writing them.
+DEFAULT_FLUSH_EVERY = 1000
+
+FORMATS = ('jsonl', 'csv', 'parquet', 'arrow')
+_EXTENSIONS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv', '.parquet': 'parquet',
+               '.arrow': 'arrow', '.feather': 'arrow'}
+
+
+def _guess_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(
+            'Cannot guess the format of "%s", use one of %r.' % (path, FORMATS))
+    return _EXTENSIONS[extension]
+
+
+def _dump(value):
+    # Lists and dicts, e.g. attachments or linked records, are kept as JSON.
+    return json.dumps(value) if isinstance(value, (list, dict)) else value
+
+
+class _Columns(object):
+    """The columns of a tabular file, and how to turn records into rows."""
+
+    def __init__(self, fields, records):
+        is_inferred = fields is None
+        if is_inferred:
+            fields = []
+            for record in records:
+                for field in record.get('fields', {}):
+                    if field not in fields:
+                        fields.append(field)
+        self.fields = list(fields)
+        self.names = ['id', 'createdTime'] + self.fields
+        self._known = set(self.fields)
+        self._is_inferred = is_inferred
+
+    def to_row(self, record):
+        fields = record.get('fields', {})
+        if self._is_inferred:
+            for field in fields:
+                if field not in self._known:
+                    raise ValueError(
+                        'Field "%s" was not in the first records, give the fields to export.'
+                        % field)
+        return [record.get('id'), record.get('createdTime')] + [
+            _dump(fields.get(field)) for field in self.fields]
+
+
+class _JsonLinesWriter(object):
+
+    def __init__(self, path, unused_fields):
+        self._file = open(path, 'w')
+
+    def write(self, records):
+        for record in records:
+            self._file.write(json.dumps(dict(record, fields=dict(record.get('fields', {})))))
+            self._file.write('\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _CsvWriter(object):
+
+    def __init__(self, path, fields):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._fields = fields
+        self._columns = None
+
+    def write(self, records):
+        if self._columns is None:
+            self._columns = _Columns(self._fields, records)
+            self._writer.writerow(self._columns.names)
+        self._writer.writerows(self._columns.to_row(record) for record in records)
+        self._file.flush()
+
+    def close(self):
+        if self._columns is None:
+            self.write([])
+        self._file.close()
+
+
+def _import_pyarrow(file_format):
+    # Only imported when needed, as it is a large optional dependency.
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.ipc  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        raise ImportError(
+            'Exporting to %s requires pyarrow: pip install pyarrow' % file_format) from None
+    return pyarrow
+
+
+def _arrow_type(pyarrow, values):
+    types = {type(value) for value in values if value is not None}
+    if types == {bool}:
+        return pyarrow.bool_()
+    # The API does not tell integers from other numbers, so they are all floats.
+    if types and types <= {int, float}:
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+def _arrow_value(pyarrow, value, arrow_type):
+    if value is None:
+        return None
+    if arrow_type == pyarrow.string():
+        return value if isinstance(value, str) else json.dumps(value)
+    is_bool = isinstance(value, bool)
+    if arrow_type == pyarrow.bool_() and is_bool or \
+            arrow_type == pyarrow.float64() and isinstance(value, (int, float)) and not is_bool:
+        return value
+    warnings.warn('Value %r does not match the column type %s, it is not exported.' % (
+        value, arrow_type))
+    return None
+
+
+class _ArrowWriter(object):
+
+    def __init__(self, path, fields, file_format):
+        self._pyarrow = _import_pyarrow(file_format)
+        self._path = path
+        self._fields = fields
+        self._format = file_format
+        self._columns = None
+        self._schema = None
+        self._writer = None
+
+    def write(self, records):
+        if self._columns is None:
+            self._columns = _Columns(self._fields, records)
+        rows = [self._columns.to_row(record) for record in records]
+        pyarrow = self._pyarrow
+        if self._schema is None:
+            # The types of the columns are inferred from the first batch.
+            self._schema = pyarrow.schema([
+                (name, _arrow_type(pyarrow, [row[index] for row in rows]))
+                for index, name in enumerate(self._columns.names)])
+            if self._format == 'parquet':
+                self._writer = pyarrow.parquet.ParquetWriter(self._path, self._schema)
+            else:
+                self._writer = pyarrow.ipc.new_file(self._path, self._schema)
+        arrays = [
+            pyarrow.array(
+                [_arrow_value(pyarrow, row[index], column.type) for row in rows], column.type)
+            for index, column in enumerate(self._schema)]
+        self._writer.write_batch(pyarrow.record_batch(arrays, schema=self._schema))
+
+    def close(self):
+        if self._writer is None:
+            self.write([])
+        self._writer.close()
+
+
+def _open_writer(path, file_format, fields):
+    if file_format == 'jsonl':
+        return _JsonLinesWriter(path, fields)
+    if file_format == 'csv':
+        return _CsvWriter(path, fields)
+    if file_format in ('parquet', 'arrow'):
+        return _ArrowWriter(path, fields, file_format)
+    raise ValueError('Unknown format "%s", use one of %r.' % (file_format, FORMATS))
+
+
+def export_records(
+        records, path, file_format=None, fields=None, flush_every=DEFAULT_FLUSH_EVERY):
+    """Write records to a file, a batch at a time.
+
+    Args:
+        - records: an iterable of records, e.g. from Table.iterate.
+        - path: the path of the file to write.
+        - file_format: one of FORMATS, by default guessed from the extension
+              of the path.
+        - fields: the fields to write as columns. By default, the fields of
+              the first batch of records are used, and a ValueError is raised
+              if other fields show up later.
+        - flush_every: the number of records buffered before writing them.
+    Returns:
+        The number of records written.
+    """
+    writer = _open_writer(path, file_format or _guess_format(path), fields)
+    count = 0
+    batch = []
+    try:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= flush_every:
+                writer.write(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write(batch)
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
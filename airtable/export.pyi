@@ -0,0 +1,10 @@
+from typing import Any, Iterable, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_FLUSH_EVERY: int
+FORMATS: Tuple[str, ...]
+
+
+def export_records(
+        records: Iterable[Mapping[str, Any]], path: str, file_format: Optional[str] = ...,
+        fields: Optional[Sequence[str]] = ..., flush_every: int = ...) -> int:
+    ...
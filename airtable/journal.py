@@ -0,0 +1,85 @@
+"""A journal of the batches of a bulk import, to resume it after a crash.
+
+The journal is a sqlite file recording each batch before it is sent, and the
+IDs of the created records once the API confirmed them. See
+Airtable.bulk_import.
+"""
+
+import sqlite3
+import threading
+
+
+class ImportJournal(object):
+    """The rows of a bulk import that were sent, and the records created for them.
+
+    Rows are identified by keys: strings that must be the same for a row
+    when the import is run again.
+    """
+
+    def __init__(self, path):
+        """Create or open a journal.
+
+        Args:
+            - path: the path of the sqlite file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS batches '
+            '(id INTEGER PRIMARY KEY AUTOINCREMENT, confirmed INTEGER DEFAULT 0)')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS rows (key TEXT PRIMARY KEY, batch INTEGER, record_id TEXT)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS rows_batch ON rows (batch)')
+
+    def close(self):
+        """Close the sqlite file."""
+        self._db.close()
+
+    def record_ids(self):
+        """The IDs of the records created so far, keyed by row key."""
+        with self._lock:
+            return dict(self._db.execute(
+                'SELECT key, record_id FROM rows WHERE record_id IS NOT NULL'))
+
+    def confirmed_keys(self):
+        """The keys of the rows whose records were created."""
+        with self._lock:
+            return {row[0] for row in self._db.execute(
+                'SELECT key FROM rows WHERE record_id IS NOT NULL')}
+
+    def pending_batches(self):
+        """The batches sent but not confirmed, as (batch ID, keys) pairs."""
+        with self._lock:
+            batch_ids = [row[0] for row in self._db.execute(
+                'SELECT id FROM batches WHERE confirmed = 0 ORDER BY id')]
+            return [
+                (batch_id, [row[0] for row in self._db.execute(
+                    'SELECT key FROM rows WHERE batch = ? ORDER BY rowid', (batch_id,))])
+                for batch_id in batch_ids]
+
+    def submit(self, keys):
+        """Record that a batch of rows is about to be sent, returning its ID."""
+        with self._lock, self._db:
+            batch_id = self._db.execute('INSERT INTO batches (confirmed) VALUES (0)').lastrowid
+            self._db.executemany(
+                'INSERT OR REPLACE INTO rows VALUES (?, ?, NULL)',
+                [(key, batch_id) for key in keys])
+        return batch_id
+
+    def confirm(self, batch_id, record_ids):
+        """Record the records created for a batch.
+
+        Args:
+            - batch_id: the ID returned by submit.
+            - record_ids: the IDs of the created records, keyed by row key.
+                  Rows of the batch that are not in it are considered as not
+                  created, and will be sent again.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                'UPDATE rows SET record_id = ? WHERE key = ? AND batch = ?',
+                [(record_id, key, batch_id) for key, record_id in record_ids.items()])
+            self._db.execute(
+                'DELETE FROM rows WHERE batch = ? AND record_id IS NULL', (batch_id,))
+            self._db.execute('UPDATE batches SET confirmed = 1 WHERE id = ?', (batch_id,))
@@ -0,0 +1,26 @@
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+
+class ImportJournal(object):
+    path: str
+
+    def __init__(self, path: str) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def record_ids(self) -> Dict[str, str]:
+        ...
+
+    def confirmed_keys(self) -> Set[str]:
+        ...
+
+    def pending_batches(self) -> List[Tuple[int, List[str]]]:
+        ...
+
+    def submit(self, keys: Iterable[str]) -> int:
+        ...
+
+    def confirm(self, batch_id: int, record_ids: Mapping[str, str]) -> None:
+        ...
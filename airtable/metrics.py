@@ -0,0 +1,144 @@
+"""Observers of the requests of an airtable.Airtable client.
+
+    collector = MetricsCollector()
+    at = airtable.Airtable('BASE_ID', 'ACCESS_TOKEN', observers=[collector])
+    ...
+    collector.log()
+"""
+
+import bisect
+import logging
+import threading
+
+# Upper bounds, in seconds, of the buckets of latency histograms.
+DEFAULT_BUCKETS = (.025, .05, .1, .25, .5, 1., 2.5, 5., 10.)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Metrics(object):
+
+    def __init__(self, buckets):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total_latency = 0.
+        self.max_latency = 0.
+        # The last bucket counts the requests slower than all the bounds.
+        self.histogram = [0] * (len(buckets) + 1)
+
+    def as_dict(self, buckets):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'mean_latency': self.total_latency / self.count if self.count else 0.,
+            'max_latency': self.max_latency,
+            'histogram': dict(zip(buckets + (float('inf'),), self.histogram)),
+        }
+
+
+class MetricsCollector(object):
+    """Collect the metrics of requests per table and operation, in memory.
+
+    The operations are "get" (a single record), "list" (a page of records),
+    "create", "update", "replace", "delete" and "schema" (a request to the
+    metadata API, whose table name is None).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Create an empty collector.
+
+        Args:
+            - buckets: the upper bounds, in seconds, of the buckets of the
+                  latency histograms.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def before_request(self, event):
+        """Nothing is collected before the requests."""
+
+    def after_request(self, event):
+        """Add a request to the metrics of its table and operation."""
+        with self._lock:
+            key = (event.table_name, event.operation)
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = _Metrics(self.buckets)
+            metrics.count += 1
+            if event.error is not None:
+                metrics.errors += 1
+            metrics.retries += event.retries
+            metrics.bytes_sent += event.bytes_sent
+            metrics.bytes_received += event.bytes_received
+            metrics.total_latency += event.latency
+            metrics.max_latency = max(metrics.max_latency, event.latency)
+            metrics.histogram[bisect.bisect_left(self.buckets, event.latency)] += 1
+
+    def snapshot(self):
+        """The metrics collected so far.
+
+        Returns:
+            A dict keyed by (table name, operation) tuples, with the count,
+            errors, retries, bytes_sent, bytes_received, mean_latency,
+            max_latency and histogram (the number of requests per bucket
+            upper bound) of the requests.
+        """
+        with self._lock:
+            return {
+                key: metrics.as_dict(self.buckets) for key, metrics in self._metrics.items()}
+
+    def reset(self):
+        """Drop the metrics collected so far."""
+        with self._lock:
+            self._metrics.clear()
+
+    def log(self, logger=None, level=logging.INFO):
+        """Log a line with the metrics of each table and operation, slowest first."""
+        metrics = self.snapshot()
+        for (table_name, operation), values in sorted(
+                metrics.items(), key=lambda item: -item[1]['mean_latency']):
+            (logger or _LOGGER).log(
+                level, '%s %s: %d requests, %d errors, %d retries, '
+                'mean %.3fs, max %.3fs, %d bytes sent, %d bytes received',
+                table_name, operation, values['count'], values['errors'], values['retries'],
+                values['mean_latency'], values['max_latency'], values['bytes_sent'],
+                values['bytes_received'])
+
+
+class OpenTelemetryObserver(object):
+    """Record the requests with OpenTelemetry instruments.
+
+    It only needs a Meter, e.g. opentelemetry.metrics.get_meter('airtable'),
+    and records the latency, the request and response sizes, with the table,
+    the operation and the status code as attributes.
+    """
+
+    def __init__(self, meter):
+        self._latency = meter.create_histogram(
+            'airtable.request.duration', unit='s', description='Latency of Airtable requests')
+        self._sent = meter.create_counter(
+            'airtable.request.size', unit='By', description='Bytes sent to Airtable')
+        self._received = meter.create_counter(
+            'airtable.response.size', unit='By', description='Bytes received from Airtable')
+
+    def before_request(self, event):
+        """Nothing is recorded before the requests."""
+
+    def after_request(self, event):
+        """Record a request."""
+        attributes = {
+            'airtable.operation': event.operation,
+            'http.status_code': event.status_code or 0,
+        }
+        if event.table_name is not None:
+            attributes['airtable.table'] = event.table_name
+        self._latency.record(event.latency, attributes)
+        self._sent.add(event.bytes_sent, attributes)
+        self._received.add(event.bytes_received, attributes)
@@ -0,0 +1,40 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import logging
+
+from . import RequestEvent
+
+DEFAULT_BUCKETS: Tuple[float, ...]
+
+
+class MetricsCollector(object):
+    buckets: Tuple[float, ...]
+
+    def __init__(self, buckets: Iterable[float] = ...) -> None:
+        ...
+
+    def before_request(self, event: RequestEvent) -> None:
+        ...
+
+    def after_request(self, event: RequestEvent) -> None:
+        ...
+
+    def snapshot(self) -> Dict[Tuple[Optional[str], str], Dict[str, Any]]:
+        ...
+
+    def reset(self) -> None:
+        ...
+
+    def log(self, logger: Optional[logging.Logger] = ..., level: int = ...) -> None:
+        ...
+
+
+class OpenTelemetryObserver(object):
+    def __init__(self, meter: Any) -> None:
+        ...
+
+    def before_request(self, event: RequestEvent) -> None:
+        ...
+
+    def after_request(self, event: RequestEvent) -> None:
+        ...
@@ -0,0 +1,302 @@
+"""A local copy of a table, to look records up by field value without requests.
+
+    mirror = TableMirror(at.table('People'), index_fields=['Email'])
+    mirror.load()
+    person = mirror.find_one('Email', 'jane@example.com')
+"""
+
+import collections
+import datetime
+import itertools
+import json
+import sqlite3
+import threading
+
+from . import sync as _sync
+
+# Number of records stored at once while loading a table.
+_PUT_BATCH_SIZE = 1000
+
+
+def _index_key(value):
+    # Field values can be lists or dicts, which are not hashable.
+    return json.dumps(value, sort_keys=True)
+
+
+def _dump_record(record):
+    # Records are either dicts or, on clients with compact records, mappings.
+    return json.dumps(dict(record, fields=dict(record.get('fields', {}))))
+
+
+class _MemoryStore(object):
+
+    def __init__(self, index_fields):
+        self._records = {}
+        self._indexes = {field: collections.defaultdict(set) for field in index_fields}
+
+    def __len__(self):
+        return len(self._records)
+
+    def ids(self):
+        return list(self._records)
+
+    def get(self, record_id):
+        return self._records.get(record_id)
+
+    def put(self, record):
+        self.remove(record['id'])
+        self._records[record['id']] = record
+        for field, index in self._indexes.items():
+            if field in record.get('fields', {}):
+                index[_index_key(record['fields'][field])].add(record['id'])
+
+    def put_many(self, records):
+        for record in records:
+            self.put(record)
+
+    def remove(self, record_id):
+        record = self._records.pop(record_id, None)
+        if record is None:
+            return
+        for field, index in self._indexes.items():
+            if field in record.get('fields', {}):
+                key = _index_key(record['fields'][field])
+                index[key].discard(record_id)
+                if not index[key]:
+                    del index[key]
+
+    def find_ids(self, field, value):
+        return sorted(self._indexes[field].get(_index_key(value), ()))
+
+    def clear(self):
+        self._records.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+
+class _SqliteStore(object):
+
+    def __init__(self, path, index_fields, dict_class):
+        self._index_fields = set(index_fields)
+        self._dict_class = dict_class
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS records (id TEXT PRIMARY KEY, record TEXT)')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS field_index (field TEXT, value TEXT, id TEXT)')
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS field_index_value ON field_index (field, value)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS field_index_id ON field_index (id)')
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def ids(self):
+        with self._lock:
+            return [row[0] for row in self._db.execute('SELECT id FROM records')]
+
+    def get(self, record_id):
+        with self._lock:
+            row = self._db.execute(
+                'SELECT record FROM records WHERE id = ?', (record_id,)).fetchone()
+        return json.loads(row[0], object_pairs_hook=self._dict_class) if row else None
+
+    def put(self, record):
+        self.put_many([record])
+
+    def put_many(self, records):
+        """Store records in a single transaction."""
+        with self._lock, self._db:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO records VALUES (?, ?)',
+                [(record['id'], _dump_record(record)) for record in records])
+            self._db.executemany(
+                'DELETE FROM field_index WHERE id = ?', [(record['id'],) for record in records])
+            self._db.executemany('INSERT INTO field_index VALUES (?, ?, ?)', [
+                (field, _index_key(value), record['id'])
+                for record in records
+                for field, value in record.get('fields', {}).items()
+                if field in self._index_fields])
+
+    def remove(self, record_id):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM records WHERE id = ?', (record_id,))
+            self._db.execute('DELETE FROM field_index WHERE id = ?', (record_id,))
+
+    def find_ids(self, field, value):
+        with self._lock:
+            return [row[0] for row in self._db.execute(
+                'SELECT id FROM field_index WHERE field = ? AND value = ? ORDER BY id',
+                (field, _index_key(value)))]
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM records')
+            self._db.execute('DELETE FROM field_index')
+
+    def close(self):
+        self._db.close()
+
+
+class TableMirror(object):
+    """A local copy of the records of a table, indexed by some of their fields.
+
+    Writes made through the mirror are sent to the API and applied to the
+    local copy so that it stays consistent. Records are kept as returned by
+    the API: the schema of a typed table is not applied to them, and indexed
+    fields are looked up by their JSON values.
+    """
+
+    def __init__(self, table, index_fields=(), path=None, modified_field=None, **kwargs):
+        """Create a mirror of a table, empty until it is loaded.
+
+        Args:
+            - table: the airtable.Table to mirror.
+            - index_fields: the names of the fields to look records up by.
+            - path: the path of a sqlite file to keep the records in, by
+                  default they are kept in memory.
+            - modified_field: the name of a "last modified time" field, to
+                  refresh only the records changed since the previous load.
+            Other keyword arguments are passed to the table's iterate method,
+            e.g. to mirror only a view.
+        """
+        self.table = table
+        self.index_fields = tuple(index_fields)
+        self.modified_field = modified_field
+        self._iterate_kwargs = kwargs
+        if path:
+            dict_class = table._client._dict_class  # pylint: disable=protected-access
+            self._store = _SqliteStore(path, self.index_fields, dict_class)
+        else:
+            self._store = _MemoryStore(self.index_fields)
+        self._loaded = False
+        self._since = None
+        self._seen = {}
+
+    def __len__(self):
+        return len(self._store)
+
+    def __contains__(self, record_id):
+        return self._store.get(record_id) is not None
+
+    def __getitem__(self, record_id):
+        record = self._store.get(record_id)
+        if record is None:
+            raise KeyError(record_id)
+        return record
+
+    def __iter__(self):
+        for record_id in self._store.ids():
+            record = self._store.get(record_id)
+            if record is not None:
+                yield record
+
+    def get(self, record_id, default=None):  # pylint: disable=invalid-name
+        """Get a record by its ID."""
+        record = self._store.get(record_id)
+        return default if record is None else record
+
+    def find(self, field, value):
+        """Get all the records having a given value in an indexed field."""
+        if field not in self.index_fields:
+            raise KeyError('Field %r is not indexed, use one of %r' % (field, self.index_fields))
+        return [self._store.get(record_id) for record_id in self._store.find_ids(field, value)]
+
+    def find_one(self, field, value):
+        """Get a record having a given value in an indexed field, or None."""
+        records = self.find(field, value)
+        return records[0] if records else None
+
+    def load(self):
+        """Load all the records of the table, replacing the local copy."""
+        self._store.clear()
+        self._since = None
+        self._seen = {}
+        self._load_changes()
+        self._loaded = True
+
+    def refresh(self):
+        """Update the local copy with the changes made in the table.
+
+        Without a modified field, or if the mirror was never loaded, the
+        whole table is loaded again. Otherwise only the records modified
+        since the previous refresh are fetched, which does not find the
+        records deleted by other clients: call load from time to time to
+        drop them.
+        """
+        if not self.modified_field or not self._loaded:
+            self.load()
+            return
+        self._load_changes()
+
+    def _put_all(self, records):
+        records = iter(records)
+        while True:
+            batch = list(itertools.islice(records, _PUT_BATCH_SIZE))
+            if not batch:
+                return
+            self._store.put_many(batch)
+
+    def _load_changes(self):
+        # Records are read from the client, as returned by the API even if the
+        # table has a schema, so that they can be stored as JSON.
+        client = self.table._client  # pylint: disable=protected-access
+        if not self.modified_field:
+            self._put_all(client.iterate(self.table.table_name, **self._iterate_kwargs))
+            return
+        self._put_all(client.iterate_changes(
+            self.table.table_name, self._since, self.modified_field, seen=self._seen,
+            **self._iterate_kwargs))
+        modified_times = {
+            record_id: _sync.parse_time(modified)
+            for record_id, modified in self._seen.items() if modified}
+        if not modified_times:
+            return
+        latest = max(modified_times.values())
+        self._since = _sync.format_time(latest)
+        # Only the records in the overlap window can be fetched again.
+        window_start = latest - datetime.timedelta(seconds=_sync.DEFAULT_OVERLAP)
+        self._seen = {
+            record_id: self._seen[record_id]
+            for record_id, modified in modified_times.items() if modified > window_start}
+
+    def apply(self, record):
+        """Store a record returned by the API in the local copy."""
+        self._store.put(record)
+        if self.modified_field:
+            self._seen[record['id']] = \
+                record.get('fields', {}).get(self.modified_field) or record.get('createdTime')
+
+    def remove(self, record_id):
+        """Remove a record from the local copy."""
+        self._store.remove(record_id)
+
+    def create(self, data):
+        """Create a record in the table and in the local copy."""
+        record = self.table.create(data)
+        self.apply(record)
+        return record
+
+    def update(self, record_id, data):
+        """Update some fields of a record in the table and in the local copy."""
+        record = self.table.update(record_id, data)
+        self.apply(record)
+        return record
+
+    def update_all(self, record_id, data):
+        """Replace all fields of a record in the table and in the local copy."""
+        record = self.table.update_all(record_id, data)
+        self.apply(record)
+        return record
+
+    def delete(self, record_id):
+        """Delete a record from the table and from the local copy."""
+        deleted = self.table.delete(record_id)
+        self.remove(record_id)
+        return deleted
+
+    def close(self):
+        """Close the sqlite file, if any."""
+        if isinstance(self._store, _SqliteStore):
+            self._store.close()
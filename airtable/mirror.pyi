@@ -0,0 +1,68 @@
+from typing import Any, Generic, Iterable, Iterator, List, Mapping, Optional, TypeVar, Union
+
+from . import Record, Table, _DeletedRecord
+
+_RecordType = TypeVar('_RecordType', bound=Mapping[str, Any])
+_Default = TypeVar('_Default')
+
+
+class TableMirror(Generic[_RecordType]):
+    table: Table[_RecordType]
+    index_fields: tuple[str, ...]
+    modified_field: Optional[str]
+
+    def __init__(
+            self, table: Table[_RecordType], index_fields: Iterable[str] = ...,
+            path: Optional[str] = ..., modified_field: Optional[str] = ...,
+            **kwargs: Any) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def __contains__(self, record_id: str) -> bool:
+        ...
+
+    def __getitem__(self, record_id: str) -> Record[_RecordType]:
+        ...
+
+    def __iter__(self) -> Iterator[Record[_RecordType]]:
+        ...
+
+    def get(
+            self, record_id: str,
+            default: _Default = ...) -> Union[Record[_RecordType], _Default]:
+        ...
+
+    def find(self, field: str, value: Any) -> List[Record[_RecordType]]:
+        ...
+
+    def find_one(self, field: str, value: Any) -> Optional[Record[_RecordType]]:
+        ...
+
+    def load(self) -> None:
+        ...
+
+    def refresh(self) -> None:
+        ...
+
+    def apply(self, record: Record[_RecordType]) -> None:
+        ...
+
+    def remove(self, record_id: str) -> None:
+        ...
+
+    def create(self, data: Mapping[str, Any]) -> Record[_RecordType]:
+        ...
+
+    def update(self, record_id: str, data: Mapping[str, Any]) -> Record[_RecordType]:
+        ...
+
+    def update_all(self, record_id: str, data: Mapping[str, Any]) -> Record[_RecordType]:
+        ...
+
+    def delete(self, record_id: str) -> _DeletedRecord:
+        ...
+
+    def close(self) -> None:
+        ...
@@ -0,0 +1,182 @@
+"""A pool of clients for many bases, sharing threads between them fairly.
+
+    with AirtablePool('ACCESS_TOKEN', max_workers=8) as pool:
+        for base_id in base_ids:
+            pool.submit(base_id, sync_base)
+        for record in pool.iterate(base_id, 'People'):
+            ...
+"""
+
+import collections
+import concurrent.futures
+import itertools
+import threading
+
+from . import Airtable, MAX_RECORDS_PER_REQUEST, _chunks
+
+# Default number of operations run at the same time for each base.
+DEFAULT_PER_BASE_CONCURRENCY = 2
+
+
+class AirtablePool(object):
+    """Clients for many bases, running operations on a shared thread pool.
+
+    Each base has its own client, so its own connection pool, and by default
+    the rate limiter shared by all the clients of the base in the process.
+    Operations are queued per base and started in turns, one base after the
+    other, so that a base with many operations does not starve the others.
+    """
+
+    def __init__(
+            self, api_key, max_workers=8, per_base_concurrency=DEFAULT_PER_BASE_CONCURRENCY,
+            **kwargs):
+        """Create an empty pool.
+
+        Args:
+            - api_key: the API key or access token used for all the bases.
+            - max_workers: the number of operations run at the same time in
+                  total.
+            - per_base_concurrency: the maximum number of operations run at
+                  the same time for a base.
+            Other keyword arguments are passed to the Airtable clients, by
+            default with rate_limiter=True.
+        """
+        self.max_workers = max_workers
+        self.per_base_concurrency = per_base_concurrency
+        self._api_key = api_key
+        self._client_kwargs = dict({'rate_limiter': True}, **kwargs)
+        self._clients = {}
+        self._lock = threading.Lock()
+        # Queued operations per base, the next base to run is the first one.
+        self._queues = collections.OrderedDict()
+        self._running = collections.Counter()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix='airtable-pool')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *unused_exc_info):
+        self.close()
+
+    def close(self):
+        """Wait for the queued operations, then close all the clients."""
+        while True:
+            with self._lock:
+                futures = [item[0] for queue in self._queues.values() for item in queue]
+            if not futures:
+                break
+            concurrent.futures.wait(futures)
+        self._executor.shutdown()
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+    def client(self, base_id):
+        """The client of a base, created on first use."""
+        with self._lock:
+            client = self._clients.get(base_id)
+            if client is None:
+                client = self._clients[base_id] = Airtable(
+                    base_id, self._api_key, **self._client_kwargs)
+            return client
+
+    def submit(self, base_id, func, *args, **kwargs):
+        """Queue an operation on a base.
+
+        Args:
+            base_id: the ID of the base.
+            func: the operation, called with the client of the base and the
+                other arguments.
+        Returns:
+            A concurrent.futures.Future of the result of the operation.
+        """
+        client = self.client(base_id)
+        future = concurrent.futures.Future()
+        with self._lock:
+            self._queues.setdefault(base_id, collections.deque()).append(
+                (future, client, func, args, kwargs))
+        self._dispatch()
+        return future
+
+    def _dispatch(self):
+        with self._lock:
+            while sum(self._running.values()) < self.max_workers:
+                base_id = next((
+                    base_id for base_id, queue in self._queues.items()
+                    if queue and self._running[base_id] < self.per_base_concurrency), None)
+                if base_id is None:
+                    return
+                item = self._queues[base_id].popleft()
+                # The base goes at the end of the line.
+                self._queues.move_to_end(base_id)
+                if not self._queues[base_id]:
+                    del self._queues[base_id]
+                self._running[base_id] += 1
+                self._executor.submit(self._run, base_id, *item)
+
+    def _run(self, base_id, future, client, func, args, kwargs):
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(client, *args, **kwargs))
+                except BaseException as error:  # pylint: disable=broad-except
+                    future.set_exception(error)
+        finally:
+            with self._lock:
+                self._running[base_id] -= 1
+            self._dispatch()
+
+    def get(self, base_id, table_name, *args, **kwargs):
+        """Queue a get on a table of a base, see Airtable.get."""
+        return self.submit(base_id, lambda client: client.get(table_name, *args, **kwargs))
+
+    def iterate(self, base_id, table_name, offset=None, **kwargs):
+        """Iterate over the records of a table, queuing a get for each page.
+
+        Args:
+            base_id: the ID of the base.
+            table_name: the name of the table.
+            offset: the offset from which to resume a previous iteration.
+            Other keyword arguments are passed to Airtable.get, e.g. view.
+        Yields:
+            The records of the table.
+        """
+        while True:
+            page = self.get(base_id, table_name, offset=offset, **kwargs).result()
+            for record in page['records']:
+                yield record
+            offset = page.get('offset')
+            if not offset:
+                return
+
+    def create_many(self, base_id, table_name, data):
+        """Create many records, queuing a request per batch.
+
+        The input is read lazily: at most per_base_concurrency * 2 batches
+        are queued or running at a time, the next ones are queued as the
+        first ones finish. If the iteration stops, e.g. on an error, the
+        batches that did not start are cancelled.
+
+        Yields:
+            The created records, in the same order as the input.
+        """
+        chunks = _chunks(data, MAX_RECORDS_PER_REQUEST)
+        window = self.per_base_concurrency * 2
+        futures = collections.deque()
+        records = []
+        try:
+            while True:
+                # Queue the next batches before yielding the records of the last one.
+                for chunk in itertools.islice(chunks, window - len(futures)):
+                    futures.append(self.submit(base_id, lambda client, chunk: list(
+                        client.create_many(table_name, chunk)), chunk))
+                for record in records:
+                    yield record
+                if not futures:
+                    return
+                records = futures.popleft().result()
+        finally:
+            for future in futures:
+                future.cancel()
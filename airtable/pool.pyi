@@ -0,0 +1,50 @@
+import concurrent.futures
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, TypeVar
+
+from . import Airtable
+
+DEFAULT_PER_BASE_CONCURRENCY: int
+
+_T = TypeVar('_T')
+
+
+class AirtablePool(object):
+    max_workers: int
+    per_base_concurrency: int
+
+    def __init__(
+            self, api_key: str, max_workers: int = ..., per_base_concurrency: int = ...,
+            **kwargs: Any) -> None:
+        ...
+
+    def __enter__(self) -> 'AirtablePool':
+        ...
+
+    def __exit__(self, *unused_exc_info: Any) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def client(self, base_id: str) -> Airtable:
+        ...
+
+    def submit(
+            self, base_id: str, func: Callable[..., _T], *args: Any,
+            **kwargs: Any) -> concurrent.futures.Future[_T]:
+        ...
+
+    def get(
+            self, base_id: str, table_name: str, *args: Any,
+            **kwargs: Any) -> concurrent.futures.Future[Any]:
+        ...
+
+    def iterate(
+            self, base_id: str, table_name: str, offset: Optional[str] = ...,
+            **kwargs: Any) -> Iterator[Mapping[str, Any]]:
+        ...
+
+    def create_many(
+            self, base_id: str, table_name: str,
+            data: Iterable[Mapping[str, Any]]) -> Iterator[Mapping[str, Any]]:
+        ...
@@ -0,0 +1,184 @@
+"""Typed decoding of the fields of records, according to a schema.
+
+A schema maps field names to Airtable field types (e.g. "dateTime", "number",
+"multipleAttachments") or to functions converting a value. It is compiled
+once in a converter, that turns records into records whose fields are only
+decoded when they are read:
+
+    converter = compile_schema({'Due': 'date', 'Price': 'currency'})
+    record = converter(raw_record)
+    record['fields']['Due']  # A datetime.date.
+"""
+
+import collections
+import collections.abc
+import datetime
+import decimal
+import functools
+
+from . import sync as _sync
+
+_ATTACHMENT_KEYS = ('id', 'url', 'filename', 'size', 'type', 'width', 'height', 'thumbnails')
+
+# A file attached to a record.
+Attachment = collections.namedtuple('Attachment', _ATTACHMENT_KEYS)
+Attachment.__new__.__defaults__ = (None,) * len(_ATTACHMENT_KEYS)
+
+
+def _to_decimal(value):
+    # Numbers are decoded as floats, their shortest repr is the one sent by the API.
+    return decimal.Decimal(repr(value)) if isinstance(value, float) else decimal.Decimal(value)
+
+
+def _to_date(value):
+    return datetime.date.fromisoformat(value)
+
+
+def _to_attachments(value):
+    return [
+        Attachment(**{key: attachment.get(key) for key in _ATTACHMENT_KEYS})
+        for attachment in value]
+
+
+# Converters of the values of each field type, other types are kept as is.
+CONVERTERS = {
+    'autoNumber': int,
+    'count': int,
+    'createdTime': _sync.parse_time,
+    'currency': _to_decimal,
+    'date': _to_date,
+    'dateTime': _sync.parse_time,
+    'lastModifiedTime': _sync.parse_time,
+    'multipleAttachments': _to_attachments,
+    'number': _to_decimal,
+    'percent': _to_decimal,
+}
+
+
+class ListOf(object):
+    """The type of a field whose values are lists, e.g. a lookup field."""
+
+    def __init__(self, item_type):
+        self.item_type = item_type
+
+    def __eq__(self, other):
+        return isinstance(other, ListOf) and other.item_type == self.item_type
+
+    def __hash__(self):
+        return hash((ListOf, self.item_type))
+
+    def __repr__(self):
+        return 'ListOf(%r)' % (self.item_type,)
+
+
+def _converter(field_type):
+    if isinstance(field_type, ListOf):
+        convert_item = _converter(field_type.item_type)
+        if not convert_item:
+            return None
+        return lambda values: [convert_item(value) for value in values]
+    if callable(field_type):
+        return field_type
+    convert = CONVERTERS.get(field_type)
+    if not convert:
+        return None
+    return functools.partial(_convert_value, convert)
+
+
+def _convert_value(convert, value):
+    # Formulas and rollups return objects instead of values on errors, e.g.
+    # {"error": "#ERROR!"} or {"specialValue": "NaN"}: they are kept as is.
+    if isinstance(value, dict):
+        return value
+    return convert(value)
+
+
+def from_metadata(fields):
+    """Build a schema from the fields of a table in the metadata API.
+
+    Args:
+        - fields: the "fields" list of a table, as returned by
+              GET /v0/meta/bases/{baseId}/tables.
+    Returns:
+        A dict with the type of each field, the type of its result for
+        formulas, rollups and lookups.
+    """
+    schema = {}
+    for field in fields:
+        field_type = field.get('type')
+        result_type = ((field.get('options') or {}).get('result') or {}).get('type')
+        if field_type in ('formula', 'rollup') and result_type:
+            field_type = result_type
+        elif field_type == 'multipleLookupValues' and result_type:
+            field_type = ListOf(result_type)
+        schema[field['name']] = field_type
+    return schema
+
+
+class TypedFields(collections.abc.Mapping):
+    """The fields of a record, converted when they are first read."""
+
+    __slots__ = ('_raw', '_converters', '_decoded')
+
+    def __init__(self, raw, converters):
+        self._raw = raw
+        self._converters = converters
+        self._decoded = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+        value = self._raw[key]
+        convert = self._converters.get(key)
+        if convert:
+            value = convert(value)
+        self._decoded[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __repr__(self):
+        return 'TypedFields(%r)' % dict(self)
+
+    def copy(self):
+        """A dict of the converted values, that can be modified."""
+        return dict(self)
+
+
+class Converter(object):
+    """Convert records according to a schema, see compile_schema."""
+
+    def __init__(self, schema):
+        self.schema = dict(schema)
+        self._converters = {}
+        for field, field_type in self.schema.items():
+            convert = _converter(field_type)
+            if convert:
+                self._converters[field] = convert
+
+    def __call__(self, record):
+        """Convert a record: its createdTime at once, its fields when read."""
+        typed = dict(record)
+        if typed.get('createdTime'):
+            typed['createdTime'] = _sync.parse_time(typed['createdTime'])
+        if 'fields' in typed:
+            typed['fields'] = TypedFields(typed['fields'], self._converters)
+        return typed
+
+
+@functools.lru_cache(maxsize=128)
+def _compile(schema_items):
+    return Converter(schema_items)
+
+
+def compile_schema(schema):
+    """Get the converter of a schema, only compiled once for the same schema."""
+    if isinstance(schema, Converter):
+        return schema
+    return _compile(tuple(sorted(schema.items(), key=lambda item: item[0])))
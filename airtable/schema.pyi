@@ -0,0 +1,62 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Union
+
+
+class Attachment(NamedTuple):
+    id: Optional[str] = ...
+    url: Optional[str] = ...
+    filename: Optional[str] = ...
+    size: Optional[int] = ...
+    type: Optional[str] = ...
+    width: Optional[int] = ...
+    height: Optional[int] = ...
+    thumbnails: Optional[Dict[str, Any]] = ...
+
+
+CONVERTERS: Dict[str, Callable[[Any], Any]]
+
+
+class ListOf(object):
+    item_type: Union[str, Callable[[Any], Any]]
+
+    def __init__(self, item_type: Union[str, Callable[[Any], Any]]) -> None:
+        ...
+
+
+_FieldType = Union[str, ListOf, Callable[[Any], Any]]
+_Schema = Mapping[str, _FieldType]
+
+
+def from_metadata(fields: Iterable[Mapping[str, Any]]) -> Dict[str, Union[str, ListOf]]:
+    ...
+
+
+class TypedFields(Mapping[str, Any]):
+    def __init__(
+            self, raw: Mapping[str, Any], converters: Mapping[str, Callable[[Any], Any]]) -> None:
+        ...
+
+    def __getitem__(self, key: str) -> Any:
+        ...
+
+    def __iter__(self) -> Iterator[str]:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def copy(self) -> Dict[str, Any]:
+        ...
+
+
+class Converter(object):
+    schema: Dict[str, _FieldType]
+
+    def __init__(self, schema: Union[_Schema, Iterable[tuple[str, _FieldType]]]) -> None:
+        ...
+
+    def __call__(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        ...
+
+
+def compile_schema(schema: Union[_Schema, Converter]) -> Converter:
+    ...
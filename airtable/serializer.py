@@ -0,0 +1,102 @@
+"""JSON serializers of the payloads and responses of an airtable.Airtable client.
+
+By default, a client uses the fastest library installed: orjson, then ujson,
+then the json module of the standard library. Payloads are encoded straight
+to compact UTF-8 bytes. Responses are decoded by the library to plain dicts;
+to build other mappings (e.g. the OrderedDict used by default), the standard
+library is used with a hook, which is faster than converting the dicts
+afterwards.
+"""
+
+import json
+
+
+class JsonSerializer(object):
+    """Serialize with the json module of the standard library."""
+
+    name = 'json'
+
+    def dumps(self, value):
+        """Encode a value as UTF-8 JSON bytes."""
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _loads(self, content):
+        return json.loads(content)
+
+    def loads(self, content, dict_class=dict):
+        """Decode JSON bytes or text, building objects with dict_class."""
+        if dict_class is dict:
+            return self._loads(content)
+        return json.loads(content, object_pairs_hook=dict_class)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """Serialize with orjson."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        self._orjson = orjson
+        self._loads = orjson.loads
+
+    def dumps(self, value):
+        """Encode a value as UTF-8 JSON bytes."""
+        try:
+            return self._orjson.dumps(value, option=self._orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits, that the json module encodes.
+            return super(OrjsonSerializer, self).dumps(value)
+
+
+class UjsonSerializer(JsonSerializer):
+    """Serialize with ujson."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson  # pylint: disable=import-outside-toplevel
+
+        self._ujson = ujson
+        self._loads = ujson.loads
+
+    def dumps(self, value):
+        """Encode a value as UTF-8 JSON bytes."""
+        try:
+            return self._ujson.dumps(value, ensure_ascii=False).encode('utf-8')
+        except OverflowError:
+            # Integers beyond 64 bits, that the json module encodes.
+            return super(UjsonSerializer, self).dumps(value)
+
+
+# Serializers by name, in order of preference.
+SERIALIZERS = {
+    'orjson': OrjsonSerializer,
+    'ujson': UjsonSerializer,
+    'json': JsonSerializer,
+}
+
+
+def get_serializer(serializer=None):
+    """Get a serializer from its name, creating it.
+
+    Args:
+        - serializer: the name of a serializer in SERIALIZERS, or a
+              serializer object that is returned as is. By default, the
+              first one whose library is installed.
+    """
+    if serializer is None:
+        for serializer_class in SERIALIZERS.values():
+            try:
+                return serializer_class()
+            except ImportError:
+                pass
+    if not isinstance(serializer, str):
+        return serializer
+    try:
+        serializer_class = SERIALIZERS[serializer]
+    except KeyError:
+        raise ValueError('Unknown serializer "%s", use one of: %s' % (
+            serializer, ', '.join(sorted(SERIALIZERS)))) from None
+    return serializer_class()
@@ -0,0 +1,38 @@
+from typing import Any, Callable, Dict, Protocol, Union
+
+
+class _Serializer(Protocol):
+    name: str
+
+    def dumps(self, value: Any) -> bytes:
+        ...
+
+    def loads(self, content: Union[bytes, str], dict_class: type = ...) -> Any:
+        ...
+
+
+class JsonSerializer(object):
+    name: str
+
+    def dumps(self, value: Any) -> bytes:
+        ...
+
+    def loads(self, content: Union[bytes, str], dict_class: type = ...) -> Any:
+        ...
+
+
+class OrjsonSerializer(JsonSerializer):
+    def __init__(self) -> None:
+        ...
+
+
+class UjsonSerializer(JsonSerializer):
+    def __init__(self) -> None:
+        ...
+
+
+SERIALIZERS: Dict[str, Callable[[], _Serializer]]
+
+
+def get_serializer(serializer: Union[str, _Serializer, None] = ...) -> _Serializer:
+    ...
@@ -0,0 +1,68 @@
+"""Helpers to fetch only the records changed since a previous sync.
+
+The changes are found with a "last modified time" field of the table, and the
+progress of each sync is kept in a watermark store between runs.
+"""
+
+import datetime
+import json
+import os
+import threading
+
+# Default number of seconds to look back before the watermark, so that records
+# saved while the previous sync was running are not missed.
+DEFAULT_OVERLAP = 60
+
+
+def parse_time(value):
+    """Parse a time returned by the API, e.g. "2016-09-12T10:02:01.000Z"."""
+    if isinstance(value, datetime.datetime):
+        return value if value.tzinfo else value.replace(tzinfo=datetime.timezone.utc)
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def format_time(value):
+    """Format a time the way the API does."""
+    value = parse_time(value).astimezone(datetime.timezone.utc)
+    return value.strftime('%Y-%m-%dT%H:%M:%S.') + '%03dZ' % (value.microsecond // 1000)
+
+
+def changes_formula(modified_field, since, overlap=DEFAULT_OVERLAP):
+    """A formula to select the records modified after a given time."""
+    since = parse_time(since) - datetime.timedelta(seconds=overlap)
+    return "IS_AFTER({%s}, DATETIME_PARSE('%s'))" % (modified_field, format_time(since))
+
+
+class FileWatermarkStore(object):
+    """Watermarks of syncs, kept in a JSON file.
+
+    A watermark is a JSON-serializable dict, stored under a key naming the
+    sync (by default the table name). Any object with the same get and set
+    methods can be used instead, e.g. to keep them in a database.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as store_file:
+                return json.load(store_file)
+        except FileNotFoundError:
+            return {}
+
+    def get(self, key):
+        """Get the watermark stored for a key, or None."""
+        with self._lock:
+            return self._load().get(key)
+
+    def set(self, key, watermark):
+        """Store the watermark of a key, replacing the file atomically."""
+        with self._lock:
+            watermarks = self._load()
+            watermarks[key] = watermark
+            tmp_path = '%s.tmp' % self.path
+            with open(tmp_path, 'w') as store_file:
+                json.dump(watermarks, store_file)
+            os.replace(tmp_path, self.path)
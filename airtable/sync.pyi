@@ -0,0 +1,39 @@
+import datetime
+from typing import Any, Dict, Optional, Protocol, Union
+
+DEFAULT_OVERLAP: int
+
+_Time = Union[str, datetime.datetime]
+
+
+class _WatermarkStore(Protocol):
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def set(self, key: str, watermark: Dict[str, Any]) -> None:
+        ...
+
+
+def parse_time(value: _Time) -> datetime.datetime:
+    ...
+
+
+def format_time(value: _Time) -> str:
+    ...
+
+
+def changes_formula(modified_field: str, since: _Time, overlap: float = ...) -> str:
+    ...
+
+
+class FileWatermarkStore(object):
+    path: str
+
+    def __init__(self, path: str) -> None:
+        ...
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def set(self, key: str, watermark: Dict[str, Any]) -> None:
+        ...
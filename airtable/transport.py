@@ -0,0 +1,301 @@
+"""HTTP transports sending the requests of an airtable.Airtable client.
+
+The library of a transport is only imported when a client using it is
+created, so that importing airtable stays fast, e.g. in command line tools
+that only sometimes call the API. The transports are:
+- "requests" (the default): a requests.Session.
+- "urllib3": a urllib3.PoolManager, faster to import than requests.
+- "http.client": the standard library only, without any dependency nor
+  compression.
+"""
+
+import json
+import threading
+import urllib.parse
+
+# Number of bytes read at once when reading a whole response.
+_READ_SIZE = 64 * 1024
+
+
+def _charset(content_type):
+    for param in (content_type or '').split(';')[1:]:
+        name, unused_sep, value = param.strip().partition('=')
+        if name.lower() == 'charset':
+            return value.strip('"') or None
+    return None
+
+
+def _split_timeout(timeout):
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+class Response(object):
+    """A response of the urllib3 or http.client transports.
+
+    It has the parts of a requests.Response that the client uses: the
+    status_code, headers and encoding attributes, the content, json and
+    iter_content methods, and close.
+    """
+
+    def __init__(self, status_code, headers, read, release, discard):
+        """Wrap a response whose body is not read yet.
+
+        Args:
+            - status_code: the HTTP status of the response.
+            - headers: the headers, a mapping whose get method ignores case.
+            - read: a function reading up to a number of bytes of the body,
+                  returning b'' at its end.
+            - release: a function called once the body was read, to reuse
+                  the connection.
+            - discard: a function called when the response is closed before
+                  its body was read, to drop the connection.
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.encoding = _charset(headers.get('Content-Type'))
+        self._read = read
+        self._release = release
+        self._discard = discard
+        self._content = None
+        self._done = False
+
+    @property
+    def content(self):
+        """The whole body of the response."""
+        if self._content is None:
+            self._content = b''.join(self.iter_content(_READ_SIZE))
+        return self._content
+
+    def iter_content(self, chunk_size=1):
+        """Read the body of the response by chunks."""
+        if self._content is not None:
+            yield self._content
+            return
+        while not self._done:
+            chunk = self._read(chunk_size)
+            if not chunk:
+                self._done = True
+                self._release()
+                return
+            yield chunk
+
+    def json(self, **kwargs):
+        """Decode the body of the response, see json.loads."""
+        return json.loads(self.content, **kwargs)
+
+    def close(self):
+        """Drop the rest of the body, if any."""
+        if not self._done:
+            self._done = True
+            self._discard()
+
+
+class RequestsTransport(object):
+    """Send requests with a requests.Session."""
+
+    def __init__(self, pool_size=10, max_retries=0):
+        """Create the session.
+
+        Args:
+            - pool_size: the maximum number of connections kept alive.
+            - max_retries: the number of times a request is retried when the
+                  connection fails.
+        """
+        # pylint: disable=import-outside-toplevel
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # The exceptions raised by the transport, and those to retry.
+        self.errors = (requests.RequestException,)
+        self.connection_errors = (requests.ConnectionError, requests.Timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=max_retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(
+            self, method, url, params=None, data=None, headers=None, timeout=None,
+            stream=False):
+        """Send a request, see requests.Session.request."""
+        return self.session.request(
+            method, url, params=params, data=data, headers=headers, timeout=timeout,
+            stream=stream)
+
+    def close(self):
+        """Close the connections kept alive."""
+        self.session.close()
+
+
+def _with_params(url, params):
+    if not params:
+        return url
+    query = urllib.parse.urlencode(
+        [(key, value) for key, value in params.items() if value is not None], doseq=True)
+    return '%s%s%s' % (url, '&' if '?' in url else '?', query)
+
+
+class Urllib3Transport(object):
+    """Send requests with a urllib3.PoolManager."""
+
+    def __init__(self, pool_size=10, max_retries=0):
+        """Create the pool manager, see RequestsTransport for the arguments."""
+        import urllib3  # pylint: disable=import-outside-toplevel
+
+        self._urllib3 = urllib3
+        self.errors = (urllib3.exceptions.HTTPError,)
+        self.connection_errors = (
+            urllib3.exceptions.MaxRetryError, urllib3.exceptions.ProtocolError,
+            urllib3.exceptions.TimeoutError)
+        # Retry failed connections but not failed reads, as requests does.
+        self._retries = urllib3.Retry(max_retries, read=False, redirect=0)
+        self._pool = urllib3.PoolManager(num_pools=1, maxsize=pool_size)
+        self._headers = urllib3.util.make_headers(accept_encoding=True)
+
+    def request(
+            self, method, url, params=None, data=None, headers=None, timeout=None,
+            stream=False):
+        """Send a request, with the same arguments as RequestsTransport.request."""
+        connect_timeout, read_timeout = _split_timeout(timeout)
+        response = self._pool.request(
+            method, _with_params(url, params),
+            body=data.encode('utf-8') if isinstance(data, str) else data,
+            headers=dict(self._headers, **(headers or {})),
+            timeout=self._urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+            retries=self._retries, preload_content=False)
+
+        def _discard():
+            response.close()
+            response.release_conn()
+
+        wrapped = Response(
+            response.status, response.headers, response.read, response.release_conn, _discard)
+        if not stream:
+            wrapped.content  # pylint: disable=pointless-statement
+        return wrapped
+
+    def close(self):
+        """Close the connections kept alive."""
+        self._pool.clear()
+
+
+class HttpClientTransport(object):
+    """Send requests with http.client from the standard library."""
+
+    def __init__(self, pool_size=10, max_retries=0):
+        """Create an empty pool, see RequestsTransport for the arguments."""
+        import http.client  # pylint: disable=import-outside-toplevel
+
+        self._http_client = http.client
+        self.errors = (OSError, http.client.HTTPException)
+        self.connection_errors = self.errors
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        # Connections kept alive, per (scheme, host).
+        self._idle = {}
+
+    def _connection(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host = key
+        if scheme == 'https':
+            return self._http_client.HTTPSConnection(host), False
+        return self._http_client.HTTPConnection(host), False
+
+    def _release(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(
+            self, method, url, params=None, data=None, headers=None, timeout=None,
+            stream=False):
+        """Send a request, with the same arguments as RequestsTransport.request."""
+        parts = urllib.parse.urlsplit(_with_params(url, params))
+        key = (parts.scheme, parts.netloc)
+        path = '%s?%s' % (parts.path, parts.query) if parts.query else parts.path
+        body = data.encode('utf-8') if isinstance(data, str) else data
+        connect_timeout, read_timeout = _split_timeout(timeout)
+        failed_connections = 0
+        while True:
+            connection, is_reused = self._connection(key)
+            try:
+                if connection.sock is None:
+                    connection.timeout = connect_timeout
+                    connection.connect()
+                connection.sock.settimeout(read_timeout)
+            except OSError:
+                connection.close()
+                failed_connections += 1
+                if failed_connections > self.max_retries:
+                    raise
+                continue
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+            except (OSError, self._http_client.HTTPException) as error:
+                connection.close()
+                # The server may have closed a connection kept alive.
+                if is_reused and isinstance(error, ConnectionError):
+                    continue
+                raise
+            break
+
+        def _release():
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+
+        wrapped = Response(
+            response.status, response.headers, response.read, _release, connection.close)
+        if not stream:
+            wrapped.content  # pylint: disable=pointless-statement
+        return wrapped
+
+    def close(self):
+        """Close the connections kept alive."""
+        with self._lock:
+            connections = [
+                connection for idle in self._idle.values() for connection in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+
+# Transports by name.
+TRANSPORTS = {
+    'requests': RequestsTransport,
+    'urllib3': Urllib3Transport,
+    'http.client': HttpClientTransport,
+}
+
+
+def get_transport(transport=None, pool_size=10, max_retries=0):
+    """Get a transport from its name, creating it.
+
+    Args:
+        - transport: the name of a transport in TRANSPORTS, by default
+              "requests", or a transport object that is returned as is.
+        - pool_size: the maximum number of connections kept alive.
+        - max_retries: the number of times a request is retried when the
+              connection fails.
+    """
+    if transport is None:
+        transport = 'requests'
+    if not isinstance(transport, str):
+        return transport
+    try:
+        transport_class = TRANSPORTS[transport]
+    except KeyError:
+        raise ValueError('Unknown transport "%s", use one of: %s' % (
+            transport, ', '.join(sorted(TRANSPORTS)))) from None
+    return transport_class(pool_size, max_retries)
@@ -0,0 +1,123 @@
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Protocol, Tuple, Type, Union
+
+_Timeout = Union[float, Tuple[float, float], None]
+
+
+class _Response(Protocol):
+    status_code: int
+    headers: Mapping[str, str]
+    encoding: Optional[str]
+
+    @property
+    def content(self) -> bytes:
+        ...
+
+    def iter_content(self, chunk_size: int = ...) -> Iterator[bytes]:
+        ...
+
+    def json(self, **kwargs: Any) -> Any:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class _Transport(Protocol):
+    errors: Tuple[Type[BaseException], ...]
+    connection_errors: Tuple[Type[BaseException], ...]
+
+    def request(
+            self, method: str, url: str, params: Optional[Mapping[str, Any]] = ...,
+            data: Union[str, bytes, None] = ..., headers: Optional[Mapping[str, str]] = ...,
+            timeout: _Timeout = ..., stream: bool = ...) -> _Response:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class Response(object):
+    status_code: int
+    headers: Mapping[str, str]
+    encoding: Optional[str]
+
+    def __init__(
+            self, status_code: int, headers: Mapping[str, str], read: Callable[[int], bytes],
+            release: Callable[[], None], discard: Callable[[], None]) -> None:
+        ...
+
+    @property
+    def content(self) -> bytes:
+        ...
+
+    def iter_content(self, chunk_size: int = ...) -> Iterator[bytes]:
+        ...
+
+    def json(self, **kwargs: Any) -> Any:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class RequestsTransport(object):
+    errors: Tuple[Type[BaseException], ...]
+    connection_errors: Tuple[Type[BaseException], ...]
+    session: Any
+
+    def __init__(self, pool_size: int = ..., max_retries: int = ...) -> None:
+        ...
+
+    def request(
+            self, method: str, url: str, params: Optional[Mapping[str, Any]] = ...,
+            data: Union[str, bytes, None] = ..., headers: Optional[Mapping[str, str]] = ...,
+            timeout: _Timeout = ..., stream: bool = ...) -> _Response:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class Urllib3Transport(object):
+    errors: Tuple[Type[BaseException], ...]
+    connection_errors: Tuple[Type[BaseException], ...]
+
+    def __init__(self, pool_size: int = ..., max_retries: int = ...) -> None:
+        ...
+
+    def request(
+            self, method: str, url: str, params: Optional[Mapping[str, Any]] = ...,
+            data: Union[str, bytes, None] = ..., headers: Optional[Mapping[str, str]] = ...,
+            timeout: _Timeout = ..., stream: bool = ...) -> Response:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class HttpClientTransport(object):
+    errors: Tuple[Type[BaseException], ...]
+    connection_errors: Tuple[Type[BaseException], ...]
+    pool_size: int
+    max_retries: int
+
+    def __init__(self, pool_size: int = ..., max_retries: int = ...) -> None:
+        ...
+
+    def request(
+            self, method: str, url: str, params: Optional[Mapping[str, Any]] = ...,
+            data: Union[str, bytes, None] = ..., headers: Optional[Mapping[str, str]] = ...,
+            timeout: _Timeout = ..., stream: bool = ...) -> Response:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+TRANSPORTS: Dict[str, Callable[[int, int], _Transport]]
+
+
+def get_transport(
+        transport: Union[str, _Transport, None] = ..., pool_size: int = ...,
+        max_retries: int = ...) -> _Transport:
+    ...
@@ -0,0 +1,150 @@
+"""A writer buffering the changes to a table, to send them by batches.
+
+    with table.buffered_writer() as writer:
+        for event in events:
+            writer.update(event.record_id, {'Status': event.status})
+    if writer.failures:
+        ...
+"""
+
+import collections
+import threading
+import time
+
+from . import AirtableError, MAX_RECORDS_PER_REQUEST
+
+# Default maximum number of buffered changes.
+DEFAULT_MAX_PENDING = 100
+# Default maximum number of seconds a change is buffered.
+DEFAULT_MAX_DELAY = 1.
+
+# A batch of changes that could not be sent. Depending on the method, the
+# records are the fields of the records to create ("POST"), (record ID, fields)
+# pairs to update ("PATCH" or "PUT"), or the IDs of the records to delete
+# ("DELETE").
+FailedBatch = collections.namedtuple('FailedBatch', ['method', 'records', 'error'])
+
+
+class BufferedWriter(object):
+    """Buffer the changes to a table and send them by batches.
+
+    Successive updates of a record are merged in a single one, and the
+    updates of a record deleted afterwards are dropped. The changes are sent
+    when there are too many of them, when the oldest one is too old (checked
+    when a change is added), when flush is called, and when the writer is
+    used as a context manager, on exit.
+    """
+
+    def __init__(
+            self, table, max_pending=DEFAULT_MAX_PENDING, max_delay=DEFAULT_MAX_DELAY,
+            clock=time.monotonic):
+        """Create a writer for a table.
+
+        Args:
+            - table: the airtable.Table to write to.
+            - max_pending: the number of buffered changes that triggers a
+                  flush.
+            - max_delay: the number of seconds after which buffered changes
+                  are flushed, or None to only flush on size.
+            - clock: the function returning the current time in seconds.
+        """
+        self.table = table
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.failures = []
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._creates = []
+        # Keyed by record ID, values are (method, fields) tuples.
+        self._updates = collections.OrderedDict()
+        self._deletes = collections.OrderedDict()
+        self._oldest = None
+        # A batch fails on errors of the API, or of the HTTP library of the client.
+        client = table._client  # pylint: disable=protected-access
+        self._errors = (AirtableError,) + client.transport.errors
+
+    def __len__(self):
+        return len(self._creates) + len(self._updates) + len(self._deletes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *unused_exc_info):
+        self.flush()
+
+    def create(self, data):
+        """Buffer the creation of a record."""
+        with self._lock:
+            self._creates.append(data)
+        self._changed()
+
+    def update(self, record_id, data):
+        """Buffer the update of some fields of a record."""
+        with self._lock:
+            if record_id in self._deletes:
+                return
+            method, fields = self._updates.get(record_id, ('PATCH', {}))
+            self._updates[record_id] = (method, dict(fields, **data))
+        self._changed()
+
+    def update_all(self, record_id, data):
+        """Buffer the replacement of all fields of a record."""
+        with self._lock:
+            if record_id in self._deletes:
+                return
+            self._updates[record_id] = ('PUT', dict(data))
+        self._changed()
+
+    def delete(self, record_id):
+        """Buffer the deletion of a record, dropping its buffered updates."""
+        with self._lock:
+            self._updates.pop(record_id, None)
+            self._deletes[record_id] = True
+        self._changed()
+
+    def _changed(self):
+        now = self._clock()
+        with self._lock:
+            if self._oldest is None:
+                self._oldest = now
+            is_due = len(self) >= self.max_pending or \
+                self.max_delay is not None and now - self._oldest >= self.max_delay
+        if is_due:
+            self.flush()
+
+    def flush(self):
+        """Send all the buffered changes.
+
+        A batch that fails does not prevent the others from being sent.
+
+        Returns:
+            A list of the FailedBatch of this flush, also added to the
+            failures attribute.
+        """
+        with self._flush_lock:
+            with self._lock:
+                creates, self._creates = self._creates, []
+                updates, self._updates = self._updates, collections.OrderedDict()
+                deletes, self._deletes = self._deletes, collections.OrderedDict()
+                self._oldest = None
+            batches = [
+                ('POST', self.table.create_many, creates),
+                ('PATCH', self.table.update_many, [
+                    (record_id, fields)
+                    for record_id, (method, fields) in updates.items() if method == 'PATCH']),
+                ('PUT', self.table.update_all_many, [
+                    (record_id, fields)
+                    for record_id, (method, fields) in updates.items() if method == 'PUT']),
+                ('DELETE', self.table.delete_many, list(deletes)),
+            ]
+            failures = []
+            for method, send, changes in batches:
+                for start in range(0, len(changes), MAX_RECORDS_PER_REQUEST):
+                    batch = changes[start:start + MAX_RECORDS_PER_REQUEST]
+                    try:
+                        list(send(batch))
+                    except self._errors as error:
+                        failures.append(FailedBatch(method, batch, error))
+            self.failures.extend(failures)
+            return failures
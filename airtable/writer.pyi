@@ -0,0 +1,48 @@
+from typing import Any, Callable, List, Mapping, NamedTuple, Optional, Sequence
+
+from . import Table
+
+DEFAULT_MAX_PENDING: int
+DEFAULT_MAX_DELAY: float
+
+
+class FailedBatch(NamedTuple):
+    method: str
+    records: Sequence[Any]
+    error: Exception
+
+
+class BufferedWriter(object):
+    table: Table[Any]
+    max_pending: int
+    max_delay: Optional[float]
+    failures: List[FailedBatch]
+
+    def __init__(
+            self, table: Table[Any], max_pending: int = ..., max_delay: Optional[float] = ...,
+            clock: Callable[[], float] = ...) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def __enter__(self) -> 'BufferedWriter':
+        ...
+
+    def __exit__(self, *unused_exc_info: Any) -> None:
+        ...
+
+    def create(self, data: Mapping[str, Any]) -> None:
+        ...
+
+    def update(self, record_id: str, data: Mapping[str, Any]) -> None:
+        ...
+
+    def update_all(self, record_id: str, data: Mapping[str, Any]) -> None:
+        ...
+
+    def delete(self, record_id: str) -> None:
+        ...
+
+    def flush(self) -> List[FailedBatch]:
+        ...
@@ -0,0 +1,52 @@
+"""Micro-benchmark of the JSON serializers on typical payloads and pages.
+
+Compares the serializers of airtable.serializer that are installed: encoding
+batches of 10 records to create, and decoding pages of 100 records to dicts
+and to OrderedDicts.
+
+Run with: PYTHONPATH=. python benchmarks/bench_json.py
+"""
+
+import json
+import time
+from collections import OrderedDict
+
+from airtable import serializer
+from stub_server import make_fields
+
+_NUM_PAGES = 200
+
+
+def _rate(count, func):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def run(width=20):
+    """Run the benchmarks of each serializer, yielding (name, value, unit) tuples."""
+    payload = {'records': [{'fields': make_fields(index, width)} for index in range(10)]}
+    content = json.dumps({'records': [
+        {'id': 'rec%014d' % index, 'createdTime': '2026-10-18T10:00:00.000Z',
+         'fields': dict(make_fields(index, width), Tags=['recA', 'recB'])}
+        for index in range(100)]}).encode('utf-8')
+    for name in serializer.SERIALIZERS:
+        try:
+            backend = serializer.get_serializer(name)
+        except ImportError:
+            continue
+        yield 'json_dumps[%s]' % name, _rate(_NUM_PAGES * 10, lambda: [
+            backend.dumps(payload) for unused in range(_NUM_PAGES)]), 'records/s'
+        yield 'json_loads_dict[%s]' % name, _rate(_NUM_PAGES * 100, lambda: [
+            backend.loads(content) for unused in range(_NUM_PAGES)]), 'records/s'
+        yield 'json_loads_ordered_dict[%s]' % name, _rate(_NUM_PAGES * 100, lambda: [
+            backend.loads(content, OrderedDict) for unused in range(_NUM_PAGES)]), 'records/s'
+
+
+def main():
+    for name, value, unit in run():
+        print('%-45s %12.1f %s' % (name, value, unit))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark of the memory taken by records held in memory.
+
+Compares the OrderedDicts and dicts returned by default with compact Record
+objects, for a table of many records: with all fields set, and with sparse
+fields, as the API leaves the empty fields out of the records.
+
+Run with: PYTHONPATH=. python benchmarks/bench_records.py
+"""
+
+import json
+import random
+import tracemalloc
+from collections import OrderedDict
+
+import airtable
+
+_NUM_RECORDS = 200000
+_NUM_SPARSE_FIELDS = 20
+
+
+def _make_dense_content():
+    return json.dumps([
+        {
+            'id': 'rec%014d' % index,
+            'createdTime': '2026-10-18T10:00:00.000Z',
+            'fields': {
+                'Name': 'Record %d' % index,
+                'Email': 'user%d@example.com' % index,
+                'Score': index % 100,
+                'Active': bool(index % 2),
+                'Tags': ['recA', 'recB'],
+            },
+        }
+        for index in range(_NUM_RECORDS)
+    ])
+
+
+def _make_sparse_content():
+    # Each field is set for half of the records.
+    rand = random.Random(0)
+    return json.dumps([
+        {
+            'id': 'rec%014d' % index,
+            'createdTime': '2026-10-18T10:00:00.000Z',
+            'fields': {
+                'Field %d' % field: 'Value %d' % index
+                for field in range(_NUM_SPARSE_FIELDS) if rand.random() < .5
+            },
+        }
+        for index in range(_NUM_RECORDS)
+    ])
+
+
+def _measure(name, content, build):
+    tracemalloc.start()
+    records = build(content)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('%-21s %7.1f MB (%d bytes per record)' % (name, size / 1e6, size // len(records)))
+
+
+def main():
+    for kind, content in (('dense', _make_dense_content()), ('sparse', _make_sparse_content())):
+        _measure('OrderedDict ' + kind, content, lambda content: json.loads(
+            content, object_pairs_hook=OrderedDict))
+        _measure('dict ' + kind, content, json.loads)
+        make_record = airtable._RecordFactory()
+        _measure('Record ' + kind, content, lambda content: [
+            make_record(record, 'Table') for record in json.loads(content)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark of connection reuse: one request per call vs the pooled session.
+
+Run with: PYTHONPATH=. python benchmarks/bench_session.py
+"""
+
+import json
+import posixpath
+import time
+
+import requests
+
+import airtable
+from stub_server import StubServer
+
+_NUM_REQUESTS = 1000
+
+
+def _requests_per_second(func):
+    start = time.perf_counter()
+    for index in range(_NUM_REQUESTS):
+        func(index)
+    return _NUM_REQUESTS / (time.perf_counter() - start)
+
+
+def main():
+    with StubServer() as server:
+        server.add_records('Table', _NUM_REQUESTS)
+        record_ids = list(server.tables['Table'])
+        client = airtable.Airtable('appBench', 'keyBench')
+        client.base_url = server.url
+
+        def _without_session(index):
+            # This is how each call was sent before the client had a session.
+            requests.request(
+                'PATCH', posixpath.join(server.url, 'Table', record_ids[index]),
+                data=json.dumps(airtable.create_payload({'index': index})),
+                headers=dict(client.headers, **{'Content-type': 'application/json'}))
+
+        def _with_session(index):
+            client.update('Table', record_ids[index], {'index': index})
+
+        with client:
+            before = _requests_per_second(_without_session)
+            after = _requests_per_second(_with_session)
+    print('requests.request per call: %.0f requests/s' % before)
+    print('pooled session:            %.0f requests/s' % after)
+
+
+if __name__ == '__main__':
+    main()
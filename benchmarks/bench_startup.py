@@ -0,0 +1,84 @@
+"""Benchmark of the time taken to import airtable and create a client.
+
+Runs `python -X importtime -c "import airtable"` in fresh processes, and
+reports the median cumulative import time of the package, then of creating a
+client with each transport, and the slowest modules imported with it.
+
+Run with: PYTHONPATH=. python benchmarks/bench_startup.py [--runs 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+_TRANSPORTS = ('requests', 'urllib3', 'http.client')
+
+
+def _import_times(statement):
+    """Modules imported by a statement, with their cumulative import time in µs.
+
+    Returns:
+        A list of (module, time) tuples, in the order of -X importtime: each
+        module comes after the ones it imported.
+    """
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        check=True, stderr=subprocess.PIPE).stderr.decode()
+    times = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        unused_self, cumulative, module = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times.append((module.rstrip(), int(cumulative)))
+    return times
+
+
+def measure(statement, module='airtable', runs=10):
+    """Import time of a module.
+
+    Returns:
+        The median cumulative import time of the module in ms, and the
+        (name, time in µs) of the modules it imported in the last run.
+    """
+    durations = []
+    for unused in range(runs):
+        times = _import_times(statement)
+        index = next(i for i, (name, unused_time) in enumerate(times) if name.strip() == module)
+        durations.append(times[index][1] / 1000)
+        imported = []
+        for name, time in reversed(times[:index]):
+            if not name.startswith('  '):
+                break
+            imported.append((name.strip(), time))
+    return statistics.median(durations), imported
+
+
+def run(runs=10):
+    """Run the startup benchmarks, yielding (name, value, unit) tuples."""
+    median, imported = measure('import airtable', runs=runs)
+    yield 'import_airtable', median, 'ms'
+    for module, time in sorted(imported, key=lambda item: -item[1])[:5]:
+        print('    %-41s %12.1f ms' % (module, time / 1000))
+    for transport in _TRANSPORTS:
+        statement = (
+            'import time; start = time.perf_counter(); import airtable; '
+            'airtable.Airtable("app", "key", transport="%s"); '
+            'print(time.perf_counter() - start)' % transport)
+        durations = [
+            float(subprocess.check_output([sys.executable, '-c', statement]))
+            for unused in range(runs)]
+        yield 'startup[transport=%s]' % transport, statistics.median(durations) * 1000, 'ms'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--runs', type=int, default=10, help='Number of processes to run.')
+    args = parser.parse_args()
+    for name, value, unit in run(args.runs):
+        print('%-45s %12.1f %s' % (name, value, unit))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark of decoding a page of records with large fields.
+
+Compares decoding the whole page at once (with and without OrderedDict) with
+streaming the records one at a time, in time and in peak memory.
+
+Run with: PYTHONPATH=. python benchmarks/bench_streaming.py
+"""
+
+import json
+import time
+import tracemalloc
+from collections import OrderedDict
+
+import airtable
+
+
+def _make_page(num_records=100, text_size=50000):
+    return json.dumps({
+        'records': [
+            {
+                'id': 'rec%014d' % index,
+                'createdTime': '2026-10-18T10:00:00.000Z',
+                'fields': {
+                    'Name': 'Record %d' % index,
+                    'Notes': 'Lorem ipsum ' * (text_size // 12),
+                    'Attachments': [
+                        {
+                            'id': 'att%d' % attachment,
+                            'url': 'https://dl.airtable.com/%d.png' % attachment,
+                            'filename': '%d.png' % attachment,
+                            'size': 1234,
+                            'type': 'image/png',
+                        }
+                        for attachment in range(20)
+                    ],
+                },
+            }
+            for index in range(num_records)
+        ],
+        'offset': 'itrBench',
+    }).encode('utf-8')
+
+
+class _FakeResponse(object):
+    encoding = 'utf-8'
+
+    def __init__(self, content):
+        self._content = content
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self._content), chunk_size):
+            yield self._content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def _consume(records):
+    count = 0
+    for record in records:
+        count += len(record['fields'])
+    return count
+
+
+def _measure(name, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('%-28s %7.1f ms %8.1f MB peak' % (name, elapsed * 1000, peak / 1e6))
+
+
+def main():
+    content = _make_page()
+    print('Page of %.1f MB' % (len(content) / 1e6))
+    _measure('json, OrderedDict hook', lambda: _consume(
+        json.loads(content, object_pairs_hook=OrderedDict)['records']))
+    _measure('json, dict', lambda: _consume(json.loads(content)['records']))
+    _measure('stream, OrderedDict hook', lambda: _consume(airtable._stream_records(
+        _FakeResponse(content), json.JSONDecoder(object_pairs_hook=OrderedDict), {})))
+    _measure('stream, dict', lambda: _consume(airtable._stream_records(
+        _FakeResponse(content), json.JSONDecoder(), {})))
+
+
+if __name__ == '__main__':
+    main()
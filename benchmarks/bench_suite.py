@@ -0,0 +1,169 @@
+"""Benchmark suite of the client against the local stub server.
+
+Measures get, iterate, single and batched writes, iterating under throttling
+and decoding pages, at several table sizes and field widths, then the JSON
+serializers and the startup time of the package. Results can be saved as
+JSON, and compared with saved ones to catch regressions.
+
+Run with: PYTHONPATH=. python benchmarks/bench_suite.py [--save results.json]
+    [--compare baseline.json] [--tolerance .2] [--latency 0]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import OrderedDict
+
+import airtable
+import bench_json
+import bench_startup
+from stub_server import StubServer, make_fields
+
+_SIZES = (1000, 5000)
+_WIDTHS = (5, 50)
+_NUM_GETS = 200
+_NUM_WRITES = 200
+
+
+def _rate(count, func):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def _client(server, **kwargs):
+    client = airtable.Airtable('appBench', 'keyBench', **kwargs)
+    client.base_url = server.url
+    return client
+
+
+def _bench_reads(server, size, width):
+    table_name = 'Table%dx%d' % (size, width)
+    server.add_records(table_name, size, width)
+    record_ids = list(server.tables[table_name])[:_NUM_GETS]
+    with _client(server) as client:
+        yield 'get', _rate(len(record_ids), lambda: [
+            client.get(table_name, record_id) for record_id in record_ids]), 'records/s'
+        yield 'iterate', _rate(size, lambda: list(client.iterate(table_name))), 'records/s'
+        yield 'iterate_stream', _rate(
+            size, lambda: list(client.iterate(table_name, stream=True))), 'records/s'
+    with _client(server, dict_class=dict) as client:
+        yield 'iterate_dict', _rate(size, lambda: list(client.iterate(table_name))), 'records/s'
+
+
+def _bench_writes(server, width):
+    table_name = 'Writes%d' % width
+    fields = [make_fields(index, width) for index in range(_NUM_WRITES)]
+    with _client(server) as client:
+        yield 'create', _rate(_NUM_WRITES, lambda: [
+            client.create(table_name, data) for data in fields]), 'records/s'
+        yield 'create_many', _rate(
+            _NUM_WRITES, lambda: list(client.create_many(table_name, fields))), 'records/s'
+        record_ids = list(server.tables[table_name])[:_NUM_WRITES]
+        updates = list(zip(record_ids, fields))
+        yield 'update', _rate(_NUM_WRITES, lambda: [
+            client.update(table_name, record_id, data) for record_id, data in updates]), \
+            'records/s'
+        yield 'update_many', _rate(
+            _NUM_WRITES, lambda: list(client.update_many(table_name, updates))), 'records/s'
+
+
+def _bench_throttled(server):
+    server.add_records('Throttled', 2000)
+    server.rate_limit = 10
+    server.reset_counts()
+    policy = airtable.RetryPolicy(backoff_base=.05, backoff_cap=1., max_attempts=20)
+    with _client(server, retry_policy=policy) as client:
+        yield 'iterate_throttled', _rate(
+            2000, lambda: list(client.iterate('Throttled'))), 'records/s'
+    yield 'iterate_throttled_429', server.throttled, 'responses'
+    server.rate_limit = None
+
+
+def _bench_decode(width):
+    content = json.dumps({'records': [
+        {'id': 'rec%014d' % index, 'createdTime': '2026-10-18T10:00:00.000Z',
+         'fields': make_fields(index, width)}
+        for index in range(100)]})
+    num_pages = 200
+    yield 'decode_ordered_dict', _rate(num_pages * 100, lambda: [
+        json.loads(content, object_pairs_hook=OrderedDict) for unused in range(num_pages)]), \
+        'records/s'
+    yield 'decode_dict', _rate(num_pages * 100, lambda: [
+        json.loads(content) for unused in range(num_pages)]), 'records/s'
+
+
+def run(latency=0.):
+    """Run all the benchmarks, returning a list of results."""
+    results = []
+
+    def _add(params, measures):
+        for name, value, unit in measures:
+            key = name
+            if params:
+                key += '[%s]' % ','.join('%s=%s' % item for item in params.items())
+            results.append({'name': key, 'value': value, 'unit': unit})
+            print('%-45s %12.1f %s' % (key, value, unit))
+            sys.stdout.flush()
+
+    with StubServer(latency=latency) as server:
+        for size in _SIZES:
+            for width in _WIDTHS:
+                _add({'size': size, 'width': width}, _bench_reads(server, size, width))
+        for width in _WIDTHS:
+            _add({'width': width}, _bench_writes(server, width))
+        _add({}, _bench_throttled(server))
+    for width in _WIDTHS:
+        _add({'width': width}, _bench_decode(width))
+    _add({}, bench_json.run())
+    _add({}, bench_startup.run(runs=5))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """List the results that are more than tolerance worse than the baseline."""
+    baseline_values = {result['name']: result['value'] for result in baseline}
+    regressions = []
+    for result in results:
+        before = baseline_values.get(result['name'])
+        if not before:
+            continue
+        # Higher rates are better, and lower durations.
+        if result['unit'].endswith('/s'):
+            is_worse = result['value'] < before * (1 - tolerance)
+        elif result['unit'] == 'ms':
+            is_worse = result['value'] > before * (1 + tolerance)
+        else:
+            continue
+        if is_worse:
+            regressions.append((result['name'], before, result['value']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--save', help='Save the results to this JSON file.')
+    parser.add_argument('--compare', help='Compare the results to this JSON file.')
+    parser.add_argument(
+        '--tolerance', type=float, default=.2,
+        help='Slow down ratio, compared to the baseline, considered as a regression.')
+    parser.add_argument(
+        '--latency', type=float, default=0., help='Seconds added to each response.')
+    args = parser.parse_args()
+
+    results = run(args.latency)
+    if args.save:
+        with open(args.save, 'w') as results_file:
+            json.dump(results, results_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for name, before, after in regressions:
+            print('Regression of %s: %.1f -> %.1f' % (name, before, after))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
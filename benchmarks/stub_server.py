@@ -0,0 +1,263 @@
+"""A local HTTP server emulating the Airtable API, for benchmarks.
+
+It keeps tables of records in memory and emulates the behaviors of the API
+that matter for performance: pages of at most 100 records with offset
+tokens, batches of at most 10 records, 429 errors when too many requests are
+sent per second, and an optional latency added to each response.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Maximum number of records in a page, as for the API.
+MAX_PAGE_SIZE = 100
+# Maximum number of records written in a request, as for the API.
+MAX_BATCH_SIZE = 10
+
+_CREATED_TIME = '2026-10-18T10:00:00.000Z'
+
+
+def make_fields(index, width=5):
+    """Fields of a fake record, with a given number of fields."""
+    fields = {'Name': 'Record %d' % index, 'Score': index % 100, 'Active': bool(index % 2)}
+    for column in range(len(fields), width):
+        fields['Field %d' % column] = 'Value %d of record %d' % (column, index)
+    return dict(list(fields.items())[:width])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep connections alive, as the actual API does.
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, do not wait for ACKs in between.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *unused_args):  # pylint: disable=arguments-differ
+        pass
+
+    def _send_json(self, status, body):
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_error(self, status, error_type, message=''):
+        self._send_json(status, {'error': {'type': error_type, 'message': message}})
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _handle(self, method):
+        stub = self.server.stub
+        body = self._read_body()
+        url = urlsplit(self.path)
+        # The path is /v0/<base ID>/<table name>[/<record ID>].
+        parts = [unquote(part) for part in url.path.split('/')[3:]]
+        if not stub.allow_request(method):
+            self._send_error(429, 'RATE_LIMIT_REACHED', 'Too many requests')
+            return
+        if stub.latency:
+            time.sleep(stub.latency)
+        kind = 'record' if len(parts) > 1 else 'table'
+        handler = getattr(stub, '_%s_%s' % (method.lower(), kind))
+        status, response = handler(parts[0], parts[1:], parse_qs(url.query), body)
+        if status == 200:
+            self._send_json(200, response)
+        else:
+            self._send_error(status, *response)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._handle('GET')
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self._handle('POST')
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        self._handle('PATCH')
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        self._handle('PUT')
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        self._handle('DELETE')
+
+
+class StubServer(object):
+    """An Airtable-like server running on a background thread.
+
+    Use it as a context manager, the url attribute is then the base URL to use
+    in place of the Airtable one. The requests attribute counts the requests
+    received per HTTP method, and throttled the ones refused with a 429.
+    """
+
+    def __init__(self, base_id='appBench', latency=0., rate_limit=None):
+        """Create a server, not started yet.
+
+        Args:
+            - base_id: the ID of the base in the URL.
+            - latency: the number of seconds to wait before each response.
+            - rate_limit: the number of requests accepted per second, the
+                  others get a 429 error. By default, all are accepted.
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.tables = {}
+        self.requests = {}
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._window_start = 0.
+        self._window_count = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.url = 'http://127.0.0.1:%d/v0/%s' % (self._server.server_address[1], base_id)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *unused_exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_records(self, table_name, count, width=5):
+        """Add fake records to a table, see make_fields."""
+        with self._lock:
+            table = self.tables.setdefault(table_name, {})
+            for index in range(count):
+                record = self._new_record(make_fields(index, width))
+                table[record['id']] = record
+
+    def reset_counts(self):
+        """Reset the counts of requests."""
+        with self._lock:
+            self.requests = {}
+            self.throttled = 0
+
+    def allow_request(self, method):
+        """Count a request, and tell whether it is within the rate limit."""
+        with self._lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            if not self.rate_limit:
+                return True
+            now = time.monotonic()
+            if now - self._window_start >= 1:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count <= self.rate_limit:
+                return True
+            self.throttled += 1
+            return False
+
+    def _new_record(self, fields):
+        self._next_id += 1
+        return {'id': 'rec%014d' % self._next_id, 'createdTime': _CREATED_TIME, 'fields': fields}
+
+    def _get_table(self, table_name, unused_ids, query, unused_body):
+        with self._lock:
+            records = list(self.tables.get(table_name, {}).values())
+        page_size = min(int(query.get('pageSize', [MAX_PAGE_SIZE])[0]), MAX_PAGE_SIZE)
+        max_records = int(query.get('maxRecords', [0])[0])
+        if max_records:
+            records = records[:max_records]
+        offset = query.get('offset', [None])[0]
+        start = 0
+        if offset:
+            if not offset.startswith('itr') or not offset[3:].isdigit():
+                return 422, ('LIST_RECORDS_ITERATOR_NOT_AVAILABLE', '')
+            start = int(offset[3:])
+        response = {'records': records[start:start + page_size]}
+        if start + page_size < len(records):
+            response['offset'] = 'itr%d' % (start + page_size)
+        return 200, response
+
+    def _get_record(self, table_name, ids, unused_query, unused_body):
+        with self._lock:
+            record = self.tables.get(table_name, {}).get(ids[0])
+        if record is None:
+            return 404, ('NOT_FOUND', 'Could not find record %s' % ids[0])
+        return 200, record
+
+    def _post_table(self, table_name, unused_ids, unused_query, body):
+        if 'records' not in body:
+            status, response = self._post_table(table_name, [], {}, {'records': [body]})
+            return status, response['records'][0] if status == 200 else response
+        if len(body['records']) > MAX_BATCH_SIZE:
+            return 422, ('INVALID_RECORDS', 'Too many records')
+        with self._lock:
+            table = self.tables.setdefault(table_name, {})
+            created = [self._new_record(record.get('fields', {})) for record in body['records']]
+            for record in created:
+                table[record['id']] = record
+        return 200, {'records': created}
+
+    def _update(self, table_name, record_id, fields, replace):
+        # Must be called with the lock held.
+        record = self.tables.get(table_name, {}).get(record_id)
+        if record is None:
+            return None
+        record['fields'] = dict(fields) if replace else dict(record['fields'], **fields)
+        return record
+
+    def _patch_record(self, table_name, ids, unused_query, body, replace=False):
+        with self._lock:
+            record = self._update(table_name, ids[0], body.get('fields', {}), replace)
+        if record is None:
+            return 404, ('NOT_FOUND', 'Could not find record %s' % ids[0])
+        return 200, record
+
+    def _put_record(self, table_name, ids, query, body):
+        return self._patch_record(table_name, ids, query, body, replace=True)
+
+    def _patch_table(self, table_name, unused_ids, unused_query, body, replace=False):
+        if len(body.get('records', [])) > MAX_BATCH_SIZE:
+            return 422, ('INVALID_RECORDS', 'Too many records')
+        merge_on = body.get('performUpsert', {}).get('fieldsToMergeOn')
+        updated = []
+        with self._lock:
+            table = self.tables.setdefault(table_name, {})
+            for record in body.get('records', []):
+                record_id = record.get('id')
+                if merge_on:
+                    key = [record['fields'].get(field) for field in merge_on]
+                    record_id = next((
+                        existing['id'] for existing in table.values()
+                        if [existing['fields'].get(field) for field in merge_on] == key), None)
+                    if record_id is None:
+                        created = self._new_record(record['fields'])
+                        table[created['id']] = created
+                        updated.append(created)
+                        continue
+                result = self._update(table_name, record_id, record.get('fields', {}), replace)
+                if result is None:
+                    return 422, ('INVALID_RECORDS', 'Could not find record %s' % record_id)
+                updated.append(result)
+        return 200, {'records': updated}
+
+    def _put_table(self, table_name, ids, query, body):
+        return self._patch_table(table_name, ids, query, body, replace=True)
+
+    def _delete_record(self, table_name, ids, unused_query, unused_body):
+        with self._lock:
+            record = self.tables.get(table_name, {}).pop(ids[0], None)
+        if record is None:
+            return 404, ('NOT_FOUND', 'Could not find record %s' % ids[0])
+        return 200, {'id': ids[0], 'deleted': True}
+
+    def _delete_table(self, table_name, unused_ids, query, unused_body):
+        ids = query.get('records[]', [])
+        if len(ids) > MAX_BATCH_SIZE:
+            return 422, ('INVALID_RECORDS', 'Too many records')
+        with self._lock:
+            table = self.tables.get(table_name, {})
+            for record_id in ids:
+                table.pop(record_id, None)
+        return 200, {'records': [{'id': record_id, 'deleted': True} for record_id in ids]}
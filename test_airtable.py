@@ -1,9 +1,49 @@
-from typing import Any, Dict
+import asyncio
+from collections import OrderedDict
+import concurrent.futures
+import datetime
+import decimal
+import gzip
+import http.server
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import warnings
+from typing import Any, Dict, List, Optional
 import unittest
+from unittest import mock
 
+from aiohttp import test_utils, web
+import requests
 import requests_mock
 
 import airtable
+from airtable import aio
+from airtable import cache
+from airtable import export
+from airtable import journal
+from airtable import metrics
+from airtable import mirror
+from airtable import pool
+from airtable import schema
+from airtable import serializer
+from airtable import transport
+from airtable import writer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
 FAKE_TABLE_NAME = 'TableName'
 FAKE_BASE_ID = 'app12345'
@@ -283,6 +323,1837 @@ class TestTableFromConfig(TestAirtable):
         self.assertEqual(response['records'][0]['fields'], {'Name': 3, 'Number': 4})
 
 
+class TestConnectionPool(unittest.TestCase):
+
+    def test_pool_options(self):
+        client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, pool_size=3, max_retries=2)
+        adapter = client.transport.session.get_adapter(client.base_url)
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual(2, adapter.max_retries.total)
+
+    @requests_mock.mock()
+    def test_session_is_shared_by_tables(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName/rec1', json={'id': 'rec1'})
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/Other/rec2', json={'id': 'rec2'})
+        client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, timeout=5)
+        client.table(FAKE_TABLE_NAME).get('rec1')
+        client.table('Other').get('rec2')
+        self.assertEqual(2, mock_requests.call_count)
+        self.assertEqual([5, 5], [request.timeout for request in mock_requests.request_history])
+
+    def test_context_manager_closes_session(self):
+        with airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY) as client:
+            adapter = client.transport.session.get_adapter(client.base_url)
+            adapter.poolmanager.connection_from_url(client.base_url)
+            self.assertEqual(1, len(adapter.poolmanager.pools))
+        self.assertEqual(0, len(adapter.poolmanager.pools))
+
+
+class _JsonHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *unused_args):  # pylint: disable=arguments-differ
+        pass
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.server.requests.append((self.command, self.path, body))
+        if self.path.endswith('/Missing'):
+            status, response = 404, {'error': {'type': 'NOT_FOUND', 'message': 'Missing'}}
+        elif self.command == 'POST':
+            status, response = 200, {'records': [
+                dict(record, id='rec%d' % index) for index, record in enumerate(body['records'])]}
+        else:
+            status, response = 200, {'id': 'rec1', 'fields': {'Name': 'Zoé'}}
+        content = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = _reply
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        super(TestTransport, self).setUp()
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _JsonHandler)
+        server.daemon_threads = True
+        server.requests = []
+        self.server = server
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+    def _client(self, transport_name):
+        client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, transport=transport_name, timeout=5)
+        self.addCleanup(client.close)
+        client.base_url = 'http://127.0.0.1:%d/v0/app12345' % self.server.server_address[1]
+        return client
+
+    def test_transports(self):
+        for transport_name in ('urllib3', 'http.client'):
+            with self.subTest(transport=transport_name):
+                self.server.requests = []
+                client = self._client(transport_name)
+                self.assertEqual(
+                    OrderedDict([('Name', 'Zoé')]),
+                    client.get(FAKE_TABLE_NAME, fields=['Name'], view='All')['fields'])
+                created = list(client.create_many(FAKE_TABLE_NAME, [{'Name': 'Noël'}]))
+                self.assertEqual([{'id': 'rec0', 'fields': {'Name': 'Noël'}}], created)
+                with self.assertRaises(airtable.AirtableError) as error:
+                    client.get(FAKE_TABLE_NAME, 'Missing')
+                self.assertEqual('NOT_FOUND', error.exception.type)
+                self.assertEqual([
+                    ('GET', '/v0/app12345/TableName?view=All&fields=Name&fields=Name', None),
+                    ('POST', '/v0/app12345/TableName',
+                     {'records': [{'fields': {'Name': 'Noël'}}]}),
+                    ('GET', '/v0/app12345/TableName/Missing', None),
+                ], self.server.requests)
+
+    def test_connection_error(self):
+        for transport_name in ('urllib3', 'http.client'):
+            with self.subTest(transport=transport_name):
+                client = self._client(transport_name)
+                client.base_url = 'http://127.0.0.1:1/v0/app12345'
+                with self.assertRaises(client.transport.connection_errors):
+                    client.get(FAKE_TABLE_NAME, 'rec1')
+
+    def test_unknown_transport(self):
+        with self.assertRaises(ValueError):
+            airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, transport='pycurl')
+
+    def test_custom_transport(self):
+        http_client = transport.HttpClientTransport(pool_size=2)
+        client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, transport=http_client)
+        self.assertIs(http_client, client.transport)
+
+    def test_import_is_lazy(self):
+        modules = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, airtable; print(" ".join(sorted(sys.modules)))',
+        ], cwd=os.path.dirname(os.path.abspath(__file__))).decode().split()
+        for module in ('requests', 'urllib3', 'http.client', 'concurrent.futures', 'sqlite3'):
+            self.assertNotIn(module, modules)
+
+
+class TestSerializer(unittest.TestCase):
+
+    def _check(self, backend):
+        self.assertEqual(
+            b'{"fields":{"Name":"Zo\xc3\xa9","Tags":[1,2]}}',
+            backend.dumps({'fields': {'Name': 'Zoé', 'Tags': [1, 2]}}))
+        # Values that the json module encodes, but not all libraries.
+        self.assertEqual(b'{"1":"a"}', backend.dumps({1: 'a'}))
+        self.assertEqual(b'[%d]' % 2 ** 70, backend.dumps([2 ** 70]))
+        content = b'{"b": {"d": 1, "c": [{"f": 2, "e": 3}]}, "a": null}'
+        decoded = backend.loads(content)
+        self.assertIs(dict, type(decoded))
+        self.assertEqual({'b': {'d': 1, 'c': [{'f': 2, 'e': 3}]}, 'a': None}, decoded)
+        ordered = backend.loads(content, OrderedDict)
+        self.assertIsInstance(ordered['b']['c'][0], OrderedDict)
+        self.assertEqual(['f', 'e'], list(ordered['b']['c'][0]))
+
+    def test_json(self):
+        self._check(serializer.get_serializer('json'))
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson(self):
+        self._check(serializer.get_serializer('orjson'))
+
+    def test_default(self):
+        self.assertEqual(
+            'json' if orjson is None else 'orjson', serializer.get_serializer().name)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            serializer.get_serializer('simplejson')
+
+    @requests_mock.mock()
+    def test_client(self, mock_requests):
+        mock_requests.post(
+            'https://api.airtable.com/v0/app12345/TableName',
+            json={'id': 'rec1', 'fields': {'Name': 'Zoé'}})
+        for dict_class in (dict, OrderedDict):
+            client = airtable.Airtable(
+                FAKE_BASE_ID, FAKE_API_KEY, dict_class=dict_class, serializer='json')
+            record = client.create(FAKE_TABLE_NAME, {'Name': 'Zoé'})
+            self.assertIs(dict_class, type(record))
+            self.assertEqual(
+                '{"fields":{"Name":"Zoé"}}'.encode('utf-8'), mock_requests.last_request.body)
+
+
+def _echo_records(request, unused_context):
+    records = request.json()['records']
+    for index, record in enumerate(records):
+        record.setdefault('id', 'rec%d' % index)
+    return {'records': records}
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        super(TestBatch, self).setUp()
+        self.table = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY).table(FAKE_TABLE_NAME)
+
+    @requests_mock.mock()
+    def test_create_many(self, mock_requests):
+        mock_requests.post('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        created = self.table.create_many({'Index': index} for index in range(23))
+        self.assertEqual(0, mock_requests.call_count, msg='Records are sent lazily')
+        self.assertEqual(list(range(23)), [record['fields']['Index'] for record in created])
+        self.assertEqual(
+            [10, 10, 3],
+            [len(request.json()['records']) for request in mock_requests.request_history])
+
+    @requests_mock.mock()
+    def test_update_many(self, mock_requests):
+        mock_requests.patch('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        updated = list(self.table.update_many(
+            ('rec%d' % index, {'Index': index}) for index in range(12)))
+        self.assertEqual(['rec%d' % index for index in range(12)], [r['id'] for r in updated])
+        self.assertEqual(2, mock_requests.call_count)
+        self.assertEqual(
+            {'id': 'rec10', 'fields': {'Index': 10}},
+            mock_requests.last_request.json()['records'][0])
+
+    @requests_mock.mock()
+    def test_update_all_many(self, mock_requests):
+        mock_requests.put('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        updated = list(self.table.update_all_many([('rec1', {'Name': 'A'})]))
+        self.assertEqual([{'id': 'rec1', 'fields': {'Name': 'A'}}], updated)
+
+    @requests_mock.mock()
+    def test_delete_many(self, mock_requests):
+        mock_requests.delete(
+            'https://api.airtable.com/v0/app12345/TableName',
+            json=lambda request, context: {'records': [
+                {'id': record_id, 'deleted': True}
+                for record_id in request.qs['records[]']]})
+        deleted = list(self.table.delete_many('rec%d' % index for index in range(15)))
+        self.assertEqual(['rec%d' % index for index in range(15)], [r['id'] for r in deleted])
+        self.assertEqual(2, mock_requests.call_count)
+
+    def test_invalid_update_many(self):
+        with self.assertRaises(airtable.IsNotString):
+            list(self.table.update_many([(123, {})]))
+
+    @requests_mock.mock()
+    def test_upsert_many(self, mock_requests):
+        mock_requests.patch('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        existing = [
+            {'id': 'recA%d' % index, 'fields': {'Code': 'A%d' % index, 'Score': index}}
+            for index in range(30)]
+        feed = [{'Code': 'A%d' % index, 'Score': index, 'Note': ''} for index in range(30)]
+        feed[3]['Score'] = 33
+        feed.append({'Code': 'B1', 'Score': 1})
+        upserted = list(self.table.upsert_many(feed, ['Code'], existing=existing))
+        self.assertEqual(['A%d' % index for index in range(30)] + ['B1'], [
+            record['fields']['Code'] for record in upserted])
+        self.assertEqual('recA4', upserted[4]['id'])
+        self.assertEqual(1, mock_requests.call_count)
+        self.assertEqual({
+            'performUpsert': {'fieldsToMergeOn': ['Code']},
+            'records': [
+                {'fields': {'Code': 'A3', 'Score': 33, 'Note': ''}},
+                {'fields': {'Code': 'B1', 'Score': 1}},
+            ],
+        }, mock_requests.last_request.json())
+
+    @requests_mock.mock()
+    def test_upsert_many_fetches_existing(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            {'id': 'rec1', 'fields': {'Code': 'A1', 'Tags': ['x']}}]})
+        mock_requests.patch('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        upserted = list(self.table.upsert_many(
+            [{'Code': 'A1', 'Tags': ['x']}, {'Code': 'A2'}, {'Code': 'A2', 'Tags': ['y']}],
+            ['Code']))
+        self.assertEqual(['rec1', 'rec0', 'rec0'], [record['id'] for record in upserted])
+        # The same key is never sent twice in a request.
+        self.assertEqual(
+            [1, 1],
+            [len(request.json()['records']) for request in mock_requests.request_history[1:]])
+
+    @requests_mock.mock()
+    def test_upsert_many_without_diff(self, mock_requests):
+        mock_requests.patch('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        upserted = self.table.upsert_many(
+            ({'Code': index} for index in range(12)), ['Code'], skip_unchanged=False)
+        self.assertEqual(12, len(list(upserted)))
+        self.assertEqual(['PATCH', 'PATCH'], [r.method for r in mock_requests.request_history])
+
+    @requests_mock.mock()
+    def test_upsert_many_zero(self, mock_requests):
+        mock_requests.patch('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        existing = [{'id': 'rec' + code, 'fields': {'Code': code}} for code in 'AB']
+        upserted = list(self.table.upsert_many(
+            [{'Code': 'A', 'Count': 0}, {'Code': 'B', 'Done': False, 'Tags': []}], ['Code'],
+            existing=existing))
+        self.assertEqual(2, len(upserted))
+        self.assertEqual(
+            [{'fields': {'Code': 'A', 'Count': 0}}], mock_requests.last_request.json()['records'])
+
+    @requests_mock.mock()
+    def test_upsert_many_compact_records(self, mock_requests):
+        mock_requests.patch('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, compact_records=True)
+        upserted = list(client.upsert_many(
+            FAKE_TABLE_NAME, [{'Code': 'A'}, {'Code': 'B'}], ['Code'],
+            existing=[{'id': 'recA', 'fields': {'Code': 'A'}}]))
+        self.assertEqual([airtable.Record] * 2, [type(record) for record in upserted])
+        self.assertEqual(['recA', 'rec0'], [record['id'] for record in upserted])
+
+    def test_upsert_many_missing_key(self):
+        with self.assertRaises(ValueError):
+            list(self.table.upsert_many([{'Name': 'A'}], ['Code'], existing=[]))
+
+
+class TestBulkImport(unittest.TestCase):
+
+    def setUp(self):
+        super(TestBulkImport, self).setUp()
+        self.table = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY).table(FAKE_TABLE_NAME)
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, 'import.db')
+        self.rows = [{'Email': 'user%d@example.com' % index} for index in range(25)]
+        self.created: List[str] = []
+        self.crash_on: Optional[str] = None
+
+    def _create(self, request, unused_context):
+        records = request.json()['records']
+        if records[0]['fields']['Email'] == self.crash_on:
+            raise requests.ConnectionError('Crash')
+        self.created.extend(record['fields']['Email'] for record in records)
+        return {'records': [
+            {'id': 'rec%s' % record['fields']['Email'].split('@')[0], 'fields': record['fields']}
+            for record in records]}
+
+    @requests_mock.mock()
+    def test_run_twice(self, mock_requests):
+        mock_requests.post('https://api.airtable.com/v0/app12345/TableName', json=self._create)
+        self.assertEqual(
+            {'created': 25, 'skipped': 0, 'recovered': 0},
+            self.table.bulk_import(self.rows, self.path))
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertEqual(
+            {'created': 0, 'skipped': 25, 'recovered': 0},
+            self.table.bulk_import(self.rows, self.path))
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertEqual(25, len(self.created))
+
+    @requests_mock.mock()
+    def test_crash_without_key(self, mock_requests):
+        mock_requests.post('https://api.airtable.com/v0/app12345/TableName', json=self._create)
+        self.crash_on = 'user10@example.com'
+        with self.assertRaises(requests.ConnectionError):
+            self.table.bulk_import(self.rows, self.path)
+        import_journal = journal.ImportJournal(self.path)
+        self.addCleanup(import_journal.close)
+        self.assertEqual(10, len(import_journal.confirmed_keys()))
+        self.assertEqual([10], [len(keys) for unused_id, keys in import_journal.pending_batches()])
+
+        self.crash_on = None
+        self.assertEqual(
+            {'created': 15, 'skipped': 10, 'recovered': 0},
+            self.table.bulk_import(self.rows, import_journal))
+        self.assertEqual([], import_journal.pending_batches())
+        self.assertEqual('recuser24', import_journal.record_ids()['24'])
+        self.assertEqual(self.rows, [{'Email': email} for email in self.created])
+
+    @requests_mock.mock()
+    def test_crash_with_key(self, mock_requests):
+        mock_requests.post('https://api.airtable.com/v0/app12345/TableName', json=self._create)
+        self.crash_on = 'user10@example.com'
+        with self.assertRaises(requests.ConnectionError):
+            self.table.bulk_import(self.rows, self.path, key_field='Email')
+
+        # The first rows of the batch in flight were created after all.
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            {'id': 'recuser%d' % index, 'fields': {'Email': 'user%d@example.com' % index}}
+            for index in (10, 11)]})
+        self.crash_on = None
+        self.assertEqual(
+            {'created': 13, 'skipped': 12, 'recovered': 2},
+            self.table.bulk_import(self.rows, self.path, key_field='Email'))
+        formula = mock_requests.request_history[2].qs['filterbyformula'][0]
+        self.assertTrue(
+            formula.startswith('or({email}="user10@example.com",{email}="user11@example.com"'),
+            msg=formula)
+        self.assertEqual(
+            ['user%d@example.com' % index for index in range(25) if index not in (10, 11)],
+            self.created)
+
+
+class _FakeClock(object):
+
+    def __init__(self):
+        self.now = 100.
+        self.sleeps: List[float] = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestBufferedWriter(unittest.TestCase):
+
+    def setUp(self):
+        super(TestBufferedWriter, self).setUp()
+        self.clock = _FakeClock()
+        self.table = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY).table(FAKE_TABLE_NAME)
+
+    @requests_mock.mock()
+    def test_coalesce(self, mock_requests):
+        mock_requests.patch('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        mock_requests.put('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        mock_requests.delete(
+            'https://api.airtable.com/v0/app12345/TableName', json={'records': []})
+        with self.table.buffered_writer(clock=self.clock) as buffered:
+            buffered.update('rec1', {'Name': 'A', 'Age': 3})
+            buffered.update('rec1', {'Name': 'B'})
+            buffered.update('rec2', {'Name': 'C'})
+            buffered.update_all('rec3', {'Name': 'D'})
+            buffered.update('rec3', {'Age': 4})
+            buffered.delete('rec2')
+            buffered.update('rec2', {'Name': 'E'})
+            self.assertEqual(3, len(buffered))
+            self.assertEqual(0, mock_requests.call_count)
+        self.assertEqual(
+            [
+                ('PATCH', {'records': [{'id': 'rec1', 'fields': {'Name': 'B', 'Age': 3}}]}),
+                ('PUT', {'records': [{'id': 'rec3', 'fields': {'Name': 'D', 'Age': 4}}]}),
+                ('DELETE', None),
+            ],
+            [
+                (request.method, request.json() if request.body else None)
+                for request in mock_requests.request_history])
+        self.assertEqual(['rec2'], mock_requests.last_request.qs['records[]'])
+
+    @requests_mock.mock()
+    def test_thresholds(self, mock_requests):
+        mock_requests.post('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        buffered = writer.BufferedWriter(self.table, max_pending=25, max_delay=5, clock=self.clock)
+        for index in range(24):
+            buffered.create({'Index': index})
+        self.assertEqual(0, mock_requests.call_count)
+        buffered.create({'Index': 24})
+        self.assertEqual([10, 10, 5], [
+            len(request.json()['records']) for request in mock_requests.request_history])
+        buffered.create({'Index': 25})
+        self.clock.now += 5
+        buffered.create({'Index': 26})
+        self.assertEqual(4, mock_requests.call_count)
+        self.assertEqual(0, len(buffered))
+
+    @requests_mock.mock()
+    def test_failures(self, mock_requests):
+        mock_requests.patch(
+            'https://api.airtable.com/v0/app12345/TableName', status_code=422,
+            json={'error': {'type': 'INVALID_VALUE_FOR_COLUMN', 'message': 'Bad'}})
+        mock_requests.post('https://api.airtable.com/v0/app12345/TableName', json=_echo_records)
+        buffered = self.table.buffered_writer(max_delay=None)
+        buffered.update('rec1', {'Age': 'old'})
+        buffered.create({'Name': 'A'})
+        failures = buffered.flush()
+        self.assertEqual(['POST', 'PATCH'], [r.method for r in mock_requests.request_history])
+        self.assertEqual([('PATCH', [('rec1', {'Age': 'old'})])], [
+            (failure.method, failure.records) for failure in failures])
+        self.assertIsInstance(failures[0].error, airtable.AirtableError)
+        self.assertEqual(failures, buffered.failures)
+        self.assertEqual([], buffered.flush())
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        super(TestRateLimiter, self).setUp()
+        self.clock = _FakeClock()
+        self.limiter = airtable.RateLimiter(clock=self.clock, sleep=self.clock.sleep)
+
+    def test_paces_requests(self):
+        for unused_index in range(6):
+            self.limiter.acquire()
+        self.assertEqual([.2] * 5, [round(sleep, 3) for sleep in self.clock.sleeps])
+        self.assertEqual(6, self.limiter.requests)
+        self.assertAlmostEqual(1., self.limiter.wait_time)
+        self.assertAlmostEqual(6., self.limiter.throughput())
+
+    def test_no_wait_when_slow(self):
+        for unused_index in range(3):
+            self.assertEqual(0, self.limiter.acquire())
+            self.clock.now += 1
+        self.assertEqual([], self.clock.sleeps)
+
+    def test_burst(self):
+        limiter = airtable.RateLimiter(rate=2, burst=3, clock=self.clock, sleep=self.clock.sleep)
+        self.clock.now += 10
+        for unused_index in range(4):
+            limiter.acquire()
+        self.assertEqual([.5], self.clock.sleeps)
+
+    def test_thread_safe(self):
+        waits: List[float] = []
+        limiter = airtable.RateLimiter(clock=self.clock, sleep=lambda seconds: None)
+        threads = [
+            threading.Thread(target=lambda: waits.append(limiter.acquire())) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([0, .2, .4, .6, .8, 1., 1.2, 1.4, 1.6, 1.8], sorted(
+            round(wait, 3) for wait in waits))
+
+    def test_shared_by_base(self):
+        first = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, rate_limiter=True)
+        second = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, rate_limiter=True)
+        other = airtable.Airtable('appOther', FAKE_API_KEY, rate_limiter=True)
+        self.assertIs(first.rate_limiter, second.rate_limiter)
+        self.assertIsNot(first.rate_limiter, other.rate_limiter)
+        self.assertIsNone(airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY).rate_limiter)
+
+    @requests_mock.mock()
+    def test_pauses_after_too_many_requests(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', [
+            {'status_code': 429, 'json': {'errors': {'type': 'TOO_MANY_REQUESTS'}}},
+            {'json': {'records': []}},
+        ])
+        client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, rate_limiter=self.limiter)
+        with self.assertRaises(airtable.AirtableError):
+            client.get(FAKE_TABLE_NAME)
+        client.get(FAKE_TABLE_NAME)
+        self.assertEqual([30], self.clock.sleeps)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        super(TestRetryPolicy, self).setUp()
+        self.clock = _FakeClock()
+        self.retried: List[Any] = []
+        self.policy = airtable.RetryPolicy(
+            max_attempts=3, jitter=False, sleep=self.clock.sleep,
+            on_retry=lambda *args: self.retried.append(args))
+        self.airtable = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, retry_policy=self.policy)
+
+    @requests_mock.mock()
+    def test_retry_transient_errors(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName/rec1', [
+            {'status_code': 503, 'json': {}},
+            {'exc': requests.ConnectionError},
+            {'json': {'id': 'rec1'}},
+        ])
+        self.assertEqual('rec1', self.airtable.get(FAKE_TABLE_NAME, 'rec1')['id'])
+        self.assertEqual([.5, 1.], self.clock.sleeps)
+        self.assertEqual(2, self.policy.retries)
+        self.assertEqual(1.5, self.policy.backoff_time)
+        self.assertEqual(
+            [('GET', 'https://api.airtable.com/v0/app12345/TableName/rec1', 1, .5),
+             ('GET', 'https://api.airtable.com/v0/app12345/TableName/rec1', 2, 1.)],
+            self.retried)
+
+    @requests_mock.mock()
+    def test_give_up(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName/rec1', status_code=502,
+            json={'error': {'type': 'BAD_GATEWAY'}})
+        with self.assertRaises(airtable.AirtableError) as error:
+            self.airtable.get(FAKE_TABLE_NAME, 'rec1')
+        self.assertEqual('BAD_GATEWAY', error.exception.type)
+        self.assertEqual(3, mock_requests.call_count)
+
+    @requests_mock.mock()
+    def test_no_retry_of_other_errors(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName/rec1', status_code=404, json={})
+        with self.assertRaises(airtable.AirtableError):
+            self.airtable.get(FAKE_TABLE_NAME, 'rec1')
+        self.assertEqual(1, mock_requests.call_count)
+
+    @requests_mock.mock()
+    def test_retry_after(self, mock_requests):
+        mock_requests.delete('https://api.airtable.com/v0/app12345/TableName/rec1', [
+            {'status_code': 429, 'json': {}, 'headers': {'Retry-After': '7'}},
+            {'json': {'id': 'rec1', 'deleted': True}},
+        ])
+        self.airtable.delete(FAKE_TABLE_NAME, 'rec1')
+        self.assertEqual([7.], self.clock.sleeps)
+
+    @requests_mock.mock()
+    def test_post_not_retried_by_default(self, mock_requests):
+        mock_requests.post(
+            'https://api.airtable.com/v0/app12345/TableName', status_code=503, json={})
+        with self.assertRaises(airtable.AirtableError):
+            self.airtable.create(FAKE_TABLE_NAME, {})
+        self.assertEqual(1, mock_requests.call_count)
+
+        self.airtable.retry_policy = airtable.RetryPolicy(
+            methods=airtable.IDEMPOTENT_METHODS | {'POST'}, sleep=self.clock.sleep)
+        with self.assertRaises(airtable.AirtableError):
+            self.airtable.create(FAKE_TABLE_NAME, {})
+        self.assertEqual(6, mock_requests.call_count)
+
+    def test_jitter_and_cap(self):
+        policy = airtable.RetryPolicy(backoff_cap=3, random_func=lambda: .5)
+        self.assertEqual([.25, .5, 1., 1.5, 1.5], [policy.get_delay(a) for a in range(1, 6)])
+
+    @requests_mock.mock()
+    def test_iterate_resumes_from_offset(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName',
+            json={'records': [{'id': 'rec1'}], 'offset': 'itr1'})
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName?offset=itr1', [
+                {'status_code': 503, 'json': {}},
+                {'json': {'records': [{'id': 'rec2'}]}},
+            ])
+        self.airtable.retry_policy = None
+        records = self.airtable.iterate(FAKE_TABLE_NAME)
+        self.assertEqual('rec1', next(records)['id'])
+        with self.assertRaises(airtable.AirtableError) as error:
+            next(records)
+        self.assertEqual('itr1', error.exception.offset)
+
+        resumed = self.airtable.iterate(FAKE_TABLE_NAME, offset=error.exception.offset)
+        self.assertEqual(['rec2'], [record['id'] for record in resumed])
+
+
+class TestAsyncAirtable(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        await super(TestAsyncAirtable, self).asyncSetUp()
+        self.requests: List[web.Request] = []
+        self.running = 0
+        self.max_running = 0
+        app = web.Application()
+        app.router.add_route('*', '/v0/app12345/{table}', self._handle)
+        app.router.add_route('*', '/v0/app12345/{table}/{record_id}', self._handle)
+        self.server = test_utils.TestServer(app)
+        await self.server.start_server()
+        self.airtable = aio.AsyncAirtable(FAKE_BASE_ID, FAKE_API_KEY, max_concurrency=2)
+        self.airtable.base_url = str(self.server.make_url('/v0/app12345'))
+
+    async def asyncTearDown(self):
+        await self.airtable.close()
+        await self.server.close()
+        await super(TestAsyncAirtable, self).asyncTearDown()
+
+    async def _handle(self, request):
+        self.requests.append(request)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(.01)
+        self.running -= 1
+        record_id = request.match_info.get('record_id')
+        if request.match_info['table'] == 'Limited':
+            return web.json_response({'error': {'type': 'RATE_LIMIT_REACHED'}}, status=429)
+        if request.match_info['table'] == 'Missing':
+            return web.json_response({'error': {
+                'type': 'TABLE_NOT_FOUND', 'message': 'Could not find table'}}, status=404)
+        if request.method == 'GET' and not record_id:
+            if request.query.get('offset') == 'itr1':
+                return web.json_response({'records': [{'id': 'rec2'}]})
+            return web.json_response({'records': [{'id': 'rec1'}], 'offset': 'itr1'})
+        if request.method == 'DELETE':
+            return web.json_response({'id': record_id, 'deleted': True})
+        body = await request.json() if request.can_read_body else {}
+        return web.json_response(dict(body, id=record_id or 'recNew'))
+
+    async def test_get(self):
+        table = self.airtable.table(FAKE_TABLE_NAME)
+        record = await table.get('rec1')
+        self.assertEqual('rec1', record['id'])
+        self.assertEqual('Bearer fake_api_key', self.requests[0].headers['Authorization'])
+        page = await table.get(fields=['Name'], limit=10)
+        self.assertEqual(['rec1'], [record['id'] for record in page['records']])
+        self.assertEqual(['Name', 'Name'], self.requests[1].query.getall('fields'))
+        self.assertEqual('10', self.requests[1].query['pageSize'])
+
+    async def test_iterate(self):
+        records = [record async for record in self.airtable.iterate(FAKE_TABLE_NAME)]
+        self.assertEqual(['rec1', 'rec2'], [record['id'] for record in records])
+
+    async def test_writes(self):
+        table = self.airtable.table(FAKE_TABLE_NAME)
+        created = await table.create({'Name': 'A'})
+        self.assertEqual({'id': 'recNew', 'fields': {'Name': 'A'}}, created)
+        updated = await table.update('rec1', {'Name': 'B'})
+        self.assertEqual('PATCH', self.requests[-1].method)
+        self.assertEqual({'id': 'rec1', 'fields': {'Name': 'B'}}, updated)
+        await table.update_all('rec1', {'Name': 'C'})
+        self.assertEqual('PUT', self.requests[-1].method)
+        self.assertTrue((await table.delete('rec1'))['deleted'])
+
+    async def test_error(self):
+        with self.assertRaises(airtable.AirtableError) as error:
+            await self.airtable.get('Missing')
+        self.assertEqual('TABLE_NOT_FOUND', error.exception.type)
+
+    async def test_rate_limit_reached(self):
+        rate_limiter = airtable.RateLimiter(rate=1000)
+        client = aio.AsyncAirtable(FAKE_BASE_ID, FAKE_API_KEY, rate_limiter=rate_limiter)
+        client.base_url = self.airtable.base_url
+        self.addAsyncCleanup(client.close)
+        with self.assertRaises(airtable.AirtableError):
+            await client.get('Limited')
+        # The shared limiter holds back the other clients of the base.
+        self.assertGreater(rate_limiter.reserve(), airtable.RATE_LIMIT_PENALTY - 1)
+
+    async def test_bounded_concurrency(self):
+        await asyncio.gather(*[
+            self.airtable.table('Table%d' % (index % 3)).create({'Index': index})
+            for index in range(10)])
+        self.assertEqual(10, len(self.requests))
+        self.assertEqual(2, self.max_running)
+
+
+class _RecordingObserver(object):
+
+    def __init__(self):
+        self.calls: List[Any] = []
+
+    def before_request(self, event):
+        self.calls.append(('before', event.operation, event.latency))
+
+    def after_request(self, event):
+        self.calls.append(('after', event.operation, event.status_code))
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        super(TestMetrics, self).setUp()
+        self.collector = metrics.MetricsCollector(buckets=(.1, 1.))
+        self.observer = _RecordingObserver()
+        self.policy = airtable.RetryPolicy(jitter=False, sleep=lambda unused_seconds: None)
+        self.airtable = airtable.Airtable(
+            FAKE_BASE_ID, FAKE_API_KEY, retry_policy=self.policy,
+            observers=[self.collector, self.observer])
+
+    @requests_mock.mock()
+    def test_collect(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName', json=_paginated_records)
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName/rec1', [
+            {'status_code': 503, 'json': {}},
+            {'json': {'id': 'rec1'}},
+        ])
+        mock_requests.post(
+            'https://api.airtable.com/v0/app12345/TableName', status_code=422,
+            json={'error': {'type': 'INVALID_REQUEST_UNKNOWN'}})
+        self.assertEqual(20, len(list(self.airtable.iterate(FAKE_TABLE_NAME))))
+        self.airtable.get(FAKE_TABLE_NAME, 'rec1')
+        with self.assertRaises(airtable.AirtableError):
+            self.airtable.create(FAKE_TABLE_NAME, {'Name': 'A'})
+
+        snapshot = self.collector.snapshot()
+        self.assertEqual({
+            (FAKE_TABLE_NAME, 'list'), (FAKE_TABLE_NAME, 'get'), (FAKE_TABLE_NAME, 'create'),
+        }, set(snapshot))
+        pages = snapshot[(FAKE_TABLE_NAME, 'list')]
+        self.assertEqual(10, pages['count'])
+        self.assertEqual(10, sum(pages['histogram'].values()))
+        self.assertEqual([.1, 1., float('inf')], list(pages['histogram']))
+        self.assertGreater(pages['bytes_received'], 0)
+        self.assertEqual(1, snapshot[(FAKE_TABLE_NAME, 'get')]['retries'])
+        create = snapshot[(FAKE_TABLE_NAME, 'create')]
+        self.assertEqual((1, 1), (create['count'], create['errors']))
+        self.assertEqual(len('{"fields":{"Name":"A"}}'), create['bytes_sent'])
+        self.assertEqual(
+            [('before', 'create', None), ('after', 'create', 422)], self.observer.calls[-2:])
+
+    @requests_mock.mock()
+    def test_bytes_received_compressed(self, mock_requests):
+        body = gzip.compress(b'{"records": [{"id": "rec1"}, {"id": "rec2"}]}')
+        with_length = {'Content-Encoding': 'gzip', 'Content-Length': str(len(body))}
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', [
+            {'content': body, 'headers': headers}
+            for headers in (with_length, with_length, {'Content-Encoding': 'gzip'})])
+        # The size is the same whether streamed or not, and unknown without Content-Length.
+        for stream in (False, True, False):
+            self.assertEqual(2, len(list(self.airtable.iterate(FAKE_TABLE_NAME, stream=stream))))
+        pages = self.collector.snapshot()[(FAKE_TABLE_NAME, 'list')]
+        self.assertEqual(2 * len(body), pages['bytes_received'])
+
+    @requests_mock.mock()
+    def test_schema_request(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/meta/bases/app12345/tables', json={
+            'tables': [{'id': 'tbl1', 'name': FAKE_TABLE_NAME, 'fields': []}]})
+        self.assertEqual({}, self.airtable.get_schema(FAKE_TABLE_NAME))
+        self.assertEqual([(None, 'schema')], list(self.collector.snapshot()))
+
+    @requests_mock.mock()
+    def test_log(self, mock_requests):
+        mock_requests.delete(
+            'https://api.airtable.com/v0/app12345/TableName/rec1',
+            json={'id': 'rec1', 'deleted': True})
+        self.airtable.delete(FAKE_TABLE_NAME, 'rec1')
+        with self.assertLogs('airtable.metrics') as logs:
+            self.collector.log()
+        self.assertEqual(1, len(logs.output))
+        self.assertIn('TableName delete: 1 requests, 0 errors', logs.output[0])
+        self.collector.reset()
+        self.assertEqual({}, self.collector.snapshot())
+
+    @requests_mock.mock()
+    def test_open_telemetry(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName/rec1', json={'id': 'rec1'})
+        meter = mock.MagicMock()
+        client = airtable.Airtable(
+            FAKE_BASE_ID, FAKE_API_KEY, observers=[metrics.OpenTelemetryObserver(meter)])
+        client.get(FAKE_TABLE_NAME, 'rec1')
+        histogram = meter.create_histogram.return_value
+        histogram.record.assert_called_once_with(mock.ANY, {
+            'airtable.table': FAKE_TABLE_NAME,
+            'airtable.operation': 'get',
+            'http.status_code': 200,
+        })
+
+
+def _paginated_records(request, unused_context):
+    page = int(request.qs.get('offset', ['0'])[0])
+    response: Dict[str, Any] = {'records': [{'id': 'rec%d_%d' % (page, i)} for i in range(2)]}
+    if page < 9:
+        response['offset'] = str(page + 1)
+    return response
+
+
+class TestCoalesceReads(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCoalesceReads, self).setUp()
+        self.airtable = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, coalesce_reads=True)
+
+    def _get_concurrently(self, num_threads, *args):
+        results: List[Any] = [None] * num_threads
+        barrier = threading.Barrier(num_threads)
+
+        def _get(index):
+            barrier.wait()
+            try:
+                results[index] = self.airtable.get(FAKE_TABLE_NAME, *args)
+            except airtable.AirtableError as error:
+                results[index] = error
+
+        threads = [threading.Thread(target=_get, args=(index,)) for index in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    @staticmethod
+    def _slow_record(unused_request, unused_context):
+        time.sleep(.2)
+        return {'id': 'rec1', 'fields': {'Tags': ['a']}}
+
+    @requests_mock.mock()
+    def test_coalesce(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName/rec1', json=self._slow_record)
+        records = self._get_concurrently(5, 'rec1')
+        self.assertEqual(1, mock_requests.call_count)
+        self.assertEqual(4, self.airtable.coalesced_reads)
+        self.assertEqual([['a']] * 5, [record['fields']['Tags'] for record in records])
+        records[0]['fields']['Tags'].append('b')
+        self.assertEqual(['a'], records[1]['fields']['Tags'])
+        # The next read is sent again.
+        self.airtable.get(FAKE_TABLE_NAME, 'rec1')
+        self.assertEqual(2, mock_requests.call_count)
+
+    @requests_mock.mock()
+    def test_coalesce_errors(self, mock_requests):
+        def _slow_error(unused_request, context):
+            time.sleep(.2)
+            context.status_code = 404
+            return {'error': {'type': 'NOT_FOUND'}}
+
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName/rec1', json=_slow_error)
+        errors = self._get_concurrently(3, 'rec1')
+        self.assertEqual(1, mock_requests.call_count)
+        self.assertTrue(all(isinstance(error, airtable.AirtableError) for error in errors))
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        super(TestPrefetch, self).setUp()
+        self.airtable = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY)
+
+    def _wait_for_threads(self):
+        for unused_index in range(50):
+            if not any(t.name.startswith('airtable-') for t in threading.enumerate()):
+                return
+            time.sleep(.05)
+        self.fail('Background threads are still running')
+
+    @requests_mock.mock()
+    def test_same_records(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_paginated_records)
+        self.assertEqual(
+            list(self.airtable.iterate(FAKE_TABLE_NAME)),
+            list(self.airtable.iterate(FAKE_TABLE_NAME, prefetch=2)))
+        self._wait_for_threads()
+
+    @requests_mock.mock()
+    def test_bounded_and_closed_early(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_paginated_records)
+        records = self.airtable.table(FAKE_TABLE_NAME).iterate(prefetch=1)
+        self.assertEqual('rec0_0', next(records)['id'])
+        time.sleep(.1)
+        self.assertLessEqual(mock_requests.call_count, 3)
+        records.close()
+        self._wait_for_threads()
+        self.assertLessEqual(mock_requests.call_count, 3)
+
+    @requests_mock.mock()
+    def test_error(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName',
+            json={'records': [{'id': 'rec1'}], 'offset': 'itr1'})
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName?offset=itr1', status_code=422,
+            json={'error': {'type': 'LIST_RECORDS_ITERATOR_NOT_AVAILABLE'}})
+        records = self.airtable.iterate(FAKE_TABLE_NAME, prefetch=3)
+        self.assertEqual('rec1', next(records)['id'])
+        with self.assertRaises(airtable.AirtableError) as error:
+            next(records)
+        self.assertEqual('itr1', error.exception.offset)
+        self._wait_for_threads()
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCache, self).setUp()
+        self.clock = _FakeClock()
+        self.cache = cache.MemoryCache(max_size=3, ttl=10, clock=self.clock)
+        self.table = airtable.Airtable(
+            FAKE_BASE_ID, FAKE_API_KEY, cache=self.cache).table(FAKE_TABLE_NAME)
+
+    @requests_mock.mock()
+    def test_get(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName/rec1',
+            json={'id': 'rec1', 'fields': {'Name': 'A'}})
+        self.table.get('rec1')['fields']['Name'] = 'Modified'
+        self.assertEqual('A', self.table.get('rec1')['fields']['Name'])
+        self.assertEqual(1, mock_requests.call_count)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+        self.clock.now += 11
+        self.table.get('rec1')
+        self.assertEqual(2, mock_requests.call_count)
+
+    @requests_mock.mock()
+    def test_iterate(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_paginated_records)
+        records = list(self.table.iterate())
+        self.assertEqual(10, mock_requests.call_count)
+        self.assertEqual(records, list(self.table.iterate()))
+        self.assertEqual(10, mock_requests.call_count)
+        self.assertEqual(1, len(self.cache), msg='Only the whole iteration is cached')
+
+        list(self.table.iterate(fields=['Name']))
+        self.assertEqual(20, mock_requests.call_count)
+
+    @requests_mock.mock()
+    def test_partial_iterate_not_cached(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_paginated_records)
+        next(self.table.iterate())
+        self.assertEqual(0, len(self.cache))
+
+    @requests_mock.mock()
+    def test_writes_invalidate(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName/rec1', json={'id': 'rec1'})
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/Other/rec1', json={'id': 'rec1'})
+        mock_requests.patch(
+            'https://api.airtable.com/v0/app12345/TableName/rec1', json={'id': 'rec1'})
+        self.table.get('rec1')
+        self.table._client.get('Other', 'rec1')
+        self.table.update('rec1', {'Name': 'B'})
+        self.assertEqual(1, len(self.cache))
+        self.table.get('rec1')
+        self.assertEqual(4, mock_requests.call_count)
+
+    @requests_mock.mock()
+    def test_update_while_iterating(self, mock_requests):
+        statuses = {'rec1': 'old', 'rec2': 'old'}
+
+        def _list(unused_request, unused_context):
+            return {'records': [
+                {'id': record_id, 'fields': {'S': status}}
+                for record_id, status in statuses.items()]}
+
+        def _update(request, unused_context):
+            record_id = request.path.rsplit('/', 1)[-1]
+            statuses[record_id] = request.json()['fields']['S']
+            return {'id': record_id, 'fields': {'S': statuses[record_id]}}
+
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_list)
+        mock_requests.patch(requests_mock.ANY, json=_update)
+        for record in self.table.iterate():
+            self.table.update(record['id'], {'S': 'new'})
+        self.assertEqual(
+            ['new', 'new'], [record['fields']['S'] for record in self.table.iterate()])
+
+    def test_lru_eviction(self):
+        for key in 'abc':
+            self.cache.set(FAKE_TABLE_NAME, key, '1')
+        self.cache.get(FAKE_TABLE_NAME, 'a')
+        self.cache.set(FAKE_TABLE_NAME, 'd', '1')
+        self.assertIsNone(self.cache.get(FAKE_TABLE_NAME, 'b'))
+        self.assertEqual('1', self.cache.get(FAKE_TABLE_NAME, 'a'))
+        self.assertEqual(1, self.cache.evictions)
+
+    def test_sqlite(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'cache.db')
+            first = cache.SqliteCache(path, max_size=2, clock=self.clock)
+            second = cache.SqliteCache(path, max_size=2, clock=self.clock)
+            first.set(FAKE_TABLE_NAME, 'a', '"A"')
+            self.clock.now += 1
+            first.set(FAKE_TABLE_NAME, 'b', '"B"')
+            self.clock.now += 1
+            self.assertEqual('"A"', second.get(FAKE_TABLE_NAME, 'a'))
+            self.clock.now += 1
+            second.set('Other', 'c', '"C"')
+            self.assertEqual(1, second.evictions)
+            self.assertIsNone(first.get(FAKE_TABLE_NAME, 'b'), msg='Least recently used')
+            first.invalidate('Other')
+            self.assertEqual(1, len(second))
+            self.clock.now += 61
+            self.assertIsNone(first.get(FAKE_TABLE_NAME, 'a'))
+            self.assertEqual(2, first.misses)
+            first.close()
+            second.close()
+
+
+class TestSync(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSync, self).setUp()
+        self.table = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY).table(FAKE_TABLE_NAME)
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.store_path = os.path.join(tmp_dir.name, 'watermarks.json')
+
+    @staticmethod
+    def _record(record_id, modified):
+        return {'id': record_id, 'fields': {'Modified': modified}}
+
+    def test_changes_formula(self):
+        self.assertEqual(
+            "IS_AFTER({Modified}, DATETIME_PARSE('2026-10-18T09:59:00.000Z'))",
+            airtable.sync.changes_formula('Modified', '2026-10-18T10:00:00.000Z'))
+
+    @requests_mock.mock()
+    def test_iterate_changes(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            self._record('rec1', '2026-10-18T10:00:00.000Z'),
+            self._record('rec2', '2026-10-18T10:00:05.000Z'),
+            self._record('rec1', '2026-10-18T10:00:00.000Z'),
+        ]})
+        seen = {'rec2': '2026-10-18T10:00:05.000Z'}
+        changes = list(self.table.iterate_changes(
+            '2026-10-18T10:00:00Z', 'Modified', overlap=0, seen=seen,
+            filter_by_formula='{Active}', fields=['Name']))
+        self.assertEqual(['rec1'], [record['id'] for record in changes])
+        query = mock_requests.last_request.qs
+        self.assertEqual(
+            ["and({active}, is_after({modified}, datetime_parse('2026-10-18t10:00:00.000z')))"],
+            query['filterbyformula'])
+        self.assertEqual(['name', 'modified'], query['fields'])
+        self.assertEqual({'rec1', 'rec2'}, set(seen))
+
+    @requests_mock.mock()
+    def test_sync(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', [
+            {'json': {'records': [
+                self._record('rec1', '2026-10-18T10:00:00.000Z'),
+                self._record('rec2', '2026-10-18T10:05:00.000Z'),
+            ]}},
+            {'json': {'records': [
+                self._record('rec2', '2026-10-18T10:05:00.000Z'),
+                self._record('rec3', '2026-10-18T10:04:30.000Z'),
+            ]}},
+        ])
+        first = list(self.table.sync(self.store_path, 'Modified'))
+        self.assertEqual(['rec1', 'rec2'], [record['id'] for record in first])
+        self.assertNotIn('filterByFormula', mock_requests.last_request.url)
+        watermark = airtable.sync.FileWatermarkStore(self.store_path).get(FAKE_TABLE_NAME)
+        self.assertEqual({
+            'since': '2026-10-18T10:05:00.000Z',
+            'seen': {'rec2': '2026-10-18T10:05:00.000Z'},
+        }, watermark)
+
+        second = list(self.table.sync(self.store_path, 'Modified'))
+        self.assertEqual(['rec3'], [record['id'] for record in second])
+        self.assertEqual(
+            ["is_after({modified}, datetime_parse('2026-10-18t10:04:00.000z'))"],
+            mock_requests.last_request.qs['filterbyformula'])
+
+    @requests_mock.mock()
+    def test_interrupted_sync_is_not_saved(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            self._record('rec1', '2026-10-18T10:00:00.000Z'),
+            self._record('rec2', '2026-10-18T10:05:00.000Z'),
+        ]})
+        store = airtable.sync.FileWatermarkStore(self.store_path)
+        next(self.table.sync(store, 'Modified', key='my-sync'))
+        self.assertIsNone(store.get('my-sync'))
+
+
+class TestTableMirror(unittest.TestCase):
+
+    def setUp(self):
+        super(TestTableMirror, self).setUp()
+        self.table = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY).table(FAKE_TABLE_NAME)
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, 'mirror.db')
+
+    def _check_mirror(self, mirror_path):
+        with requests_mock.Mocker() as mock_requests:
+            mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+                {'id': 'rec1', 'fields': {'Email': 'a@example.com', 'Tags': ['x']}},
+                {'id': 'rec2', 'fields': {'Email': 'b@example.com', 'Tags': ['x']}},
+            ]})
+            mock_requests.patch(
+                'https://api.airtable.com/v0/app12345/TableName/rec1',
+                json={'id': 'rec1', 'fields': {'Email': 'c@example.com'}})
+            mock_requests.delete(
+                'https://api.airtable.com/v0/app12345/TableName/rec2',
+                json={'id': 'rec2', 'deleted': True})
+            table_mirror = mirror.TableMirror(
+                self.table, index_fields=['Email', 'Tags'], path=mirror_path)
+            table_mirror.load()
+            self.assertEqual(2, len(table_mirror))
+            self.assertEqual('rec2', table_mirror.find_one('Email', 'b@example.com')['id'])
+            self.assertEqual(
+                ['rec1', 'rec2'], [record['id'] for record in table_mirror.find('Tags', ['x'])])
+            self.assertIsNone(table_mirror.find_one('Email', 'z@example.com'))
+            with self.assertRaises(KeyError):
+                table_mirror.find('Name', 'A')
+
+            table_mirror.update('rec1', {'Email': 'c@example.com'})
+            table_mirror.delete('rec2')
+            self.assertEqual(3, mock_requests.call_count)
+            self.assertIsNone(table_mirror.find_one('Email', 'a@example.com'))
+            self.assertEqual('rec1', table_mirror.find_one('Email', 'c@example.com')['id'])
+            self.assertNotIn('rec2', table_mirror)
+            self.assertEqual(['rec1'], [record['id'] for record in table_mirror])
+            table_mirror.close()
+
+    def test_memory(self):
+        self._check_mirror(None)
+
+    def test_sqlite(self):
+        self._check_mirror(self.path)
+
+    def test_sqlite_compact_records(self):
+        self.table = airtable.Airtable(
+            FAKE_BASE_ID, FAKE_API_KEY, compact_records=True).table(FAKE_TABLE_NAME)
+        self._check_mirror(self.path)
+
+    @requests_mock.mock()
+    def test_sqlite_load_in_batches(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            {'id': 'rec%d' % index, 'fields': {'Email': '%d@example.com' % index}}
+            for index in range(2500)]})
+        table_mirror = mirror.TableMirror(self.table, index_fields=['Email'], path=self.path)
+        self.addCleanup(table_mirror.close)
+        with mock.patch.object(
+                mirror._SqliteStore, 'put_many', autospec=True,
+                side_effect=mirror._SqliteStore.put_many) as put_many:
+            table_mirror.load()
+        self.assertEqual([1000, 1000, 500], [len(call[0][1]) for call in put_many.call_args_list])
+        self.assertEqual(2500, len(table_mirror))
+        self.assertEqual('rec2499', table_mirror.find_one('Email', '2499@example.com')['id'])
+
+    @requests_mock.mock()
+    def test_incremental_refresh(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', [
+            {'json': {'records': [
+                {'id': 'rec1', 'fields': {'Email': 'a', 'Modified': '2026-10-18T10:00:00.000Z'}},
+                {'id': 'rec2', 'fields': {'Email': 'b', 'Modified': '2026-10-18T10:05:00.000Z'}},
+            ]}},
+            {'json': {'records': [
+                {'id': 'rec2', 'fields': {'Email': 'b', 'Modified': '2026-10-18T10:05:00.000Z'}},
+                {'id': 'rec1', 'fields': {'Email': 'c', 'Modified': '2026-10-18T10:06:00.000Z'}},
+            ]}},
+        ])
+        table_mirror = mirror.TableMirror(self.table, ['Email'], modified_field='Modified')
+        table_mirror.load()
+        table_mirror.refresh()
+        self.assertIn('is_after', mock_requests.last_request.qs['filterbyformula'][0])
+        self.assertEqual('rec1', table_mirror.find_one('Email', 'c')['id'])
+        self.assertIsNone(table_mirror.find_one('Email', 'a'))
+        self.assertEqual(2, len(table_mirror))
+
+
+_WIDE_PAGE = {
+    'records': [
+        {
+            'id': 'rec%d' % index,
+            'createdTime': '2026-10-18T10:00:00.000Z',
+            'fields': {
+                'Name': u'Ren\u00e9e \u2603 %d' % index,
+                'Notes': 'x' * 50 + '\\"' * index,
+                'Tags': [{'a': [1, 2.5, None]}, True, False],
+                'Count': index * 1000,
+            },
+        }
+        for index in range(5)
+    ],
+    'offset': 'itr1',
+}
+
+
+_TYPED_RECORD = {
+    'id': 'rec1',
+    'createdTime': '2016-09-12T10:02:01.000Z',
+    'fields': {
+        'Name': 'Jane',
+        'Due': '2026-10-18',
+        'Price': 12.3,
+        'Files': [{'id': 'att1', 'url': 'https://dl.airtable.com/a.png', 'size': 12}],
+        'Updates': ['2026-10-18T10:00:00.000Z'],
+    },
+}
+
+
+class TestSchema(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSchema, self).setUp()
+        self.client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY)
+
+    def test_convert(self):
+        converter = schema.compile_schema({
+            'Due': 'date', 'Price': 'currency', 'Files': 'multipleAttachments',
+            'Updates': schema.ListOf('dateTime'), 'Name': str.upper})
+        record = converter(_TYPED_RECORD)
+        self.assertEqual(
+            datetime.datetime(2016, 9, 12, 10, 2, 1, tzinfo=datetime.timezone.utc),
+            record['createdTime'])
+        fields = record['fields']
+        self.assertEqual(datetime.date(2026, 10, 18), fields['Due'])
+        self.assertEqual(decimal.Decimal('12.3'), fields['Price'])
+        self.assertEqual('https://dl.airtable.com/a.png', fields['Files'][0].url)
+        self.assertIsNone(fields['Files'][0].filename)
+        self.assertEqual(10, fields['Updates'][0].hour)
+        self.assertEqual('JANE', fields['Name'])
+        self.assertEqual('2026-10-18', _TYPED_RECORD['fields']['Due'])
+
+    def test_formula_errors(self):
+        converter = schema.compile_schema(schema.from_metadata([
+            {'name': 'Price', 'type': 'formula', 'options': {'result': {'type': 'number'}}},
+            {'name': 'Due', 'type': 'rollup', 'options': {'result': {'type': 'date'}}},
+            {'name': 'Updates', 'type': 'multipleLookupValues',
+             'options': {'result': {'type': 'dateTime'}}},
+        ]))
+        fields = converter({'id': 'rec1', 'fields': {
+            'Price': {'specialValue': 'NaN'}, 'Due': {'error': '#ERROR!'},
+            'Updates': [{'error': '#ERROR!'}, '2026-10-18T10:00:00.000Z']}})['fields']
+        self.assertEqual({'specialValue': 'NaN'}, fields['Price'])
+        self.assertEqual({'error': '#ERROR!'}, dict(fields)['Due'])
+        self.assertEqual({'error': '#ERROR!'}, fields['Updates'][0])
+        self.assertEqual(2026, fields['Updates'][1].year)
+        self.assertIn('#ERROR!', repr(fields))
+
+    def test_lazy_and_cached(self):
+        convert = mock.MagicMock(return_value='converted')
+        converter = schema.compile_schema({'Name': convert})
+        self.assertIs(converter, schema.compile_schema({'Name': convert}))
+        fields = converter(_TYPED_RECORD)['fields']
+        self.assertEqual(5, len(fields))
+        self.assertEqual(12.3, fields['Price'])
+        convert.assert_not_called()
+        self.assertEqual('converted', fields['Name'])
+        self.assertEqual('converted', fields['Name'])
+        convert.assert_called_once_with('Jane')
+
+    @requests_mock.mock()
+    def test_table_schema_from_metadata(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/meta/bases/app12345/tables', json={
+            'tables': [{'id': 'tbl1', 'name': FAKE_TABLE_NAME, 'fields': [
+                {'name': 'Name', 'type': 'singleLineText'},
+                {'name': 'Price', 'type': 'formula', 'options': {'result': {'type': 'number'}}},
+                {'name': 'Updates', 'type': 'multipleLookupValues',
+                 'options': {'result': {'type': 'dateTime'}}},
+            ]}]})
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName', json={'records': [_TYPED_RECORD]})
+        table = self.client.table(FAKE_TABLE_NAME, schema=True)
+        self.assertEqual(
+            {'Name': 'singleLineText', 'Price': 'number', 'Updates': schema.ListOf('dateTime')},
+            self.client.get_schema('tbl1'))
+        records = list(table.iterate())
+        records += table.get()['records']
+        self.assertEqual(
+            [decimal.Decimal('12.3')] * 2, [record['fields']['Price'] for record in records])
+        self.assertEqual('2026-10-18', records[0]['fields']['Due'])
+        self.assertEqual(4, mock_requests.call_count, msg='The schema is read once per table')
+        with self.assertRaises(KeyError):
+            self.client.get_schema('Unknown')
+
+    @requests_mock.mock()
+    def test_mirror_of_typed_table(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            {'id': 'rec1', 'fields': {'Born': '1990-01-02'}}]})
+        table = self.client.table(FAKE_TABLE_NAME, schema={'Born': 'date'})
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        for path in (None, os.path.join(tmp_dir.name, 'mirror.db')):
+            table_mirror = mirror.TableMirror(table, index_fields=['Born'], path=path)
+            table_mirror.load()
+            self.assertEqual('rec1', table_mirror.find_one('Born', '1990-01-02')['id'])
+            table_mirror.close()
+
+    @requests_mock.mock()
+    def test_expand_typed_records(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            {'id': 'rec1', 'fields': {'Due': '2026-10-18', 'Customer': ['cus1']}}]})
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/Customer',
+            json={'records': [{'id': 'cus1', 'fields': {'Name': 'Jane'}}]})
+        table = self.client.table(FAKE_TABLE_NAME, schema={'Due': 'date'})
+        records = table.expand(list(table.iterate()), ['Customer'])
+        self.assertEqual('Jane', records[0]['fields']['Customer'][0]['fields']['Name'])
+        self.assertEqual(datetime.date(2026, 10, 18), records[0]['fields']['Due'])
+
+    def test_copy_typed_fields(self):
+        fields = schema.compile_schema({'Due': 'date'})(_TYPED_RECORD)['fields']
+        copy = fields.copy()
+        copy['Due'] = None
+        self.assertEqual(datetime.date(2026, 10, 18), fields['Due'])
+        self.assertEqual(set(fields), set(copy))
+
+
+class TestStream(unittest.TestCase):
+
+    def setUp(self):
+        super(TestStream, self).setUp()
+        self.airtable = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY)
+        patcher = mock.patch('airtable._STREAM_CHUNK_SIZE', 7)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @requests_mock.mock()
+    def test_same_records(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName',
+            content=json.dumps(_WIDE_PAGE, indent=2).encode('utf-8'))
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName?offset=itr1',
+            text='{"other": null, "records": [], "more": {"a": [1]}}')
+        streamed = list(self.airtable.table(FAKE_TABLE_NAME).iterate(stream=True))
+        self.assertEqual(_WIDE_PAGE['records'], streamed)
+        self.assertIsInstance(streamed[0]['fields'], OrderedDict)
+        self.assertEqual(2, mock_requests.call_count)
+
+    @requests_mock.mock()
+    def test_plain_dicts(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName',
+            text='{"records":[{"id":"rec1","fields":{"n":1}}]}')
+        client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, dict_class=dict)
+        for stream in (True, False):
+            record = next(client.iterate(FAKE_TABLE_NAME, stream=stream))
+            self.assertIs(dict, type(record['fields']))
+
+    @requests_mock.mock()
+    def test_truncated_response(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName',
+            text='{"records":[{"id":"rec1"},{"id":"re')
+        records = self.airtable.iterate(FAKE_TABLE_NAME, stream=True)
+        self.assertEqual('rec1', next(records)['id'])
+        with self.assertRaises(ValueError):
+            next(records)
+
+    def test_no_prefetch(self):
+        with self.assertRaises(ValueError):
+            next(self.airtable.iterate(FAKE_TABLE_NAME, stream=True, prefetch=2))
+
+
+class TestCompactRecords(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCompactRecords, self).setUp()
+        self.airtable = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, compact_records=True)
+
+    @requests_mock.mock()
+    def test_iterate(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            {'id': 'rec1', 'createdTime': '2026-10-18T10:00:00.000Z',
+             'fields': {'Name': 'A', 'Tags': ['x']}},
+            {'id': 'rec2', 'createdTime': '2026-10-18T10:00:00.000Z',
+             'fields': {'Name': 'B', 'Tags': []}},
+        ]})
+        first, second = self.airtable.table(FAKE_TABLE_NAME).iterate()
+        self.assertIsInstance(first, airtable.Record)
+        self.assertEqual('rec1', first['id'])
+        self.assertEqual('2026-10-18T10:00:00.000Z', first.get('createdTime'))
+        self.assertEqual('A', first['fields']['Name'])
+        self.assertEqual({}, second.get('missing', {}))
+        self.assertEqual(['Name', 'Tags'], list(second['fields']))
+        self.assertEqual(
+            {'id': 'rec2', 'createdTime': '2026-10-18T10:00:00.000Z',
+             'fields': {'Name': 'B', 'Tags': []}},
+            second)
+        self.assertIs(first['fields']._names, second['fields']._names)
+        self.assertFalse(hasattr(first, '__dict__'))
+        self.assertFalse(hasattr(first['fields'], '__dict__'))
+
+    @requests_mock.mock()
+    def test_sparse_fields(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json={'records': [
+            {'id': 'rec1', 'fields': {'Name': 'A', 'Tags': ['x']}},
+            {'id': 'rec2', 'fields': {'Tags': [], 'Email': 'b@example.com'}},
+            {'id': 'rec3', 'fields': {}},
+        ]})
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/Other',
+            json={'records': [{'id': 'rec4', 'fields': {'Name': 'D'}}]})
+        first, second, third = self.airtable.iterate(FAKE_TABLE_NAME)
+        self.assertEqual({'Tags': [], 'Email': 'b@example.com'}, second['fields'])
+        self.assertEqual(['Tags', 'Email'], list(second['fields']))
+        self.assertEqual(2, len(second['fields']))
+        self.assertNotIn('Name', second['fields'])
+        self.assertNotIn('Email', first['fields'])
+        self.assertEqual({}, third['fields'])
+        self.assertIs(first['fields']._names, second['fields']._names)
+        self.assertIs(first['fields']._names, third['fields']._names)
+        other = next(self.airtable.iterate('Other'))
+        self.assertIsNot(first['fields']._names, other['fields']._names)
+        self.assertEqual({'Name': 'D'}, other['fields'])
+
+    @requests_mock.mock()
+    def test_get(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName/rec1',
+            json={'id': 'rec1', 'fields': {'Name': 'A'}})
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName',
+            json={'records': [{'id': 'rec1', 'fields': {}}], 'offset': 'itr1'})
+        record = self.airtable.get(FAKE_TABLE_NAME, 'rec1')
+        self.assertEqual({'id': 'rec1', 'fields': {'Name': 'A'}}, record)
+        with self.assertRaises(KeyError):
+            record['createdTime']  # pylint: disable=pointless-statement
+        page = self.airtable.get(FAKE_TABLE_NAME)
+        self.assertIsInstance(page['records'][0], airtable.Record)
+        self.assertEqual('itr1', page['offset'])
+
+    @requests_mock.mock()
+    def test_with_cache(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName',
+            json={'records': [{'id': 'rec1', 'fields': {'Name': 'A'}}]})
+        self.airtable.cache = cache.MemoryCache()
+        for unused_index in range(2):
+            records = list(self.airtable.iterate(FAKE_TABLE_NAME))
+            self.assertIsInstance(records[0], airtable.Record)
+            self.assertIsInstance(self.airtable.get(FAKE_TABLE_NAME)['records'][0], airtable.Record)
+        self.assertEqual(2, mock_requests.call_count)
+
+
+def _linked_records(request, unused_context):
+    table_name = request.path.rsplit('/', 1)[-1]
+    formula = request.qs['filterbyformula'][0]
+    return {'records': [
+        {'id': record_id, 'fields': {'Account': ['acc%s' % record_id[-1]]}}
+        if table_name == 'customers' else {'id': record_id, 'fields': {}}
+        for record_id in (term.split("'")[1] for term in formula[3:-1].split(','))
+        if record_id != 'cusmissing']}
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        super(TestParallel, self).setUp()
+        self.table = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY).table(FAKE_TABLE_NAME)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        # The rate limiter shared by the clients of the base, fast for tests.
+        self.rate_limiter = airtable.RateLimiter(rate=1000, burst=100)
+        patcher = mock.patch.dict(airtable._RATE_LIMITERS, {FAKE_BASE_ID: self.rate_limiter})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _segment_records(self, request, unused_context):
+        segment = (request.qs.get('filterbyformula') or request.qs['view'])[0]
+        if segment == 'fail':
+            raise requests.ConnectionError('Boom')
+        page = int(request.qs.get('offset', ['0'])[0])
+        response: Dict[str, Any] = {'records': [{'id': '%s-%d' % (segment, page)}]}
+        if page < 2:
+            response['offset'] = str(page + 1)
+        return response
+
+    @requests_mock.mock()
+    def test_parallel_iterate(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName', json=self._segment_records)
+        records = list(self.table.parallel_iterate(
+            ['a', 'b', {'view': 'c'}], max_workers=3, fields=['Name']))
+        self.assertEqual(
+            sorted('%s-%d' % (segment, page) for segment in 'abc' for page in range(3)),
+            sorted(record['id'] for record in records))
+        self.assertTrue(all(request.qs['fields'] for request in mock_requests.request_history))
+        self.assertEqual(9, self.rate_limiter.requests)
+
+    @requests_mock.mock()
+    def test_client_rate_limiter(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName', json=self._segment_records)
+        client_limiter = airtable.RateLimiter(rate=1000, burst=100)
+        table = airtable.Airtable(
+            FAKE_BASE_ID, FAKE_API_KEY, rate_limiter=client_limiter).table(FAKE_TABLE_NAME)
+        self.assertEqual(6, len(list(table.parallel_iterate(['a', 'b']))))
+        self.assertEqual(6, client_limiter.requests)
+        self.assertEqual(0, self.rate_limiter.requests)
+
+    def test_unknown_arguments(self):
+        with self.assertRaisesRegex(TypeError, 'filter_by_formla'):
+            list(self.table.parallel_iterate(['a'], filter_by_formla='b'))
+        with self.assertRaisesRegex(TypeError, 'stream'):
+            list(self.table.parallel_iterate([{'view': 'a', 'stream': True}]))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaisesRegex(TypeError, 'prefetch'):
+                self.table.parallel_export(
+                    ['a'], os.path.join(tmp_dir, 'shard-{index}.jsonl'), prefetch=2)
+            self.assertEqual([], os.listdir(tmp_dir))
+
+    @requests_mock.mock()
+    def test_error(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName', json=self._segment_records)
+        with self.assertRaises(requests.ConnectionError):
+            list(self.table.parallel_iterate(['a', 'fail'], max_workers=2))
+        self._wait_for_threads()
+
+    @requests_mock.mock()
+    def test_parallel_export(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName', json=self._segment_records)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pattern = os.path.join(tmp_dir, 'shard-{index}.jsonl')
+            counts = self.table.parallel_export(['a', 'b'], pattern, max_workers=2)
+            self.assertEqual(6, self.rate_limiter.requests)
+            self.assertEqual({pattern.format(index=0): 3, pattern.format(index=1): 3}, counts)
+            with open(pattern.format(index=1)) as shard:
+                self.assertEqual(
+                    ['b-0', 'b-1', 'b-2'], [json.loads(line)['id'] for line in shard])
+
+    @staticmethod
+    def _records_by_formula(request, unused_context):
+        formula = request.qs['filterbyformula'][0]
+        record_ids = [term.split("'")[1] for term in formula[3:-1].split(',')]
+        return {'records': [
+            {'id': record_id.upper(), 'fields': {}}
+            for record_id in record_ids if not record_id.startswith('recmissing')]}
+
+    @requests_mock.mock()
+    def test_get_many(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/app12345/TableName', json=self._records_by_formula)
+        record_ids = ['REC%03d' % index for index in range(250)]
+        records = self.table.get_many(
+            record_ids + ['REC001', 'recMissing'], fields=['Name'], max_workers=2)
+        self.assertEqual(record_ids + ['recMissing'], list(records))
+        self.assertEqual('REC249', records['REC249']['id'])
+        self.assertIsNone(records['recMissing'])
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertTrue(all(request.qs['fields'] for request in mock_requests.request_history))
+        self._wait_for_threads()
+
+    def test_formulas_length(self):
+        formulas = list(airtable._record_id_formulas(['rec%d' % i for i in range(1000)], 500))
+        self.assertGreater(len(formulas), 2)
+        self.assertTrue(all(
+            len(urllib.parse.quote(formula)) <= airtable.MAX_FORMULA_LENGTH
+            for formula in formulas))
+        self.assertEqual(
+            ["OR(RECORD_ID()='rec1',RECORD_ID()='rec\\'2')"],
+            list(airtable._record_id_formulas(['rec1', "rec'2"], 10)))
+
+    def _wait_for_threads(self):
+        for unused_index in range(50):
+            if not any(t.name.startswith('airtable-') for t in threading.enumerate()):
+                return
+            time.sleep(.05)
+        self.fail('Background threads are still running')
+
+    @requests_mock.mock()
+    def test_expand(self, mock_requests):
+        mock_requests.get(requests_mock.ANY, json=_linked_records)
+        orders = [
+            {'id': 'ord%d' % index, 'fields': {'Customer': ['cus%d' % (index % 3)]}}
+            for index in range(20)]
+        orders[0]['fields']['Customer'].append('cusMissing')
+        client = self.table._client
+        expanded = client.expand(orders, {'Customer': 'Customers', 'Customer.Account': 'Accounts'})
+        self.assertIs(orders, expanded)
+        self.assertEqual(2, mock_requests.call_count)
+        self.assertEqual('acc1', orders[4]['fields']['Customer'][0]['fields']['Account'][0]['id'])
+        self.assertIs(orders[1]['fields']['Customer'][0], orders[4]['fields']['Customer'][0])
+        self.assertEqual('cusMissing', orders[0]['fields']['Customer'][1])
+        # Expanding again only fetches the IDs that were not found.
+        client.expand(orders, {'Customer': 'Customers', 'Customer.Account': 'Accounts'})
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertEqual(
+            ["or(record_id()='cusmissing')"], mock_requests.last_request.qs['filterbyformula'])
+
+    @requests_mock.mock()
+    def test_expand_compact_client(self, mock_requests):
+        mock_requests.get(requests_mock.ANY, json=_linked_records)
+        client = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY, compact_records=True)
+        orders = [{'id': 'ord1', 'fields': {'Customer': ['cus1']}}]
+        client.expand(orders, {'Customer': 'Customers', 'Customer.Account': 'Accounts'})
+        customer = orders[0]['fields']['Customer'][0]
+        self.assertEqual('cus1', customer['id'])
+        self.assertEqual('acc1', customer['fields']['Account'][0]['id'])
+        self.assertIsInstance(client.get_many('Customers', ['cus1'])['cus1'], airtable.Record)
+
+    def test_expand_missing_parent(self):
+        with self.assertRaises(ValueError):
+            self.table.expand([], ['Customer.Account'])
+
+    def _slow_pages(self, *unused_args, **unused_kwargs):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(.05)
+        with self.lock:
+            self.running -= 1
+        yield [{'id': 'rec1'}]
+
+    def test_concurrency(self):
+        with mock.patch.object(self.table._client, '_iterate_pages', self._slow_pages):
+            records = list(self.table.parallel_iterate(['a', 'b', 'c', 'd'], max_workers=3))
+        self.assertEqual(4, len(records))
+        self.assertEqual(3, self.max_running)
+
+
+def _export_records(request, unused_context):
+    page = int(request.qs.get('offset', ['0'])[0])
+    response: Dict[str, Any] = {'records': [
+        {'id': 'rec%d' % (2 * page + i), 'createdTime': '2016-09-12T10:02:01.000Z', 'fields': {
+            'Name': 'Person %d' % (2 * page + i), 'Age': 20 + page, 'Tags': ['a', 'b']}}
+        for i in range(2)]}
+    if page < 2:
+        response['offset'] = str(page + 1)
+    return response
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        super(TestExport, self).setUp()
+        self.table = airtable.Airtable(FAKE_BASE_ID, FAKE_API_KEY).table(FAKE_TABLE_NAME)
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+    @requests_mock.mock()
+    def test_jsonl(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_export_records)
+        path = os.path.join(self.tmp_dir, 'people.jsonl')
+        self.assertEqual(6, self.table.export(path, flush_every=4))
+        with open(path) as export_file:
+            records = [json.loads(line) for line in export_file]
+        self.assertEqual(['rec%d' % i for i in range(6)], [record['id'] for record in records])
+        self.assertEqual(['a', 'b'], records[5]['fields']['Tags'])
+
+    @requests_mock.mock()
+    def test_csv(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_export_records)
+        path = os.path.join(self.tmp_dir, 'people.csv')
+        self.assertEqual(6, self.table.export(path, fields=['Name', 'Age', 'Tags'], flush_every=4))
+        with open(path) as export_file:
+            lines = export_file.read().splitlines()
+        self.assertEqual('id,createdTime,Name,Age,Tags', lines[0])
+        self.assertEqual('rec5,2016-09-12T10:02:01.000Z,Person 5,22,"[""a"", ""b""]"', lines[6])
+        self.assertEqual(['name', 'age', 'tags'], mock_requests.request_history[0].qs['fields'])
+
+    @requests_mock.mock()
+    def test_csv_columns_from_metadata(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/meta/bases/app12345/tables', json={
+            'tables': [{'id': 'tbl1', 'name': FAKE_TABLE_NAME, 'fields': [
+                {'name': 'Name', 'type': 'singleLineText'},
+                {'name': 'Email', 'type': 'email'},
+                {'name': 'Age', 'type': 'number'},
+                {'name': 'Tags', 'type': 'multipleSelects'},
+            ]}]})
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_export_records)
+        path = os.path.join(self.tmp_dir, 'people.csv')
+        self.assertEqual(6, self.table.export(path, flush_every=1))
+        with open(path) as export_file:
+            lines = export_file.read().splitlines()
+        self.assertEqual('id,createdTime,Name,Email,Age,Tags', lines[0])
+        self.assertEqual('rec5,2016-09-12T10:02:01.000Z,Person 5,,22,"[""a"", ""b""]"', lines[6])
+        self.assertNotIn('fields', mock_requests.request_history[1].qs)
+
+    @requests_mock.mock()
+    def test_csv_without_metadata_scope(self, mock_requests):
+        mock_requests.get(
+            'https://api.airtable.com/v0/meta/bases/app12345/tables', status_code=403,
+            json={'error': {'type': 'INVALID_PERMISSIONS_OR_MODEL_NOT_FOUND'}})
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_export_records)
+        path = os.path.join(self.tmp_dir, 'people.csv')
+        self.assertEqual(6, self.table.export(path, flush_every=4))
+        with open(path) as export_file:
+            self.assertEqual('id,createdTime,Name,Age,Tags', export_file.readline().strip())
+
+    def test_new_fields_rejected(self):
+        records = [
+            {'id': 'rec1', 'fields': {'Name': 'Jane'}},
+            {'id': 'rec2', 'fields': {'Name': 'John', 'Age': 32}},
+        ]
+        path = os.path.join(self.tmp_dir, 'people.csv')
+        with self.assertRaisesRegex(ValueError, 'Age'):
+            export.export_records(records, path, flush_every=1)
+
+    def test_empty_csv(self):
+        path = os.path.join(self.tmp_dir, 'people.csv')
+        self.assertEqual(0, export.export_records([], path, fields=['Name']))
+        with open(path) as export_file:
+            self.assertEqual('id,createdTime,Name\n', export_file.read())
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export.export_records([], os.path.join(self.tmp_dir, 'people.xls'))
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    @requests_mock.mock()
+    def test_parquet(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/meta/bases/app12345/tables', json={
+            'tables': [{'id': 'tbl1', 'name': FAKE_TABLE_NAME, 'fields': [
+                {'name': name, 'type': 'singleLineText'} for name in ('Name', 'Age', 'Tags')]}]})
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_export_records)
+        path = os.path.join(self.tmp_dir, 'people.parquet')
+        self.assertEqual(6, self.table.export(path, flush_every=4))
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(2, parquet_file.num_row_groups)
+        table = parquet_file.read()
+        self.assertEqual(['id', 'createdTime', 'Name', 'Age', 'Tags'], table.column_names)
+        self.assertEqual(pyarrow.float64(), table.schema.field('Age').type)
+        self.assertEqual([20, 20, 21, 21, 22, 22], table.column('Age').to_pylist())
+        self.assertEqual('["a", "b"]', table.column('Tags')[0].as_py())
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_arrow(self):
+        records = [
+            {'id': 'rec1', 'fields': {'Name': 'Jane', 'Member': True}},
+            {'id': 'rec2', 'fields': {'Name': 'John', 'Member': 'maybe'}},
+        ]
+        path = os.path.join(self.tmp_dir, 'people.arrow')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertEqual(2, export.export_records(records, path, flush_every=1))
+        self.assertEqual(1, len(caught))
+        with pyarrow.ipc.open_file(path) as reader:
+            table = reader.read_all()
+        self.assertEqual([True, None], table.column('Member').to_pylist())
+
+
+class TestAirtablePool(unittest.TestCase):
+
+    def setUp(self):
+        super(TestAirtablePool, self).setUp()
+        self.pool = pool.AirtablePool(
+            FAKE_API_KEY, max_workers=2, per_base_concurrency=1, rate_limiter=None)
+        self.addCleanup(self.pool.close)
+
+    def test_fair_scheduling(self):
+        started: List[str] = []
+        release = threading.Event()
+        single_worker = pool.AirtablePool(FAKE_API_KEY, max_workers=1, rate_limiter=None)
+        self.addCleanup(single_worker.close)
+
+        def _operation(client, index):
+            started.append('%s-%d' % (client.base_id, index))
+            release.wait()
+            return index
+
+        futures = [single_worker.submit('appC', _operation, 0)]
+        futures += [single_worker.submit('appA', _operation, index) for index in range(4)]
+        futures += [single_worker.submit('appB', _operation, index) for index in range(2)]
+        release.set()
+        self.assertEqual([0, 0, 1, 2, 3, 0, 1], [future.result() for future in futures])
+        self.assertEqual(
+            ['appC-0', 'appA-0', 'appB-0', 'appA-1', 'appB-1', 'appA-2', 'appA-3'], started)
+
+    def test_per_base_concurrency(self):
+        running: List[int] = [0, 0]
+        lock = threading.Lock()
+
+        def _operation(unused_client):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(.05)
+            with lock:
+                running[0] -= 1
+
+        futures = [self.pool.submit('appA', _operation) for unused_index in range(3)]
+        concurrent.futures.wait(futures)
+        self.assertEqual(1, running[1])
+
+    def test_errors(self):
+        def _fail(unused_client):
+            raise ValueError('Boom')
+
+        with self.assertRaises(ValueError):
+            self.pool.submit('appA', _fail).result()
+        self.assertEqual(1, self.pool.submit('appA', lambda client: 1).result())
+
+    @requests_mock.mock()
+    def test_iterate_and_create(self, mock_requests):
+        mock_requests.get('https://api.airtable.com/v0/app12345/TableName', json=_paginated_records)
+        mock_requests.post('https://api.airtable.com/v0/appB/TableName', json=_echo_records)
+        records = list(self.pool.iterate(FAKE_BASE_ID, FAKE_TABLE_NAME))
+        self.assertEqual(20, len(records))
+        self.assertEqual(10, mock_requests.call_count)
+        created = list(self.pool.create_many(
+            'appB', FAKE_TABLE_NAME, ({'Index': index} for index in range(25))))
+        self.assertEqual(list(range(25)), [record['fields']['Index'] for record in created])
+        self.assertIs(self.pool.client('appB'), self.pool.client('appB'))
+
+    @requests_mock.mock()
+    def test_create_many_lazily(self, mock_requests):
+        mock_requests.post('https://api.airtable.com/v0/appB/TableName', json=_echo_records)
+        read = []
+
+        def _data():
+            for index in range(100):
+                read.append(index)
+                yield {'Index': index}
+
+        created = self.pool.create_many('appB', FAKE_TABLE_NAME, _data())
+        self.assertEqual(0, next(created)['fields']['Index'])
+        # per_base_concurrency is 1: 2 batches of 10 were queued, then a third
+        # one once the first was created.
+        self.assertEqual(30, len(read))
+        self.assertEqual(list(range(1, 100)), [record['fields']['Index'] for record in created])
+        self.assertEqual(10, mock_requests.call_count)
+
+
 class TestNestedModule(TestAirtable):
 
     def setUp(self):